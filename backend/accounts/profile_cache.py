@@ -0,0 +1,122 @@
+"""Cached user-profile snapshots for websocket frames.
+
+Lookups go through a small per-process LRU, then Redis, then the database.
+``accounts.signals`` invalidates both cache levels when a user or profile is
+saved; the short local TTL bounds how long other processes can serve a stale
+snapshot. Every snapshot carries a ``version`` derived from its content, so
+consumers can send a full profile once and only ``{id, version}`` after that.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from elshawi_backend.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'profile_snapshot:'
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_ttl():
+    return getattr(settings, 'PROFILE_SNAPSHOT_LOCAL_TTL', 30)
+
+
+def _local_get(user_id):
+    with _local_lock:
+        entry = _local.get(user_id)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if expires_at < time.monotonic():
+            del _local[user_id]
+            return None
+        _local.move_to_end(user_id)
+        return snapshot
+
+
+def _local_set(user_id, snapshot):
+    with _local_lock:
+        _local[user_id] = (snapshot, time.monotonic() + _local_ttl())
+        _local.move_to_end(user_id)
+        while len(_local) > getattr(settings, 'PROFILE_SNAPSHOT_LOCAL_SIZE', 1024):
+            _local.popitem(last=False)
+
+
+def build_profile_snapshot(user):
+    profile = {
+        'id': user.id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'fullname': user.fullname,
+        'role': user.role.name if user.role else 'Client',
+        'avatar': user.avatar.url if user.avatar else None,
+        'is_active': user.is_active,
+    }
+    encoded = json.dumps(profile, sort_keys=True).encode('utf-8')
+    profile['version'] = hashlib.sha1(encoded).hexdigest()[:12]
+    return profile
+
+
+def get_profile_snapshot(user_id):
+    """Return the snapshot for ``user_id``, or None if the user does not exist."""
+    snapshot = _local_get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    client = get_redis()
+    if client is not None:
+        try:
+            cached = client.get(f'{REDIS_KEY_PREFIX}{user_id}')
+            if cached is not None:
+                snapshot = json.loads(cached)
+                _local_set(user_id, snapshot)
+                return snapshot
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    user = get_user_model().objects.select_related('role').filter(pk=user_id).first()
+    if user is None:
+        return None
+    snapshot = build_profile_snapshot(user)
+    _local_set(user_id, snapshot)
+    if client is not None:
+        try:
+            client.set(
+                f'{REDIS_KEY_PREFIX}{user_id}',
+                json.dumps(snapshot),
+                ex=getattr(settings, 'PROFILE_SNAPSHOT_TTL', 24 * 3600)
+            )
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return snapshot
+
+
+async def aget_profile_snapshot(user_id):
+    # Local hits are answered without a thread hop
+    snapshot = _local_get(user_id)
+    if snapshot is None:
+        snapshot = await sync_to_async(get_profile_snapshot)(user_id)
+    return snapshot
+
+
+def invalidate_profile_snapshot(user_id):
+    with _local_lock:
+        _local.pop(user_id, None)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(f'{REDIS_KEY_PREFIX}{user_id}')
+        except redis.RedisError as e:
+            mark_unavailable(e)
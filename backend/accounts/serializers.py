@@ -3,6 +3,7 @@ from .models import Adminify, RoleModel, User, UserProfile
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.tokens import AccessToken
+from elshawi_backend.serializers import SparseFieldsMixin
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True,required=True,style={'input_type': 'password'},)    
@@ -188,7 +189,7 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
     
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     role = serializers.CharField(source='role.name', allow_null=True)
     full_name = serializers.CharField(source='fullname', read_only=True)
 
@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from accounts.models import User, UserProfile
+from accounts.profile_cache import invalidate_profile_snapshot
 import logging
 logger = logging.getLogger(__name__)
 @receiver(post_save, sender=User)
@@ -10,4 +12,19 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
     else:
         logger.info(f"User {instance.email} updated")
-        print(f"User {instance.email} updated")
\ No newline at end of file
+        print(f"User {instance.email} updated")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # Read the id now: Django clears instance.pk once a delete has run.
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_profile_snapshot(user_id))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_owner_snapshot(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_profile_snapshot(user_id))
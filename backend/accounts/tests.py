@@ -3,12 +3,19 @@ from django.test import TestCase
 from rest_framework.test import APITestCase
 from rest_framework import status
 from accounts.models import User, RoleModel, UserProfile
+from accounts import profile_cache
+from accounts.profile_cache import get_profile_snapshot
 from django.urls import reverse
 from rest_framework_simplejwt.tokens import RefreshToken
 import jwt
 from django.conf import settings
 from django.core import mail
+from django.utils import timezone
 from datetime import datetime, timedelta
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from elshawi_backend import middleware as ws_auth
 
 class AuthAPITests(APITestCase):
     def setUp(self):
@@ -101,4 +108,95 @@ class AuthAPITests(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.refresh_from_db()
-        self.assertTrue(self.user.check_password('NewPass123!'))
\ No newline at end of file
+        self.assertTrue(self.user.check_password('NewPass123!'))
+
+class AdminUserListTests(APITestCase):
+    def setUp(self):
+        self.lawyer_role = RoleModel.objects.create(name="Lawyer")
+        self.client_role = RoleModel.objects.create(name="Client")
+        self.admin = User.objects.create_user(email="admin@example.com", password="pass", role=self.client_role)
+        joined = timezone.now()
+        for i in range(5):
+            User.objects.create_user(
+                email=f"user{i}@example.com", password="pass",
+                role=self.lawyer_role if i % 2 else self.client_role,
+                date_joined=joined - timedelta(days=i + 1),
+            )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_newest_users_come_first_across_pages(self):
+        emails = []
+        url = reverse('admin-user-list') + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            emails += [user['email'] for user in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(emails, ["admin@example.com"] + [f"user{i}@example.com" for i in range(5)])
+
+    def test_role_filter(self):
+        response = self.client.get(reverse('admin-user-list') + '?role=Lawyer')
+        self.assertEqual([user['email'] for user in response.data['results']], ["user1@example.com", "user3@example.com"])
+
+
+class ProfileSnapshotTests(TestCase):
+    def setUp(self):
+        profile_cache._local.clear()  # ids are reused between tests
+        self.user = User.objects.create_user(
+            email="snap@example.com", first_name="Snap", last_name="Shot", password="pass"
+        )
+
+    def test_profile_update_changes_the_version(self):
+        version = get_profile_snapshot(self.user.id)['version']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Renamed"
+            self.user.save()
+        snapshot = get_profile_snapshot(self.user.id)
+        self.assertEqual(snapshot['first_name'], "Renamed")
+        self.assertNotEqual(snapshot['version'], version)
+
+    def test_deleted_user_has_no_snapshot(self):
+        user_id = self.user.id
+        self.assertIsNotNone(get_profile_snapshot(user_id))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(get_profile_snapshot(user_id))
+
+
+class WebsocketTokenAuthTests(TestCase):
+    def setUp(self):
+        profile_cache._local.clear()  # ids are reused between tests
+        ws_auth._verified.clear()
+        self.user = User.objects.create_user(
+            email="socket@example.com", first_name="Socket", last_name="User", password="pass"
+        )
+
+    def handshake(self, token):
+        scopes = []
+
+        async def inner(scope, receive, send):
+            scopes.append(scope)
+
+        middleware = ws_auth.TokenAuthMiddleware(inner)
+        async_to_sync(middleware)({"type": "websocket", "query_string": f"token={token}".encode()}, None, None)
+        return scopes[0]["user"]
+
+    def test_warm_jwt_handshake_makes_no_queries(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(self.handshake(token).id, self.user.id)
+        with self.assertNumQueries(0):
+            user = self.handshake(token)
+        self.assertEqual((user.id, user.email), (self.user.id, self.user.email))
+
+    def test_rejected_jwt_is_not_looked_up_as_a_drf_token(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        with self.assertNumQueries(0):
+            user = self.handshake(token[:-2] + "xx")
+        self.assertFalse(user.is_authenticated)
+
+    @override_settings(WS_AUTH_DRF_TOKEN_TTL=-1)
+    def test_drf_tokens_are_rechecked(self):
+        token = Token.objects.create(user=self.user)
+        self.assertEqual(self.handshake(token.key).id, self.user.id)
+        token.delete()
+        self.assertFalse(self.handshake(token.key).is_authenticated)
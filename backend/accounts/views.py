@@ -11,6 +11,7 @@ from contracts.models import Contract, Review
 from documents.models import AIAnalysisResult, Document
 from invoices.models import Invoice
 from marketplace.models import ServiceRequest, Payment, Review as MarketplaceReview
+from elshawi_backend.pagination import KeysetPagination
 from elshawi_backend.permissions import IsAdminUser
 from .serializers import AdminifySerializer, LogoutSerializer, PasswordResetConfirmSerializer, PasswordResetRequestSerializer, RegisterSerializer, LoginSerializer, UpdateProfileSerializer, UserListSerializer, UserProfileSerializer
 from rest_framework.views import APIView
@@ -239,8 +240,17 @@ class UpdateProfileView(APIView):
 
 class AdminUserListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
-    queryset = User.objects.filter(is_deleted=False).order_by('-date_joined')
     serializer_class = UserListSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = '-date_joined'
+
+    def get_queryset(self):
+        queryset = User.objects.filter(is_deleted=False).select_related('role')
+        # ?role=Lawyer,Admin narrows the list for the lawyer pickers
+        roles = [name for name in self.request.query_params.get('role', '').split(',') if name]
+        if roles:
+            queryset = queryset.filter(role__name__in=roles)
+        return queryset
 
 class AdminUserDetailView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
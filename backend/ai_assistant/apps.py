@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AiAssistantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_assistant'
+
+    def ready(self):
+        import ai_assistant.signals
@@ -6,9 +6,9 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from .models import AIResponse
 from .serializers import AIResponseSerializer, AIQuestionSerializer
-from .utils import get_similar_documents, generate_qna_answer, analyze_document
+from .utils import build_question_context, stream_qna_answer, stream_document_analysis
 from documents.models import Document
-from documents.views import DocumentAnalyzeView
+from documents.extraction import get_document_text
 import logging
 
 logger = logging.getLogger(__name__)
@@ -105,23 +105,10 @@ class AIAssistantConsumer(AsyncWebsocketConsumer):
                         'message': 'جاري البحث في الوثائق ذات الصلة...'
                     }))
                     
-                    similar_docs = await get_similar_documents(question, self.user)
+                    similar_docs, context = await build_question_context(question, self.user)
                     context_documents = similar_docs
                     
                     if similar_docs:
-                        context_parts = []
-                        analyzer = DocumentAnalyzeView()
-                        
-                        for doc in similar_docs:
-                            try:
-                                doc_content = await database_sync_to_async(analyzer.get_file_content)(doc)
-                                context_parts.append(f"**من الوثيقة: {doc.title}**\n{doc_content[:1000]}...")
-                            except Exception as e:
-                                logger.warning(f"Error getting document content: {str(e)}")
-                                continue
-                        
-                        context = "\n\n".join(context_parts)
-                        
                         await self.send(text_data=json.dumps({
                             'type': 'context_found',
                             'message': f'تم العثور على {len(similar_docs)} وثيقة ذات صلة',
@@ -145,7 +132,7 @@ class AIAssistantConsumer(AsyncWebsocketConsumer):
                 'message': 'جاري توليد الإجابة...'
             }))
             
-            answer = await generate_qna_answer(question, context)
+            answer = await self.forward_stream(stream_qna_answer(question, context), 'answer_chunk')
             
             # Save response to database
             ai_response = await database_sync_to_async(AIResponse.objects.create)(
@@ -198,11 +185,12 @@ class AIAssistantConsumer(AsyncWebsocketConsumer):
             }))
             
             # Get document content
-            analyzer = DocumentAnalyzeView()
-            document_content = await database_sync_to_async(analyzer.get_file_content)(document)
+            document_content = await database_sync_to_async(get_document_text)(document)
             
             # Analyze document
-            analysis = await analyze_document(document_content)
+            analysis = await self.forward_stream(
+                stream_document_analysis(document_content), 'analysis_chunk', document_id=document.id
+            )
             
             # Create AI response for the analysis
             question = f"تحليل الوثيقة: {document.title}"
@@ -321,6 +309,23 @@ class AIAssistantConsumer(AsyncWebsocketConsumer):
             'user_id': event['user_id']
         }))
 
+    async def forward_stream(self, chunks, frame_type, **extra):
+        """Send each generated chunk to the client as it arrives and return the full text.
+
+        If the model fails part-way the exception propagates, so the caller
+        sends an error frame instead of storing a partial answer.
+        """
+        parts = []
+        async for delta in chunks:
+            parts.append(delta)
+            await self.send(text_data=json.dumps({
+                'type': frame_type,
+                'index': len(parts) - 1,
+                'delta': delta,
+                **extra
+            }))
+        return ''.join(parts)
+
     async def send_error(self, message):
         """Send error message to client."""
         await self.send(text_data=json.dumps({
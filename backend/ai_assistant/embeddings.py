@@ -0,0 +1,325 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import redis
+from django.conf import settings
+from django.db.models import F
+from elshawi_backend.llm_gateway import create_embeddings_sync
+from elshawi_backend.redis_client import get_redis, mark_unavailable
+
+from documents.models import Document, DocumentPassage
+from documents.extraction import get_document_text
+from .models import DocumentEmbedding, EmbeddingFailure, PassageEmbedding
+
+try:
+    import hnswlib
+except ImportError:  # optional: only needed for the approximate index on large libraries
+    hnswlib = None
+
+try:
+    import tiktoken
+except ImportError:  # optional: exact token counts for the context budget
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = 'text-embedding-ada-002'
+EMBEDDING_INPUT_LIMIT = 8192
+
+
+def get_embedding_model():
+    return getattr(settings, 'AI_ASSISTANT_EMBEDDING_MODEL', EMBEDDING_MODEL)
+
+
+def to_unit_vector(values):
+    """Return ``values`` as an L2-normalised float32 vector, so a dot product is a cosine similarity."""
+    vector = np.asarray(values, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector = vector / norm
+    return vector
+
+
+def embed_texts(texts):
+    """Embed a list of texts with the configured model (blocking; used from Celery workers)."""
+    batch_size = getattr(settings, 'AI_ASSISTANT_EMBEDDING_BATCH_SIZE', 64)
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        response = create_embeddings_sync(
+            input=[text[:EMBEDDING_INPUT_LIMIT] for text in texts[start:start + batch_size]],
+            model=get_embedding_model()
+        )
+        vectors.extend(to_unit_vector(item.embedding) for item in sorted(response.data, key=lambda item: item.index))
+    return vectors
+
+
+def embed_text(text):
+    return embed_texts([text])[0]
+
+
+def store_document_embedding(document):
+    """Embed a document once per file hash; identical re-uploads reuse the stored vector."""
+    if not document.file_hash:
+        return None
+
+    model = get_embedding_model()
+    existing = DocumentEmbedding.objects.filter(file_hash=document.file_hash).first()
+    if existing and existing.model == model:
+        return existing
+
+    text = get_document_text(document)
+    vector = embed_text(text)
+    embedding, _ = DocumentEmbedding.objects.update_or_create(
+        file_hash=document.file_hash,
+        defaults={
+            'model': model,
+            'dimensions': vector.shape[0],
+            'vector': vector.tobytes(),
+        }
+    )
+    return embedding
+
+
+def store_passage_embeddings(file_hash):
+    """Embed every passage of ``file_hash`` that has no vector for the current model."""
+    model = get_embedding_model()
+    passages = list(
+        DocumentPassage.objects.filter(file_hash=file_hash).exclude(embeddings__model=model)
+    )
+    if not passages:
+        return 0
+
+    vectors = embed_texts([passage.text for passage in passages])
+    PassageEmbedding.objects.bulk_create(
+        [
+            PassageEmbedding(passage=passage, model=model, vector=vector.tobytes())
+            for passage, vector in zip(passages, vectors)
+        ],
+        ignore_conflicts=True
+    )
+    return len(passages)
+
+
+def record_embedding_failure(file_hash, error):
+    """Count a failed extraction or embedding of ``file_hash`` for the current model."""
+    failure, _ = EmbeddingFailure.objects.get_or_create(file_hash=file_hash, model=get_embedding_model())
+    EmbeddingFailure.objects.filter(pk=failure.pk).update(attempts=F('attempts') + 1, last_error=str(error))
+
+
+def clear_embedding_failure(file_hash):
+    EmbeddingFailure.objects.filter(file_hash=file_hash, model=get_embedding_model()).delete()
+
+
+def given_up_hashes(file_hashes):
+    """The hashes among ``file_hashes`` that failed too often to be queued again."""
+    return set(
+        EmbeddingFailure.objects.filter(
+            file_hash__in=file_hashes,
+            model=get_embedding_model(),
+            attempts__gte=getattr(settings, 'AI_ASSISTANT_EMBEDDING_MAX_ATTEMPTS', 3)
+        ).values_list('file_hash', flat=True)
+    )
+
+
+def estimate_tokens(text):
+    if tiktoken is not None:
+        return len(tiktoken.get_encoding('cl100k_base').encode(text))
+    return len(text) // 4 + 1
+
+
+def select_passages(documents, question_vector, token_budget=None):
+    """Pick the passages of ``documents`` closest to the question that fit the token budget.
+
+    Returns ``(document, passage)`` pairs grouped by document, in reading order.
+    Passages without a vector yet are used in document order, best-ranked
+    document first, only when none of the candidates has been embedded.
+    """
+    token_budget = token_budget or getattr(settings, 'AI_ASSISTANT_CONTEXT_TOKEN_BUDGET', 1500)
+    documents_by_hash = {}
+    for document in documents:
+        if document.file_hash:
+            documents_by_hash.setdefault(document.file_hash, document)
+    if not documents_by_hash:
+        return []
+    document_rank = {file_hash: rank for rank, file_hash in enumerate(documents_by_hash)}
+
+    embedded = list(
+        PassageEmbedding.objects.filter(
+            passage__file_hash__in=documents_by_hash.keys(),
+            model=get_embedding_model()
+        ).select_related('passage')
+    )
+    if embedded:
+        matrix = np.vstack([np.frombuffer(item.vector, dtype=np.float32) for item in embedded])
+        order = np.argsort(-(matrix @ question_vector))
+        ranked = [embedded[i].passage for i in order]
+    else:
+        ranked = sorted(
+            DocumentPassage.objects.filter(file_hash__in=documents_by_hash.keys()),
+            key=lambda passage: (document_rank[passage.file_hash], passage.position)
+        )
+
+    selected, used = [], 0
+    for passage in ranked:
+        cost = estimate_tokens(passage.text)
+        if used + cost > token_budget:
+            continue
+        selected.append(passage)
+        used += cost
+
+    selected.sort(key=lambda passage: (document_rank[passage.file_hash], passage.position))
+    return [(documents_by_hash[passage.file_hash], passage) for passage in selected]
+
+
+class EmbeddingIndex:
+    """Row-aligned document ids and a float32 matrix of their unit embeddings."""
+
+    def __init__(self, document_ids, matrix):
+        self.document_ids = np.asarray(document_ids, dtype=np.int64)
+        self.matrix = matrix
+        self._ann = None
+
+        threshold = getattr(settings, 'AI_ASSISTANT_ANN_THRESHOLD', 5000)
+        if hnswlib is not None and len(self.document_ids) >= threshold:
+            self._ann = hnswlib.Index(space='ip', dim=matrix.shape[1])
+            self._ann.init_index(max_elements=len(self.document_ids), ef_construction=200, M=16)
+            self._ann.add_items(matrix, np.arange(len(self.document_ids)))
+            self._ann.set_ef(64)
+
+    def __len__(self):
+        return len(self.document_ids)
+
+    def search(self, query_vector, k=3):
+        """Return the ids of the ``k`` documents most similar to ``query_vector``, best first."""
+        if not len(self):
+            return []
+        k = min(k, len(self))
+
+        if self._ann is not None:
+            labels, _ = self._ann.knn_query(query_vector, k=k)
+            return self.document_ids[labels[0]].tolist()
+
+        scores = self.matrix @ query_vector
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return self.document_ids[top].tolist()
+
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+QUEUED_KEY_PREFIX = 'embedding_queued:'
+_queued_until = {}
+_queued_lock = threading.Lock()
+
+
+def _claim_embedding(document_id):
+    """Mark a document as queued for embedding; False if it already is.
+
+    The mark is shared through Redis (``SET NX EX``) when available, with a
+    per-process fallback. It is released when the task finishes and expires
+    after ``EMBEDDING_QUEUE_TTL`` seconds in case the task is lost.
+    """
+    ttl = getattr(settings, 'EMBEDDING_QUEUE_TTL', 600)
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.set(f'{QUEUED_KEY_PREFIX}{document_id}', 1, nx=True, ex=ttl))
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    now = time.monotonic()
+    with _queued_lock:
+        for queued_id in [key for key, until in _queued_until.items() if until <= now]:
+            del _queued_until[queued_id]
+        if document_id in _queued_until:
+            return False
+        _queued_until[document_id] = now + ttl
+        return True
+
+
+def release_embedding_claim(document_id):
+    with _queued_lock:
+        _queued_until.pop(document_id, None)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(f'{QUEUED_KEY_PREFIX}{document_id}')
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+
+def _queue_missing_embeddings(document_ids):
+    from .tasks import embed_document
+
+    for document_id in document_ids:
+        if not _claim_embedding(document_id):
+            continue
+        try:
+            embed_document.delay(document_id)
+        except Exception as e:
+            release_embedding_claim(document_id)
+            logger.warning(f"Could not queue embedding for document {document_id}: {str(e)}")
+
+
+def get_user_index(user):
+    """Return the user's embedding index, rebuilding it only when their documents change.
+
+    Documents whose embedding has not been computed yet are left out of the
+    index and queued for embedding in the background. Documents without a
+    file hash, and those that kept failing (see ``given_up_hashes``), are left
+    out without being queued, so they do not keep the index from being cached.
+    """
+    model = get_embedding_model()
+    rows = list(
+        Document.objects.filter(uploaded_by=user).order_by('id').values_list('id', 'file_hash')
+    )
+    fingerprint = hashlib.sha1(f"{model}:{rows!r}".encode('utf-8')).hexdigest()
+
+    with _index_lock:
+        cached = _index_cache.get(user.id)
+        if cached and cached[0] == fingerprint:
+            _index_cache.move_to_end(user.id)
+            return cached[1]
+
+    vectors = dict(
+        DocumentEmbedding.objects.filter(
+            file_hash__in={file_hash for _, file_hash in rows if file_hash},
+            model=model
+        ).values_list('file_hash', 'vector')
+    )
+
+    unembedded = {file_hash for _, file_hash in rows if file_hash and file_hash not in vectors}
+    given_up = given_up_hashes(unembedded) if unembedded else set()
+
+    document_ids, missing = [], []
+    for document_id, file_hash in rows:
+        if file_hash in vectors:
+            document_ids.append(document_id)
+        elif file_hash in unembedded and file_hash not in given_up:
+            missing.append(document_id)
+
+    if document_ids:
+        matrix = np.vstack([
+            np.frombuffer(vectors[file_hash], dtype=np.float32)
+            for _, file_hash in rows if file_hash in vectors
+        ])
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+    index = EmbeddingIndex(document_ids, matrix)
+
+    if missing:
+        _queue_missing_embeddings(missing)
+        # Not cached: the index will grow as the queued embeddings land.
+        return index
+
+    with _index_lock:
+        _index_cache[user.id] = (fingerprint, index)
+        _index_cache.move_to_end(user.id)
+        while len(_index_cache) > getattr(settings, 'AI_ASSISTANT_INDEX_CACHE_SIZE', 128):
+            _index_cache.popitem(last=False)
+    return index
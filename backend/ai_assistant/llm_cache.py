@@ -0,0 +1,93 @@
+import hashlib
+import logging
+from datetime import timedelta
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from elshawi_backend.redis_client import get_redis, mark_unavailable
+from .models import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'llm_cache:'
+
+
+def make_cache_key(namespace, model, prompt_version, *inputs):
+    """Content-addressed key: the same model, prompt version and inputs always map to the same entry."""
+    digest = hashlib.sha256()
+    for part in (namespace, model, str(prompt_version), *inputs):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _ttl():
+    return getattr(settings, 'LLM_CACHE_TTL', 7 * 24 * 3600)
+
+
+def get_cached_response(key):
+    """Return the cached response for ``key`` from Redis, then the database, or None."""
+    client = get_redis()
+    if client is not None:
+        try:
+            value = client.get(REDIS_KEY_PREFIX + key)
+            if value is not None:
+                return value.decode('utf-8')
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    now = timezone.now()
+    entry = LLMResponseCache.objects.filter(key=key, expires_at__gt=now).only('response', 'expires_at').first()
+    if entry is None:
+        return None
+    LLMResponseCache.objects.filter(key=key).update(last_accessed=now)
+
+    if client is not None:
+        try:
+            remaining = int((entry.expires_at - now).total_seconds())
+            if remaining > 0:
+                client.set(REDIS_KEY_PREFIX + key, entry.response, ex=remaining)
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return entry.response
+
+
+def set_cached_response(key, namespace, response):
+    """Store a successful response in Redis (with TTL) and in the database fallback."""
+    ttl = _ttl()
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(REDIS_KEY_PREFIX + key, response, ex=ttl)
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    now = timezone.now()
+    LLMResponseCache.objects.update_or_create(
+        key=key,
+        defaults={
+            'namespace': namespace,
+            'response': response,
+            'last_accessed': now,
+            'expires_at': now + timedelta(seconds=ttl),
+        }
+    )
+
+
+def purge_llm_cache():
+    """Delete expired database entries and trim the table to its least-recently-used limit."""
+    expired, _ = LLMResponseCache.objects.filter(expires_at__lte=timezone.now()).delete()
+
+    max_entries = getattr(settings, 'LLM_CACHE_DB_MAX_ENTRIES', 5000)
+    cutoff = LLMResponseCache.objects.order_by('-last_accessed').values_list('last_accessed', flat=True)[max_entries:max_entries + 1]
+    evicted = 0
+    if cutoff:
+        evicted, _ = LLMResponseCache.objects.filter(last_accessed__lte=cutoff[0]).delete()
+    return expired, evicted
+
+
+aget_cached_response = sync_to_async(get_cached_response)
+aset_cached_response = sync_to_async(set_cached_response)
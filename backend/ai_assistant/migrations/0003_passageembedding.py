@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-17 18:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_documentpassage'),
+        ('ai_assistant', '0002_documentembedding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PassageEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('vector', models.BinaryField()),
+                ('passage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='embeddings', to='documents.documentpassage')),
+            ],
+            options={
+                'unique_together': {('passage', 'model')},
+            },
+        ),
+    ]
@@ -18,4 +18,55 @@ class AIResponse(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Q: {self.question[:50]}... by {self.user.fullname}"
\ No newline at end of file
+        return f"Q: {self.question[:50]}... by {self.user.fullname}"
+
+class DocumentEmbedding(models.Model):
+    """Embedding of a document's text, shared by every upload with the same file hash."""
+    file_hash = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=100)
+    dimensions = models.PositiveIntegerField()
+    vector = models.BinaryField()  # L2-normalised float32 bytes
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Embedding {self.file_hash[:12]} ({self.model})"
+
+
+class EmbeddingFailure(models.Model):
+    """Failed embedding attempts for a file hash; past AI_ASSISTANT_EMBEDDING_MAX_ATTEMPTS it is no longer queued."""
+    file_hash = models.CharField(max_length=64)
+    model = models.CharField(max_length=100)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('file_hash', 'model')
+
+    def __str__(self):
+        return f"Embedding failure {self.file_hash[:12]} ({self.attempts} attempts)"
+
+
+class PassageEmbedding(models.Model):
+    passage = models.ForeignKey('documents.DocumentPassage', on_delete=models.CASCADE, related_name='embeddings')
+    model = models.CharField(max_length=100)
+    vector = models.BinaryField()  # L2-normalised float32 bytes
+
+    class Meta:
+        unique_together = ('passage', 'model')
+
+    def __str__(self):
+        return f"Embedding for {self.passage}"
+
+
+class LLMResponseCache(models.Model):
+    """Database fallback for cached LLM responses (Redis is the primary store)."""
+    key = models.CharField(max_length=64, unique=True)
+    namespace = models.CharField(max_length=50, db_index=True)
+    response = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(auto_now_add=True, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.namespace}:{self.key[:12]}"
@@ -0,0 +1,18 @@
+from celery import chain
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from documents.models import Document
+from documents.tasks import extract_text_for_document
+from .tasks import embed_document
+
+
+@receiver(post_save, sender=Document)
+def queue_document_processing(sender, instance, created, **kwargs):
+    # Extraction first, so embedding reads the stored text instead of extracting it again.
+    if created and instance.file_hash:
+        document_id = instance.id
+        transaction.on_commit(
+            lambda: chain(extract_text_for_document.si(document_id), embed_document.si(document_id)).delay()
+        )
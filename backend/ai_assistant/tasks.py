@@ -0,0 +1,45 @@
+import logging
+
+from celery import shared_task
+
+from documents.models import Document
+from documents.extraction import extract_document_text
+from .embeddings import (
+    clear_embedding_failure, record_embedding_failure, release_embedding_claim, store_document_embedding,
+    store_passage_embeddings
+)
+from .llm_cache import purge_llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def embed_document(document_id):
+    """Compute and store the document and passage embeddings for an uploaded document."""
+    try:
+        document = Document.objects.get(id=document_id)
+    except Document.DoesNotExist:
+        return f"Document {document_id} not found"
+
+    if not document.file_hash:
+        return f"Document {document_id} has no file hash"
+
+    try:
+        extract_document_text(document)
+        store_document_embedding(document)
+        passage_count = store_passage_embeddings(document.file_hash)
+        clear_embedding_failure(document.file_hash)
+    except Exception as e:
+        logger.error(f"Error embedding document {document_id}: {str(e)}")
+        record_embedding_failure(document.file_hash, e)
+        return f"Embedding failed for document {document_id}"
+    finally:
+        release_embedding_claim(document_id)
+    return f"Document {document_id} embedded ({passage_count} new passages)"
+
+
+@shared_task
+def purge_llm_response_cache():
+    """Drop expired LLM cache rows and trim the table to LLM_CACHE_DB_MAX_ENTRIES."""
+    expired, evicted = purge_llm_cache()
+    return f"LLM cache purged: {expired} expired, {evicted} evicted"
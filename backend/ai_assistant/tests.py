@@ -1,3 +1,221 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from documents.analysis import analyze_document_text
+from documents.extraction import split_passages
+from documents.models import Document, DocumentPassage
+from documents.tasks import extract_text_for_document
+from elshawi_backend import llm_gateway
+from . import embeddings
+from .consumers import AIAssistantConsumer
+from .models import AIResponse, EmbeddingFailure, PassageEmbedding
+from .tasks import embed_document
+from .utils import analyze_document
+
+
+class UploadProcessingTests(TestCase):
+    def test_upload_queues_extraction_then_embedding(self):
+        user = User.objects.create_user(email='client@example.com', password='pass')
+        with mock.patch('ai_assistant.signals.chain') as chain, self.captureOnCommitCallbacks(execute=True):
+            document = Document.objects.create(
+                title='Lease', document_type='TXT', uploaded_by=user, file_hash='abc', file='documents/lease.txt'
+            )
+        chain.assert_called_once_with(extract_text_for_document.si(document.id), embed_document.si(document.id))
+        chain.return_value.delay.assert_called_once_with()
+
+
+class AIQuestionViewTests(APITestCase):
+    @mock.patch('ai_assistant.utils.chat_completion_sync')
+    def test_question_is_answered_without_an_event_loop_client(self, completion):
+        completion.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='Answer'))])
+        user = User.objects.create_user(email='client@example.com', password='pass')
+        self.client.force_authenticate(user=user)
+
+        response = self.client.post(reverse('ai-ask'), {'question': 'What is an NDA?'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['answer'], 'Answer')
+        self.assertEqual(len(llm_gateway._async_clients), 0)
+
+
+class EmbeddingQueueTests(TestCase):
+    def setUp(self):
+        embeddings._queued_until.clear()
+
+    @mock.patch('ai_assistant.embeddings.get_redis', return_value=None)
+    @mock.patch('ai_assistant.tasks.embed_document.delay')
+    def test_document_is_queued_again_once_its_task_finished(self, delay, get_redis):
+        embeddings._queue_missing_embeddings([1001, 1002])
+        embeddings._queue_missing_embeddings([1001, 1002])
+        self.assertEqual([call.args for call in delay.call_args_list], [(1001,), (1002,)])
+
+        user = User.objects.create_user(email='client@example.com', password='pass')
+        document = Document.objects.create(title='Lease', document_type='TXT', uploaded_by=user, file_hash='abc')
+        embeddings._queue_missing_embeddings([document.id])
+        with mock.patch('ai_assistant.tasks.extract_document_text', side_effect=Exception('unreadable')):
+            embed_document(document.id)
+        embeddings._queue_missing_embeddings([1001, 1002, document.id])
+        self.assertEqual(
+            [call.args for call in delay.call_args_list], [(1001,), (1002,), (document.id,), (document.id,)]
+        )
+
+
+@override_settings(AI_ASSISTANT_EMBEDDING_MAX_ATTEMPTS=2)
+@mock.patch('ai_assistant.embeddings.get_redis', return_value=None)
+@mock.patch('ai_assistant.tasks.embed_document.delay')
+class UnembeddableDocumentTests(TestCase):
+    def setUp(self):
+        embeddings._queued_until.clear()
+        embeddings._index_cache.clear()
+        self.user = User.objects.create_user(email='owner@example.com', password='pass')
+
+    def test_hashless_documents_are_not_queued(self, delay, get_redis):
+        Document.objects.create(title='Scan', document_type='TXT', uploaded_by=self.user)
+        self.assertEqual(len(embeddings.get_user_index(self.user)), 0)
+        delay.assert_not_called()
+        self.assertIn(self.user.id, embeddings._index_cache)
+
+    def test_documents_that_keep_failing_stop_being_queued(self, delay, get_redis):
+        document = Document.objects.create(title='Lease', document_type='TXT', uploaded_by=self.user, file_hash='abc')
+        for attempt in range(2):
+            embeddings.get_user_index(self.user)
+            self.assertNotIn(self.user.id, embeddings._index_cache)
+            with mock.patch('ai_assistant.tasks.extract_document_text', side_effect=Exception('unreadable')):
+                embed_document(document.id)
+        self.assertEqual(delay.call_count, 2)
+        self.assertEqual(EmbeddingFailure.objects.get(file_hash='abc').last_error, 'unreadable')
+
+        embeddings.get_user_index(self.user)
+        self.assertEqual(delay.call_count, 2)
+        self.assertIn(self.user.id, embeddings._index_cache)
+
+
+class DocumentAnalysisCacheTests(TestCase):
+    @mock.patch('documents.analysis.chat_completion_sync')
+    def test_assistant_reuses_the_analysis_job_result(self, completion):
+        completion.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='Analysis'))])
+        self.assertEqual(analyze_document_text('Lease agreement text'), 'Analysis')
+
+        with mock.patch('ai_assistant.utils.stream_chat_completion') as stream:
+            self.assertEqual(async_to_sync(analyze_document)('Lease agreement text'), 'Analysis')
+        stream.assert_not_called()
+
+    def test_failed_stream_is_raised_and_not_cached(self):
+        async def stream(*args, **kwargs):
+            yield 'Partial '
+            raise RuntimeError('model unavailable')
+
+        with mock.patch('ai_assistant.utils.stream_chat_completion', stream):
+            with self.assertRaises(RuntimeError):
+                async_to_sync(analyze_document)('Unanalysed text')
+        with mock.patch('documents.analysis.chat_completion_sync') as completion:
+            completion.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='Analysis'))])
+            self.assertEqual(analyze_document_text('Unanalysed text'), 'Analysis')
+
+
+class AIAssistantStreamingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='asker@example.com', password='pass')
+
+    def ask(self, deltas, error=None):
+        async def stream(*args, **kwargs):
+            for delta in deltas:
+                yield delta
+            if error:
+                raise error
+
+        async def conversation():
+            communicator = WebsocketCommunicator(AIAssistantConsumer.as_asgi(), '/ws/ai-assistant/')
+            communicator.scope['user'] = self.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            await communicator.receive_json_from()  # connection_established
+            await communicator.send_json_to({'type': 'ask_question', 'question': 'What is an NDA?'})
+            frames = []
+            while not frames or frames[-1]['type'] not in ('question_answered', 'error'):
+                frames.append(await communicator.receive_json_from(timeout=5))
+            await communicator.disconnect()
+            return frames
+
+        with mock.patch('ai_assistant.utils.stream_chat_completion', stream):
+            return async_to_sync(conversation)()
+
+    def test_chunks_are_forwarded_before_the_stored_answer(self):
+        frames = self.ask(['An NDA ', 'is a contract.'])
+        chunks = [frame for frame in frames if frame['type'] == 'answer_chunk']
+        self.assertEqual([(chunk['index'], chunk['delta']) for chunk in chunks], [(0, 'An NDA '), (1, 'is a contract.')])
+        self.assertEqual(frames[-1]['type'], 'question_answered')
+        self.assertEqual(frames[-1]['response']['answer'], 'An NDA is a contract.')
+        self.assertEqual(AIResponse.objects.get().answer, 'An NDA is a contract.')
+
+    def test_failed_stream_sends_an_error_and_stores_nothing(self):
+        frames = self.ask(['An NDA '], error=RuntimeError('model unavailable'))
+        self.assertEqual([frame['type'] for frame in frames][-2:], ['answer_chunk', 'error'])
+        self.assertIn('model unavailable', frames[-1]['message'])
+        self.assertNotIn('Placeholder', frames[-1]['message'])
+        self.assertFalse(AIResponse.objects.exists())
+
+
+class PassageSelectionTests(TestCase):
+    def setUp(self):
+        self.lease = SimpleNamespace(file_hash='b' * 64)
+        self.deed = SimpleNamespace(file_hash='a' * 64)
+
+    def add_passages(self, file_hash, count):
+        return [
+            DocumentPassage.objects.create(
+                file_hash=file_hash, position=position, start_offset=position * 100,
+                text=f'clause {position} of {file_hash[0]} ' + 'term ' * 30
+            )
+            for position in range(count)
+        ]
+
+    def embed(self, passage, *values):
+        PassageEmbedding.objects.create(
+            passage=passage, model=embeddings.get_embedding_model(),
+            vector=embeddings.to_unit_vector(values).tobytes()
+        )
+
+    def test_split_passages_overlap_and_cover_the_text(self):
+        text = ' '.join(f'word{index}' for index in range(200))
+        passages = split_passages(text, size=100, overlap=20)
+
+        self.assertGreater(len(passages), 1)
+        for (start, passage), (next_start, _) in zip(passages, passages[1:]):
+            self.assertLessEqual(len(passage), 100)
+            self.assertEqual(text[start:start + len(passage)], passage)
+            self.assertLess(next_start, start + len(passage))
+        start, passage = passages[-1]
+        self.assertTrue(text.endswith(passage))
+
+    def test_closest_passages_fit_the_budget_in_document_rank_order(self):
+        lease = self.add_passages(self.lease.file_hash, 3)
+        deed = self.add_passages(self.deed.file_hash, 3)
+        for passage, similarity in zip(lease + deed, (0.1, 0.2, 0.9, 0.8, 0.3, 0.0)):
+            self.embed(passage, similarity, 1 - similarity)
+        budget = embeddings.estimate_tokens(lease[2].text) + embeddings.estimate_tokens(deed[0].text)
+
+        selected = embeddings.select_passages([self.lease, self.deed], np.array([1, 0], dtype=np.float32), budget)
+
+        self.assertEqual(
+            [(document, passage.position) for document, passage in selected], [(self.lease, 2), (self.deed, 0)]
+        )
+        self.assertLessEqual(sum(embeddings.estimate_tokens(passage.text) for _, passage in selected), budget)
+
+    def test_unembedded_passages_fall_back_to_the_best_ranked_document(self):
+        lease = self.add_passages(self.lease.file_hash, 3)
+        self.add_passages(self.deed.file_hash, 3)
+        budget = embeddings.estimate_tokens(lease[0].text) * 2
+
+        selected = embeddings.select_passages([self.lease, self.deed], np.array([1, 0], dtype=np.float32), budget)
+
+        self.assertEqual(
+            [(document, passage.position) for document, passage in selected], [(self.lease, 0), (self.lease, 1)]
+        )
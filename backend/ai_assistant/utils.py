@@ -1,145 +1,159 @@
 from django.conf import settings
+from documents.analysis import (
+    ANALYSIS_CACHE_NAMESPACE, ANALYSIS_MODEL, ANALYSIS_REQUEST_OPTIONS, analysis_cache_key, analysis_messages
+)
 from documents.models import Document
-from documents.views import DocumentAnalyzeView
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from openai import AsyncOpenAI  # Use async client
+from asgiref.sync import sync_to_async
+from elshawi_backend.llm_gateway import chat_completion_sync, create_embeddings, stream_chat_completion
+from .embeddings import get_embedding_model, get_user_index, select_passages, to_unit_vector
+from .llm_cache import aget_cached_response, aset_cached_response
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
-async def get_openai_client():
-    """Initialize OpenAI client with OpenRouter configuration."""
-    return AsyncOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=settings.OPENROUTER_API_KEY
-    )
 
-async def get_document_embedding(document_text):
-    """Generate embedding for a document using OpenRouter."""
+async def embed_question(question):
+    """Embed a question as a unit vector, or return None if the embedding call fails."""
     try:
-        client = await get_openai_client()
-        response = await client.embeddings.create(
-            input=document_text[:8192],  # Truncate for ada-002 limit
-            model="text-embedding-ada-002"
-        )
-        return response.data[0].embedding
+        return to_unit_vector((await create_embeddings(
+            input=question,
+            model=get_embedding_model()
+        )).data[0].embedding)
     except Exception as e:
-        # Fallback to random vector for demo
-        return np.random.rand(1536)
+        logger.warning(f"Question embedding failed: {str(e)}")
+        return None
 
-async def get_similar_documents(question, user):
-    """Find top 3 similar documents for a question using embeddings."""
-    documents = Document.objects.filter(uploaded_by=user)
-    if not documents:
+async def get_similar_documents(question, user, top_k=3, question_embedding=None):
+    """Find the documents most similar to a question using the stored embedding index."""
+    index = await sync_to_async(get_user_index)(user)
+    if not len(index):
         return []
-    
+
+    if question_embedding is None:
+        question_embedding = await embed_question(question)
+        if question_embedding is None:
+            return []
+
+    document_ids = index.search(question_embedding, k=top_k)
+    documents = await sync_to_async(Document.objects.in_bulk)(document_ids)
+    return [documents[doc_id] for doc_id in document_ids if doc_id in documents]
+
+async def build_question_context(question, user):
+    """Return ``(documents, context)`` built from the passages most relevant to the question.
+
+    Candidate documents come from the document index; their passages are then
+    ranked against the question and added until AI_ASSISTANT_CONTEXT_TOKEN_BUDGET
+    is reached.
+    """
+    question_embedding = await embed_question(question)
+    if question_embedding is None:
+        return [], ""
+
+    candidates = await get_similar_documents(
+        question, user,
+        top_k=getattr(settings, 'AI_ASSISTANT_CONTEXT_DOCUMENTS', 5),
+        question_embedding=question_embedding
+    )
+    if not candidates:
+        return [], ""
+
+    selected = await sync_to_async(select_passages)(candidates, question_embedding)
+    documents, context_parts = [], []
+    for document, passage in selected:
+        if document not in documents:
+            documents.append(document)
+            context_parts.append(f"**من الوثيقة: {document.title}**")
+        context_parts.append(passage.text)
+    return documents, "\n\n".join(context_parts)
+
+async def collect_stream(chunks):
+    """Consume a streamed completion and return the full text."""
+    return ''.join([chunk async for chunk in chunks])
+
+async def stream_document_analysis(document_text):
+    """Analyze a document using OpenRouter with Markdown formatting, yielding text as it is generated.
+
+    Results are cached by document content, so re-analysing an unchanged
+    document yields the stored analysis in one chunk. A model failure is
+    raised to the caller, after whatever chunks were already yielded.
+    """
+    cache_key = analysis_cache_key(document_text)
+    cached = await aget_cached_response(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
     try:
-        client = await get_openai_client()
-        question_embedding = (await client.embeddings.create(
-            input=question,
-            model="text-embedding-ada-002"
-        )).data[0].embedding
+        async for delta in stream_chat_completion(
+            model=ANALYSIS_MODEL,
+            messages=analysis_messages(document_text),
+            **ANALYSIS_REQUEST_OPTIONS
+        ):
+            parts.append(delta)
+            yield delta
     except Exception as e:
-        question_embedding = np.random.rand(1536)  # Fallback
-    
-    doc_scores = []
-    analyzer = DocumentAnalyzeView()
-    for doc in documents:
-        try:
-            doc_text = analyzer.get_file_content(doc)
-            doc_embedding = await get_document_embedding(doc_text)
-            similarity = cosine_similarity([question_embedding], [doc_embedding])[0][0]
-            doc_scores.append((doc, similarity))
-        except:
-            continue
-    
-    doc_scores.sort(key=lambda x: x[1], reverse=True)
-    return [doc for doc, _ in doc_scores[:3]]
+        logger.error(f"Document analysis stream failed: {str(e)}")
+        raise
+    await aset_cached_response(cache_key, ANALYSIS_CACHE_NAMESPACE, ''.join(parts))
+
 
 async def analyze_document(document_text):
     """Analyze a document using OpenRouter with Markdown formatting."""
-    client = await get_openai_client()
+    return await collect_stream(stream_document_analysis(document_text))
+
+
+def qna_messages(question, context=""):
+    return [
+        {
+            "role": "system",
+            "content": """
+أنت مستشار قانوني محترف. أجب على السؤال بوضوح وإيجاز بلغة عربية فصحى، مستخدمًا تنسيق **Markdown** لتحسين القراءة. استخدم عناوين (h2، h3)، قوائم، وتنسيقًا بصريًا (*italic*، **bold**) حسب الحاجة. لا تخرج عن إطار القانون.
+            """
+        },
+        {
+            "role": "user",
+            "content": f"""
+**السؤال**: {question}
+
+{context}
+
+**ملاحظة**: قدم الإجابة بتنسيق Markdown واضح ومنظم.
+            """
+        }
+    ]
+
+
+async def stream_qna_answer(question, context=""):
+    """Generate Q&A answer using OpenRouter, yielding text as it is generated.
+
+    A model failure is raised to the caller, after whatever chunks were already yielded.
+    """
     try:
-        completion = await client.chat.completions.create(
-            extra_headers={
-                "HTTP-Referer": "https://your-site-url.com",
-                "X-Title": "Legal Document Analyzer",
-            },
+        async for delta in stream_chat_completion(
             extra_body={},
             model="qwen/qwen3-14b:free",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """
-أنت مستشار قانوني محترف، ومصمم محتوى مبدع في تقديم التحليلات القانونية بطريقة بصرية جذابة باستخدام Markdown. استعمل عناوين كبيرة (h1)، فرعية (h2، h3)، ونسق المحتوى باستخدام **bold**، *italic*، و`اقتباسات`. استعمل الرموز التعبيرية حسب السياق القانوني إن أمكن. يجب أن يكون النص منسقًا بدقة ليسهل قراءته ونسخه، وبلغة عربية فصحى احترافية. لا تخرج عن إطار القانون، ولا تتحدث عن نفسك.
-                    """
-                },
-                {
-                    "role": "user",
-                    "content": f"""
-يرجى تحليل الوثيقة التالية بدقة واحترافية، مستخدمًا تنسيق **Markdown كامل**، يتضمن:
-
-# ✅ ملخص عام للوثيقة:
-- ما طبيعة الوثيقة؟ (عقد، مذكرة، حكم...)
-- من هم الأطراف الأساسية؟
-- ما الهدف منها؟
-
-## ⚖️ البنود القانونية الجوهرية:
-- أهم البنود القانونية الواردة؟
-- هل توجد شروط غامضة أو تحتاج تفسيرًا؟
-- هل وردت إشارات إلى قوانين معينة أو مواد نظامية؟
-
-## ❗ المخاطر أو الثغرات القانونية:
-- هل هناك بنود قد تُستخدم ضد أحد الأطراف؟
-- هل يوجد غموض قانوني قد يسبب نزاعًا؟
-
-## 🛡️ التوصيات القانونية:
-- هل تُنصح بصياغة بديلة لبعض البنود؟
-- ما الإجراءات الاحتياطية القانونية المقترحة؟
-
----
-
-### 📄 الوثيقة الكاملة:
-
-> ```
-{document_text}
-> ```
-
-📌 **ملحوظة**: اجعل كل قسم واضحًا بعنوان بارز، ونسّق الفقرات داخل كل محور لجعل التجربة بصرية رائعة وسهلة الفهم.
-                    """
-                }
-            ]
-        )
-        return completion.choices[0].message.content
+            messages=qna_messages(question, context)
+        ):
+            yield delta
     except Exception as e:
-        return f"# ❗ خطأ في التحليل\n\nتحليل الوثيقة فشل: {str(e)}\n\n[Placeholder - actual OpenRouter integration needed]"
+        logger.error(f"Q&A stream failed: {str(e)}")
+        raise
+
 
+def generate_qna_answer(question, context=""):
+    """Generate Q&A answer using OpenRouter.
 
-async def generate_qna_answer(question, context=""):
-    """Generate Q&A answer using OpenRouter."""
-    client = await get_openai_client()
+    Blocking: sync views call this directly rather than through async_to_sync,
+    which would leave an async client behind for every throwaway event loop.
+    """
     try:
-        completion = await client.chat.completions.create(
+        response = chat_completion_sync(
             extra_body={},
             model="qwen/qwen3-14b:free",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """
-أنت مستشار قانوني محترف. أجب على السؤال بوضوح وإيجاز بلغة عربية فصحى، مستخدمًا تنسيق **Markdown** لتحسين القراءة. استخدم عناوين (h2، h3)، قوائم، وتنسيقًا بصريًا (*italic*، **bold**) حسب الحاجة. لا تخرج عن إطار القانون.
-                    """
-                },
-                {
-                    "role": "user",
-                    "content": f"""
-**السؤال**: {question}
-
-{context}
-
-**ملاحظة**: قدم الإجابة بتنسيق Markdown واضح ومنظم.
-                    """
-                }
-            ]
+            messages=qna_messages(question, context)
         )
-        return completion.choices[0].message.content
+        return response.choices[0].message.content
     except Exception as e:
-        return f"## ❗ خطأ\n\nفشل معالجة السؤال: {str(e)}\n\n[Placeholder - actual OpenRouter integration needed]"
\ No newline at end of file
+        return f"## ❗ خطأ\n\nفشل معالجة السؤال: {str(e)}\n\n[Placeholder - actual OpenRouter integration needed]"
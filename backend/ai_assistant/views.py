@@ -6,7 +6,7 @@ from .serializers import AIResponseSerializer, AIQuestionSerializer, AIRatingSer
 from documents.models import Document
 from django.conf import settings
 from django.template.loader import render_to_string
-from weasyprint import HTML
+from elshawi_backend.pdf_renderer import render_pdf
 from django.core.files.base import ContentFile
 from .utils import get_similar_documents, generate_qna_answer
 from asgiref.sync import sync_to_async
@@ -71,7 +71,7 @@ class AIResponseRateView(APIView):
                         return Response({'error': f'Failed to render HTML: {str(e)}'}, status=500)
                     
                     try:
-                        pdf_file = HTML(string=html_content).write_pdf()
+                        pdf_file = render_pdf(html_content)
                     except Exception as e:
                         return Response({'error': f'Failed to generate PDF: {str(e)}'}, status=500)
                     
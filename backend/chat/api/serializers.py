@@ -4,6 +4,7 @@ from ..models.message import Message
 from ..models.reaction import Reaction
 from ..models.notification import Notification
 from django.contrib.auth import get_user_model
+from elshawi_backend.serializers import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -26,7 +27,7 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         model = ChatRoom
         fields = ['id', 'name', 'room_type', 'participants', 'created_at', 'is_active']
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     sender = UserSerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
     reactions = serializers.SerializerMethodField()
@@ -39,8 +40,31 @@ class MessageSerializer(serializers.ModelSerializer):
         return obj.file.url if obj.file else None
     
     def get_reactions(self, obj):
-        reactions = Reaction.objects.filter(message=obj)
-        return ReactionSerializer(reactions, many=True).data
+        # Uses the prefetched reactions when the view loaded them
+        return ReactionSerializer(obj.reactions.all(), many=True).data
+
+
+class CompactMessageSerializer(serializers.ModelSerializer):
+    """History entry without nested users: senders go to the response's ``users`` table
+    and reactions are reduced to per-type counts plus the caller's own reactions.
+    """
+    sender = serializers.IntegerField(source='sender_id', read_only=True)
+    file_url = serializers.SerializerMethodField()
+    reactions = serializers.SerializerMethodField()
+    my_reactions = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Message
+        fields = ['id', 'sender', 'content', 'file_url', 'timestamp', 'is_read', 'is_edited', 'edited_at', 'reactions', 'my_reactions']
+
+    def get_file_url(self, obj):
+        return obj.file.url if obj.file else None
+
+    def get_reactions(self, obj):
+        return self.context['reaction_counts'].get(obj.id, {})
+
+    def get_my_reactions(self, obj):
+        return self.context['my_reactions'].get(obj.id, [])
 
 class ReactionSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -69,7 +93,7 @@ class ReactionSerializerInput(serializers.Serializer):
     reaction_type = serializers.ChoiceField(choices=Reaction.REACTION_TYPES)
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     time_since = serializers.SerializerMethodField()
     content_object = serializers.SerializerMethodField()
     
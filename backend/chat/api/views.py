@@ -1,9 +1,11 @@
+from collections import defaultdict
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics, filters
 from rest_framework.decorators import api_view, permission_classes
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
 from chat.models.chat_room import ChatRoom
 from chat.models.message import Message
@@ -11,15 +13,19 @@ from chat.models.reaction import Reaction
 from chat.models.notification import Notification
 from chat.services.file_service import FileService
 from chat.services.message_service import MessageService
+from chat.services.presence_service import online_among
 from chat.exceptions import ChatRoomException, FileUploadException
 from chat.api.serializers import (
-    ChatRoomSerializer, MessageSerializer, ReactionSerializer,
+    ChatRoomSerializer, CompactMessageSerializer, MessageSerializer, ReactionSerializer,
     CreateRoomSerializer, SendMessageSerializer, EditMessageSerializer,
     ReactionSerializerInput, NotificationSerializer, NotificationMarkReadSerializer,
     UserSerializer
 )
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import permissions
+from elshawi_backend.pagination import KeysetPagination
+from notifications.unread import get_unread_count, mark_all_read as mark_all_notifications_read
 User = get_user_model()
 
 class ActiveUsersList(generics.ListAPIView):
@@ -31,6 +37,19 @@ class ActiveUsersList(generics.ListAPIView):
     def get_queryset(self):
         return User.objects.filter(is_active=True, is_deleted=False).exclude(id=self.request.user.id)
 
+class OnlineUsersView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            user_ids = [int(user_id) for user_id in request.query_params.get('user_ids', '').split(',') if user_id]
+        except ValueError:
+            return Response({'error': 'user_ids must be a comma-separated list of ids'}, status=status.HTTP_400_BAD_REQUEST)
+        max_users = getattr(settings, 'PRESENCE_QUERY_MAX_USERS', 500)
+        if len(user_ids) > max_users:
+            return Response({'error': f'At most {max_users} user_ids can be queried at once'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'online': sorted(online_among(user_ids))})
+
 class ChatRoomListCreate(APIView):
     def get(self, request):
         try:
@@ -70,14 +89,8 @@ class UserChatRooms(APIView):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class MessageHistory(generics.ListAPIView):
-    serializer_class = MessageSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    ordering_fields = ['timestamp']
-    ordering = ['timestamp']
-    
-    def get_queryset(self):
+class RoomMessagesMixin:
+    def get_room_messages(self):
         room_name = self.kwargs['room_name']
         try:
             room = ChatRoom.objects.get(name=room_name, is_active=True)
@@ -87,6 +100,68 @@ class MessageHistory(generics.ListAPIView):
         except ChatRoom.DoesNotExist:
             raise ChatRoomException(detail="Room not found")
 
+
+class MessageHistory(RoomMessagesMixin, generics.ListAPIView):
+    """Newest-first history pages; clients load older pages on scroll-back."""
+    serializer_class = MessageSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-timestamp'
+    
+    def get_queryset(self):
+        return self.get_room_messages().select_related('sender__role').prefetch_related(
+            Prefetch('reactions', queryset=Reaction.objects.select_related('user__role'))
+        )
+
+
+class CompactMessageHistory(RoomMessagesMixin, generics.ListAPIView):
+    """Newest-first history pages for opening large rooms.
+
+    Senders are listed once in ``users`` and reactions are aggregated per
+    type, so a page costs a fixed number of queries however many reactions
+    and participants the room has.
+    """
+    serializer_class = CompactMessageSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-timestamp'
+
+    def get_queryset(self):
+        return self.get_room_messages().select_related('sender__role')
+
+    def list(self, request, *args, **kwargs):
+        messages = list(self.paginate_queryset(self.get_queryset()))
+        message_ids = [message.id for message in messages]
+
+        reaction_counts = defaultdict(dict)
+        for message_id, reaction_type, count in (
+            Reaction.objects.filter(message_id__in=message_ids)
+            .values_list('message_id', 'reaction_type')
+            .annotate(count=Count('id'))
+            .order_by()
+        ):
+            reaction_counts[message_id][reaction_type] = count
+
+        my_reactions = defaultdict(list)
+        for message_id, reaction_type in Reaction.objects.filter(
+            message_id__in=message_ids, user=request.user
+        ).values_list('message_id', 'reaction_type'):
+            my_reactions[message_id].append(reaction_type)
+
+        serializer = self.get_serializer(messages, many=True, context={
+            **self.get_serializer_context(),
+            'reaction_counts': reaction_counts,
+            'my_reactions': my_reactions,
+        })
+        senders = {message.sender_id: message.sender for message in messages}
+
+        response = self.get_paginated_response(serializer.data)
+        response.data['users'] = {
+            user_id: data for user_id, data in zip(senders, UserSerializer(senders.values(), many=True).data)
+        }
+        return response
+
 class FileUpload(APIView):
     def post(self, request):
         try:
@@ -167,21 +242,19 @@ class UnreadNotificationCountView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return Response({'count': count})
+        return Response({'count': get_unread_count(request.user.id, Notification)})
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_notification_read(request, pk):
     notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
+    notification.mark_as_read()
     return Response({'status': 'marked as read'})
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_all_read(request):
-    updated = Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    updated = mark_all_notifications_read(request.user.id, Notification)
     return Response({'marked_read': updated})
 
 @api_view(['POST'])
@@ -7,10 +7,12 @@ from chat.models.chat_room import ChatRoom
 from chat.models.message import Message
 from chat.models.reaction import Reaction
 from notifications.models import Notification
+from notifications.fanout import build_notification_events, create_notifications, push_notification_events
+from .profile_frames import ProfileFramesMixin
 
 logger = logging.getLogger(__name__)
 
-class ChatConsumer(AsyncWebsocketConsumer):
+class ChatConsumer(ProfileFramesMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.room_name = self.scope['url_route']['kwargs']['room_name']
         self.room_group_name = f'chat_{self.room_name}'
@@ -34,27 +36,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
         await self.accept()
 
-        # Send user online status
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'status',
-                'user': await self.get_user_profile(self.user),
-                'status': 'online'
-            }
-        )
-
     async def disconnect(self, close_code):
+        # Online/offline is published to room participants by the presence service
         if hasattr(self, 'room_group_name'):
-            # Send user offline status
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'status',
-                    'user': await self.get_user_profile(self.user),
-                    'status': 'offline'
-                }
-            )
             # Leave room group
             await self.channel_layer.group_discard(
                 self.room_group_name,
@@ -117,7 +101,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 'type': 'message',
                 'message_id': message.id,
                 'room': message.room.id,
-                'sender': await self.get_user_profile(self.user),
+                'sender_id': self.user.id,
                 'message': message.content,
                 'timestamp': message.timestamp.isoformat(),
                 'is_edited': message.is_edited,
@@ -128,19 +112,17 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         room = await self.get_room()
         if room:
-            participants = await self.get_room_participants(room)
-            for participant in participants:
-                if participant != self.user:
-                    await self.create_notification(
-                        user=participant,
-                        title=f"رسالة جديدة من {self.user.fullname}",
-                        message=message_content[:100],
-                        notification_type='new_message',
-                        content_object=message,
-                        priority='medium',
-                        action_url=f"/chat/{self.room_name}/",
-                        action_text='عرض الرسالة'
-                    )
+            events = await self.notify_participants(
+                room,
+                title=f"رسالة جديدة من {self.user.fullname}",
+                message=message_content[:100],
+                notification_type='new_message',
+                content_object=message,
+                priority='medium',
+                action_url=f"/chat/{self.room_name}/",
+                action_text='عرض الرسالة'
+            )
+            await push_notification_events(events)
 
     async def handle_reaction(self, data):
         message_id = data.get('message_id')
@@ -184,7 +166,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             {
                 'type': 'reaction',
                 'message_id': message_id,
-                'user': await self.get_user_profile(self.user),
+                'user_id': self.user.id,
                 'reaction_type': reaction_type
             }
         )
@@ -209,7 +191,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             {
                 'type': 'typing',
-                'user': await self.get_user_profile(self.user),
+                'user_id': self.user.id,
                 'is_typing': is_typing
             }
         )
@@ -221,7 +203,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     'type': 'status',
-                    'user': await self.get_user_profile(self.user),
+                    'user_id': self.user.id,
                     'status': status
                 }
             )
@@ -232,7 +214,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'type': 'message',
             'message_id': event['message_id'],
             'room': event['room'],
-            'sender': event['sender'],
+            'sender': await self.profile_frame(event['sender_id']),
             'message': event['message'],
             'timestamp': event['timestamp'],
             'is_edited': event['is_edited'],
@@ -244,21 +226,21 @@ class ChatConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'type': 'reaction',
             'message_id': event['message_id'],
-            'user': event['user'],
+            'user': await self.profile_frame(event['user_id']),
             'reaction_type': event['reaction_type']
         }))
 
     async def typing(self, event):
         await self.send(text_data=json.dumps({
             'type': 'typing',
-            'user': event['user'],
+            'user': await self.profile_frame(event['user_id']),
             'is_typing': event['is_typing']
         }))
 
     async def status(self, event):
         await self.send(text_data=json.dumps({
             'type': 'status',
-            'user': event['user'],
+            'user': await self.profile_frame(event['user_id']),
             'status': event['status']
         }))
 
@@ -328,40 +310,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
             return None
 
     @database_sync_to_async
-    def get_room_participants(self, room):
+    def notify_participants(self, room, **fields):
+        """Write every other participant's notification in one INSERT and return the events to push."""
         try:
-            return list(room.participants.all())
+            recipients = list(room.participants.exclude(id=self.user.id))
+            notifications = create_notifications(recipients, **fields)
+            return build_notification_events(notifications)
         except Exception as e:
-            logger.error(f"Error fetching room participants: {str(e)}")
+            logger.error(f"Error creating notifications: {str(e)}")
             return []
 
-    @database_sync_to_async
-    def get_user_profile(self, user):
-        try:
-            profile = user.profile
-            return {
-                'id': user.id,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'fullname': user.fullname,
-                'role': profile.role if hasattr(profile, 'role') else 'user',
-                'avatar': profile.avatar.url if hasattr(profile, 'avatar') and profile.avatar else None,
-                'is_active': user.is_active
-            }
-        except Exception as e:
-            logger.error(f"Error fetching user profile: {str(e)}")
-            return {
-                'id': user.id,
-                'email': user.email,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'fullname': user.fullname,
-                'role': 'user',
-                'avatar': None,
-                'is_active': user.is_active
-            }
-
     @database_sync_to_async
     def get_message_reactions(self, message):
         try:
@@ -1,6 +1,7 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from notifications.unread import get_unread_count
 from ..models.notification import Notification
 
 class NotificationConsumer(AsyncWebsocketConsumer):
@@ -30,4 +31,4 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        return Notification.objects.filter(user=self.user, is_read=False).count()
\ No newline at end of file
+        return get_unread_count(self.user.id, Notification)
\ No newline at end of file
@@ -1,26 +1,28 @@
+import asyncio
 import json
 import logging
-from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from ..exceptions import WebSocketException
+from ..services import presence_service
+from .profile_frames import ProfileFramesMixin
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
-class PresenceConsumer(AsyncWebsocketConsumer):
+class PresenceConsumer(ProfileFramesMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope['user']
-        self.group_name = 'presence'
 
         if not self.user.is_authenticated:
             logger.warning(f"Unauthenticated user attempted to connect to presence")
             raise WebSocketException("User not authenticated")
 
-        # Get user profile data asynchronously
-        profile_data = await self.get_user_profile_data(self.user)
-
-        # Join presence group
+        # Only status changes of this user's contacts are delivered here
+        self.group_name = presence_service.presence_group(self.user.id)
         await self.channel_layer.group_add(
             self.group_name,
             self.channel_name
@@ -28,68 +30,87 @@ class PresenceConsumer(AsyncWebsocketConsumer):
 
         await self.accept()
 
-        # Notify others of user joining
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                'type': 'user_status',
-                'user': {
-                    'id': self.user.id,
-                    'email': self.user.email,
-                    'first_name': self.user.first_name,
-                    'last_name': self.user.last_name,
-                    'fullname': self.user.fullname,
-                    'role': profile_data['role'],
-                    'avatar': profile_data['avatar'],
-                    'is_active': self.user.is_active,
-                },
-                'status': 'online'
-            }
-        )
+        await sync_to_async(presence_service.heartbeat)(self.user.id, self.channel_name)
+        presence_service.schedule_status_broadcast(self.user.id)
+        self.heartbeat_task = asyncio.create_task(self.heartbeat_loop())
+
+        await self.send_online_contacts()
 
     async def disconnect(self, close_code):
         if hasattr(self, 'group_name'):
             try:
-                # Get user profile data asynchronously
-                profile_data = await self.get_user_profile_data(self.user)
+                if hasattr(self, 'heartbeat_task'):
+                    self.heartbeat_task.cancel()
 
                 await self.channel_layer.group_discard(
                     self.group_name,
                     self.channel_name
                 )
 
-                if self.user.is_authenticated:
-                    # Notify others of user leaving
-                    await self.channel_layer.group_send(
-                        self.group_name,
-                        {
-                            'type': 'user_status',
-                            'user': {
-                                'id': self.user.id,
-                                'email': self.user.email,
-                                'first_name': self.user.first_name,
-                                'last_name': self.user.last_name,
-                                'fullname': self.user.fullname,
-                                'role': profile_data['role'],
-                                'avatar': profile_data['avatar'],
-                                'is_active': self.user.is_active,
-                            },
-                            'status': 'offline'
-                        }
-                    )
+                await sync_to_async(presence_service.disconnect)(self.user.id, self.channel_name)
+                presence_service.schedule_status_broadcast(self.user.id)
             except Exception as e:
                 logger.error(f"Presence disconnect error for user {self.user.email if hasattr(self.user, 'email') else 'unknown'}: {str(e)}")
 
-    async def user_status(self, event):
+    async def receive(self, text_data):
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON received on presence: {text_data}")
+            return
+
+        message_type = data.get('type')
+        if message_type in ('ping', 'heartbeat'):
+            await sync_to_async(presence_service.heartbeat)(self.user.id, self.channel_name)
+            await self.send(text_data=json.dumps({'type': 'pong'}))
+        elif message_type == 'query':
+            user_ids = data.get('user_ids') or []
+            try:
+                user_ids = [int(user_id) for user_id in user_ids][:getattr(settings, 'PRESENCE_QUERY_MAX_USERS', 500)]
+            except (TypeError, ValueError):
+                user_ids = []
+            # Only contacts can be looked up; anyone else is reported offline
+            contacts = await database_sync_to_async(self.get_contacts)()
+            online = await sync_to_async(presence_service.online_among)(
+                [user_id for user_id in user_ids if user_id in contacts]
+            )
+            await self.send(text_data=json.dumps({
+                'type': 'presence',
+                'online': sorted(online)
+            }))
+        else:
+            logger.warning(f"Unknown presence message type received: {message_type}")
+
+    async def heartbeat_loop(self):
+        # Keeps the connection alive in Redis even if the client never pings
+        interval = getattr(settings, 'PRESENCE_HEARTBEAT_INTERVAL', 30)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await sync_to_async(presence_service.heartbeat)(self.user.id, self.channel_name)
+            except Exception as e:
+                logger.error(f"Presence heartbeat failed for user {self.user.id}: {str(e)}")
+
+    async def send_online_contacts(self):
+        online = await database_sync_to_async(self.get_online_contacts)()
+        if online:
+            await self.send_status_batch([{'user_id': user_id, 'status': 'online'} for user_id in sorted(online)])
+
+    def get_contacts(self):
+        return presence_service.contacts_of([self.user.id]).get(self.user.id, set())
+
+    def get_online_contacts(self):
+        return presence_service.online_among(self.get_contacts())
+
+    async def presence_batch(self, event):
+        await self.send_status_batch(event['changes'])
+
+    async def send_status_batch(self, changes):
+        # One frame per batch, however many contacts changed status
         await self.send(text_data=json.dumps({
-            'type': 'status',
-            'user': event['user'],
-            'status': event['status']
+            'type': 'status_batch',
+            'changes': [
+                {'user': await self.profile_frame(change['user_id']), 'status': change['status']}
+                for change in changes
+            ]
         }))
-
-    @database_sync_to_async
-    def get_user_profile_data(self, user):
-        return {
-            'role': user.role.name if user.role else 'Client',
-            'avatar': user.avatar.url if user.avatar else None
-        }
@@ -0,0 +1,20 @@
+from accounts.profile_cache import aget_profile_snapshot
+
+
+class ProfileFramesMixin:
+    """Send each user profile to a connection once per version.
+
+    Group events only carry user ids. The first frame that mentions a user
+    (or a new version of their profile) embeds the full snapshot; later
+    frames carry just ``{'id', 'version'}`` and clients reuse what they have.
+    """
+
+    async def profile_frame(self, user_id):
+        snapshot = await aget_profile_snapshot(user_id)
+        if snapshot is None:
+            return {'id': user_id}
+        seen = self.__dict__.setdefault('_seen_profile_versions', {})
+        if seen.get(user_id) == snapshot['version']:
+            return {'id': user_id, 'version': snapshot['version']}
+        seen[user_id] = snapshot['version']
+        return snapshot
@@ -14,5 +14,11 @@ class Message(models.Model):
     is_edited = models.BooleanField(default=False)
     edited_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # History is paged by timestamp within a room
+            models.Index(fields=['room', 'timestamp'], name='chat_message_room_ts_idx'),
+        ]
+
     def __str__(self):
         return f"{self.sender.username}: {self.content[:50]}"
\ No newline at end of file
@@ -80,8 +80,8 @@ class Notification(models.Model):
         return f"{self.title} - {self.user.email}"
     
     def mark_as_read(self):
-        self.is_read = True
-        self.save()
+        from notifications.unread import mark_read
+        mark_read(self)
     
     @classmethod
     def create_notification(cls, user, title, message, notification_type='system_alert',
@@ -95,4 +95,18 @@ class Notification(models.Model):
             content_object=content_object,
             action_url=action_url,
             action_text=action_text
-        )
\ No newline at end of file
+        )
+
+    @property
+    def time_since(self):
+        diff = timezone.now() - self.created_at
+        
+        if diff.days > 0:
+            return f"{diff.days} days ago"
+        elif diff.seconds > 3600:
+            hours = diff.seconds // 3600
+            return f"{hours} hour{'s' if hours > 1 else ''} ago"
+        elif diff.seconds > 60:
+            minutes = diff.seconds // 60
+            return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+        return "Just now"
@@ -1,6 +1,6 @@
 import os
 from django.core.files.storage import default_storage
-from notifications.utils import send_user_notification
+from notifications.fanout import fan_out_notifications
 # from settings import ALLOWED_FILE_TYPES, MAX_FILE_SIZE
 from ..exceptions import FileUploadException
 
@@ -28,17 +28,17 @@ class FileService:
             file_path = default_storage.save(f"chat_files/{file.name}", file)
             file_url = default_storage.url(file_path)
             # Send notification to room participants
-            for participant in room.participants.exclude(id=user.id):
-                send_user_notification(
-                    user=participant,
-                    title=f"New File in {room.name}",
-                    message=f"{user.username} uploaded a file: {file.name}",
-                    notification_type='document_uploaded',
-                    content_object=room,
-                    priority='medium',
-                    action_url=file_url,
-                    action_text="View File"
-                )
+            fan_out_notifications(
+                room.participants.exclude(id=user.id),
+                title=f"New File in {room.name}",
+                message=f"{user.username} uploaded a file: {file.name}",
+                notification_type='document_uploaded',
+                content_object=room,
+                priority='medium',
+                action_url=file_url,
+                action_text="View File",
+                send_email=True
+            )
             return file_url
         except Exception as e:
             raise FileUploadException(detail=f"Failed to save file: {str(e)}")
\ No newline at end of file
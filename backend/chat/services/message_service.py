@@ -1,10 +1,12 @@
-from datetime import timezone
+from collections import defaultdict
 
 from django.conf import settings
 from ..models.message import Message
 from ..models.chat_room import ChatRoom
 from ..exceptions import ChatRoomException
-from .notification_service import send_user_notification
+from ..models.notification import Notification
+from chat.api.serializers import NotificationSerializer
+from notifications.fanout import fan_out_notifications
 from django.utils import timezone
 
 class MessageService:
@@ -21,18 +23,24 @@ class MessageService:
                 content=content,
                 file=file_url
             )
-            # Send notification to other participants
-            for participant in room.participants.exclude(id=sender.id):
+            # Notify the other participants with one fan-out per role (the action URL depends on it)
+            recipients_by_role = defaultdict(list)
+            for participant in room.participants.exclude(id=sender.id).select_related('role'):
                 role_slug = participant.role.name.lower() if participant.role else 'guest'
-                send_user_notification(
-                    user=participant,
+                recipients_by_role[role_slug].append(participant)
+            for role_slug, recipients in recipients_by_role.items():
+                fan_out_notifications(
+                    recipients,
                     title=f"New Message in {room.name}",
                     message=f"{sender.username}: {content[:50]}...",
                     notification_type='message_received',
                     content_object=message,
                     priority='medium',
                     action_url=f"{settings.FRONTEND_URL}/dashboard/{role_slug}/{room.name}",
-                    action_text="View Message"
+                    action_text="View Message",
+                    send_email=True,
+                    model=Notification,
+                    serializer_class=NotificationSerializer
                 )
             return message
         except ChatRoom.DoesNotExist:
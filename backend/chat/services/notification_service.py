@@ -7,6 +7,7 @@ from asgiref.sync import async_to_sync
 
 from chat.api.serializers import NotificationSerializer
 from chat.models.notification import Notification
+from notifications.unread import get_unread_count
 
 
 def send_user_notification(user, title, message, notification_type='system_alert',
@@ -57,7 +58,7 @@ def send_user_notification(user, title, message, notification_type='system_alert
             'content': {
                 'type': 'NEW_NOTIFICATION',
                 'notification': NotificationSerializer(notification).data,
-                'unread_count': Notification.objects.filter(user=user, is_read=False).count()
+                'unread_count': get_unread_count(user.id, Notification)
             }
         }
     )
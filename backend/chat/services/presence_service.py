@@ -0,0 +1,272 @@
+"""Online presence backed by Redis sorted sets.
+
+Each websocket connection heartbeats into ``presence:conns:<user_id>`` and the
+user's latest heartbeat is kept in the ``presence:online`` sorted set, scored
+by timestamp. A user is online while that score is newer than
+``PRESENCE_TTL``; connections of a crashed worker simply stop heartbeating and
+are dropped by ``expire_stale_presence``.
+
+Status changes are not broadcast globally. They are debounced per process,
+compared with the last published status (so a page reload publishes nothing)
+and sent as one batch per recipient to ``presence_<user_id>`` groups, where
+recipients are the user's chat contacts.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import redis
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db.models import Subquery
+
+from chat.models.chat_room import ChatRoom
+from elshawi_backend.redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+ONLINE_KEY = 'presence:online'
+PUBLISHED_KEY = 'presence:published'
+CONNECTIONS_KEY_PREFIX = 'presence:conns:'
+
+# Drop one connection; if the user has no live connection left, drop the user.
+_DISCONNECT_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Pop every user whose last heartbeat is older than the cutoff.
+_EXPIRE_SCRIPT = """
+local stale = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if #stale > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+end
+return stale
+"""
+
+
+def presence_ttl():
+    return getattr(settings, 'PRESENCE_TTL', 90)
+
+
+def presence_group(user_id):
+    return f'presence_{user_id}'
+
+
+class _LocalPresence:
+    """Per-process stand-in used while Redis is unreachable."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = defaultdict(dict)
+        self.published = {}
+
+    def heartbeat(self, user_id, connection_id, now):
+        with self.lock:
+            self.connections[user_id][connection_id] = now
+
+    def disconnect(self, user_id, connection_id, cutoff):
+        with self.lock:
+            connections = self.connections.get(user_id, {})
+            connections.pop(connection_id, None)
+            for key in [key for key, seen in connections.items() if seen < cutoff]:
+                del connections[key]
+            if not connections:
+                self.connections.pop(user_id, None)
+
+    def online_among(self, user_ids, cutoff):
+        with self.lock:
+            return {
+                user_id for user_id in user_ids
+                if any(seen >= cutoff for seen in self.connections.get(user_id, {}).values())
+            }
+
+    def expire(self, cutoff):
+        with self.lock:
+            stale = [
+                user_id for user_id, connections in self.connections.items()
+                if all(seen < cutoff for seen in connections.values())
+            ]
+            for user_id in stale:
+                del self.connections[user_id]
+            return stale
+
+    def swap_published(self, statuses):
+        with self.lock:
+            changed = {user_id: status for user_id, status in statuses.items() if self.published.get(user_id, 'offline') != status}
+            self.published.update(changed)
+            return changed
+
+
+_local = _LocalPresence()
+
+
+def _cutoff(now=None):
+    return (now or time.time()) - presence_ttl()
+
+
+def heartbeat(user_id, connection_id):
+    """Record that ``connection_id`` of ``user_id`` is alive; also used on connect."""
+    now = time.time()
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.zadd(f'{CONNECTIONS_KEY_PREFIX}{user_id}', {connection_id: now})
+            pipe.expire(f'{CONNECTIONS_KEY_PREFIX}{user_id}', presence_ttl() * 2)
+            pipe.zadd(ONLINE_KEY, {user_id: now})
+            pipe.execute()
+            return
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    _local.heartbeat(user_id, connection_id, now)
+
+
+def disconnect(user_id, connection_id):
+    """Forget ``connection_id``; the user goes offline once their last live connection is gone."""
+    client = get_redis()
+    if client is not None:
+        try:
+            client.eval(
+                _DISCONNECT_SCRIPT, 2,
+                f'{CONNECTIONS_KEY_PREFIX}{user_id}', ONLINE_KEY,
+                connection_id, _cutoff(), user_id
+            )
+            return
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    _local.disconnect(user_id, connection_id, _cutoff())
+
+
+def online_among(user_ids):
+    """Return the subset of ``user_ids`` that is currently online."""
+    user_ids = [int(user_id) for user_id in user_ids]
+    if not user_ids:
+        return set()
+    cutoff = _cutoff()
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            for user_id in user_ids:
+                pipe.zscore(ONLINE_KEY, user_id)
+            scores = pipe.execute()
+            return {user_id for user_id, score in zip(user_ids, scores) if score is not None and score >= cutoff}
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return _local.online_among(user_ids, cutoff)
+
+
+def expire_stale():
+    """Drop users whose heartbeats stopped and return their ids."""
+    cutoff = _cutoff()
+    client = get_redis()
+    if client is not None:
+        try:
+            return [int(user_id) for user_id in client.eval(_EXPIRE_SCRIPT, 1, ONLINE_KEY, cutoff)]
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return _local.expire(cutoff)
+
+
+def _swap_published(statuses):
+    """Store ``{user_id: status}`` as published and return only the entries that changed."""
+    client = get_redis()
+    if client is not None:
+        try:
+            user_ids = list(statuses)
+            previous = client.hmget(PUBLISHED_KEY, user_ids)
+            changed = {
+                user_id: status
+                for user_id, status, old in zip(user_ids, statuses.values(), previous)
+                if (old.decode('utf-8') if old else 'offline') != status
+            }
+            if changed:
+                client.hset(PUBLISHED_KEY, mapping=changed)
+            return changed
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return _local.swap_published(statuses)
+
+
+def contacts_of(user_ids):
+    """Return ``{user_id: {contact_id, ...}}``: everyone sharing an active chat room, in one query."""
+    membership = ChatRoom.participants.through
+    rooms = membership.objects.filter(user_id__in=user_ids, chatroom__is_active=True).values('chatroom_id')
+    members = defaultdict(set)
+    for room_id, user_id in membership.objects.filter(chatroom_id__in=Subquery(rooms)).values_list('chatroom_id', 'user_id'):
+        members[room_id].add(user_id)
+
+    wanted = set(user_ids)
+    contacts = defaultdict(set)
+    for participants in members.values():
+        for user_id in participants & wanted:
+            contacts[user_id] |= participants - {user_id}
+    return contacts
+
+
+def collect_status_changes(user_ids):
+    """Resolve the current status of ``user_ids`` and group the unpublished changes per recipient."""
+    online = online_among(user_ids)
+    changed = _swap_published({
+        user_id: 'online' if user_id in online else 'offline' for user_id in user_ids
+    })
+    if not changed:
+        return {}
+
+    batches = defaultdict(list)
+    for user_id, contacts in contacts_of(list(changed)).items():
+        for contact_id in contacts:
+            batches[contact_id].append({'user_id': user_id, 'status': changed[user_id]})
+    return batches
+
+
+async def publish_status_changes(user_ids):
+    batches = await database_sync_to_async(collect_status_changes)(set(user_ids))
+    if not batches:
+        return
+    channel_layer = get_channel_layer()
+    results = await asyncio.gather(
+        *(
+            channel_layer.group_send(presence_group(recipient_id), {'type': 'presence_batch', 'changes': changes})
+            for recipient_id, changes in batches.items()
+        ),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Failed to publish presence batch: {str(result)}")
+
+
+_pending = set()
+_flush_task = None
+
+
+def schedule_status_broadcast(user_id):
+    """Queue ``user_id`` for the next debounced broadcast of this process. Call from the event loop."""
+    global _flush_task
+    _pending.add(user_id)
+    if _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_pending())
+
+
+async def _flush_pending():
+    global _flush_task
+    try:
+        await asyncio.sleep(getattr(settings, 'PRESENCE_DEBOUNCE_SECONDS', 2))
+    finally:
+        user_ids = set(_pending)
+        _pending.clear()
+        _flush_task = None
+    try:
+        await publish_status_changes(user_ids)
+    except Exception as e:
+        logger.error(f"Presence broadcast failed: {str(e)}")
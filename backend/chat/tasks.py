@@ -0,0 +1,18 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+
+from .services.presence_service import expire_stale, publish_status_changes
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def expire_stale_presence():
+    """Take users offline whose connections stopped heartbeating and tell their contacts."""
+    stale = expire_stale()
+    if stale:
+        async_to_sync(publish_status_changes)(stale)
+        logger.info(f"Expired presence of {len(stale)} users")
+    return len(stale)
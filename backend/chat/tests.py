@@ -1,3 +1,200 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts import profile_cache
+from accounts.models import User
+from .consumers.presence_consumer import PresenceConsumer
+from .consumers.profile_frames import ProfileFramesMixin
+from .models.chat_room import ChatRoom
+from .models.message import Message
+from .models.reaction import Reaction
+from .services import presence_service
+
+
+class ProfileFramesTests(TestCase):
+    def setUp(self):
+        profile_cache._local.clear()  # ids are reused between tests
+        self.user = User.objects.create_user(
+            email="frames@example.com", first_name="Frame", last_name="User", password="pass"
+        )
+
+    def test_full_profile_is_sent_once_per_version(self):
+        connection = ProfileFramesMixin()
+        first = async_to_sync(connection.profile_frame)(self.user.id)
+        self.assertEqual(first['fullname'], self.user.fullname)
+
+        again = async_to_sync(connection.profile_frame)(self.user.id)
+        self.assertEqual(again, {'id': self.user.id, 'version': first['version']})
+
+        other_connection = ProfileFramesMixin()
+        self.assertEqual(async_to_sync(other_connection.profile_frame)(self.user.id), first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Renamed"
+            self.user.save()
+        updated = async_to_sync(connection.profile_frame)(self.user.id)
+        self.assertEqual(updated['first_name'], "Renamed")
+
+
+class CompactMessageHistoryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="reader@example.com", password="pass")
+        self.other = User.objects.create_user(email="writer@example.com", password="pass")
+        self.room = ChatRoom.objects.create(name="history", room_type="GROUP")
+        self.room.participants.add(self.user, self.other)
+        self.client.force_authenticate(user=self.user)
+
+    def message(self, sender, minutes_ago):
+        message = Message.objects.create(room=self.room, sender=sender, content=f"{minutes_ago} minutes ago")
+        Message.objects.filter(pk=message.pk).update(timestamp=timezone.now() - timedelta(minutes=minutes_ago))
+        return message
+
+    def history(self, url=None, **params):
+        return self.client.get(url or reverse('chat:message-history-compact', args=[self.room.name]), params)
+
+    def test_page_carries_counts_own_reactions_and_senders_once(self):
+        oldest = self.message(self.other, 3)
+        middle = self.message(self.user, 2)
+        newest = self.message(self.other, 1)
+        Reaction.objects.create(message=newest, user=self.user, reaction_type="LIKE")
+        Reaction.objects.create(message=newest, user=self.other, reaction_type="LIKE")
+        Reaction.objects.create(message=newest, user=self.other, reaction_type="HEART")
+
+        page = self.history(page_size=2)
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual([message["id"] for message in page.data["results"]], [newest.id, middle.id])
+        self.assertEqual(page.data["results"][0]["reactions"], {"LIKE": 2, "HEART": 1})
+        self.assertEqual(page.data["results"][0]["my_reactions"], ["LIKE"])
+        self.assertEqual(page.data["results"][1]["reactions"], {})
+        self.assertEqual(page.data["results"][0]["sender"], self.other.id)
+        self.assertEqual(set(page.data["users"]), {self.user.id, self.other.id})
+        self.assertEqual(page.data["users"][self.other.id]["email"], self.other.email)
+
+        older = self.history(page.data["next"])
+        self.assertEqual([message["id"] for message in older.data["results"]], [oldest.id])
+        self.assertEqual(set(older.data["users"]), {self.other.id})
+        self.assertIsNone(older.data["next"])
+
+    def test_query_count_does_not_grow_with_reactions_or_senders(self):
+        for minutes_ago in range(2):
+            self.message(self.other, minutes_ago)
+        with CaptureQueriesContext(connection) as small:
+            self.history()
+
+        for index in range(10):
+            sender = User.objects.create_user(email=f"member{index}@example.com", password="pass")
+            self.room.participants.add(sender)
+            message = self.message(sender, 10 + index)
+            for reaction_type in ("LIKE", "HEART", "SMILE"):
+                Reaction.objects.create(message=message, user=sender, reaction_type=reaction_type)
+                Reaction.objects.create(message=message, user=self.user, reaction_type=reaction_type)
+        with CaptureQueriesContext(connection) as large:
+            response = self.history()
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+
+@override_settings(PRESENCE_TTL=90, PRESENCE_DEBOUNCE_SECONDS=0)
+class PresenceTests(TestCase):
+    """Runs against the per-process fallback used while Redis is unreachable."""
+
+    def setUp(self):
+        profile_cache._local.clear()  # ids are reused between tests
+        for patcher in (
+            mock.patch.object(presence_service, 'get_redis', return_value=None),
+            mock.patch.object(presence_service, '_local', presence_service._LocalPresence()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email="watcher@example.com", password="pass")
+        self.contact = User.objects.create_user(email="contact@example.com", password="pass")
+        self.stranger = User.objects.create_user(email="stranger@example.com", password="pass")
+        room = ChatRoom.objects.create(name="presence", room_type="ONE_TO_ONE")
+        room.participants.add(self.user, self.contact)
+
+    def test_users_expire_when_heartbeats_stop(self):
+        presence_service.heartbeat(self.contact.id, "a")
+        presence_service.heartbeat(self.contact.id, "b")
+        presence_service.disconnect(self.contact.id, "a")
+        self.assertEqual(presence_service.online_among([self.contact.id]), {self.contact.id})
+        presence_service.disconnect(self.contact.id, "b")
+        self.assertEqual(presence_service.online_among([self.contact.id]), set())
+
+        presence_service.heartbeat(self.contact.id, "c")
+        later = time.time() + 91
+        with mock.patch.object(presence_service.time, 'time', return_value=later):
+            self.assertEqual(presence_service.online_among([self.contact.id]), set())
+            self.assertEqual(presence_service.expire_stale(), [self.contact.id])
+            self.assertEqual(presence_service.expire_stale(), [])
+
+    def test_stale_connections_are_dropped_on_disconnect(self):
+        presence_service.heartbeat(self.contact.id, "crashed")
+        with mock.patch.object(presence_service.time, 'time', return_value=time.time() + 91):
+            presence_service.heartbeat(self.contact.id, "live")
+            presence_service.disconnect(self.contact.id, "live")
+        self.assertNotIn(self.contact.id, presence_service._local.connections)
+
+    def test_only_unpublished_changes_reach_contacts(self):
+        presence_service.heartbeat(self.contact.id, "a")
+        self.assertEqual(
+            presence_service.collect_status_changes({self.contact.id, self.stranger.id}),
+            {self.user.id: [{'user_id': self.contact.id, 'status': 'online'}]}
+        )
+        # A page reload: a new connection before the broadcast, nothing changed
+        presence_service.disconnect(self.contact.id, "a")
+        presence_service.heartbeat(self.contact.id, "b")
+        self.assertEqual(presence_service.collect_status_changes({self.contact.id}), {})
+
+        presence_service.disconnect(self.contact.id, "b")
+        self.assertEqual(
+            presence_service.collect_status_changes({self.contact.id}),
+            {self.user.id: [{'user_id': self.contact.id, 'status': 'offline'}]}
+        )
+
+    def test_consumer_only_reports_contacts_in_single_frames(self):
+        presence_service.heartbeat(self.contact.id, "a")
+        presence_service.heartbeat(self.stranger.id, "b")
+
+        async def session():
+            communicator = WebsocketCommunicator(PresenceConsumer.as_asgi(), "/ws/presence/")
+            communicator.scope["user"] = self.user
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            initial = await communicator.receive_json_from()
+
+            await communicator.send_json_to({"type": "query", "user_ids": [self.contact.id, self.stranger.id]})
+            query = await communicator.receive_json_from()
+
+            await get_channel_layer().group_send(presence_service.presence_group(self.user.id), {
+                'type': 'presence_batch',
+                'changes': [
+                    {'user_id': self.contact.id, 'status': 'offline'},
+                    {'user_id': self.stranger.id, 'status': 'online'},
+                ],
+            })
+            batch = await communicator.receive_json_from()
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.disconnect()
+            return initial, query, batch
+
+        initial, query, batch = async_to_sync(session)()
+        self.assertEqual(initial['type'], 'status_batch')
+        self.assertEqual([change['user']['id'] for change in initial['changes']], [self.contact.id])
+        self.assertEqual(query, {'type': 'presence', 'online': [self.contact.id]})
+        self.assertEqual(batch['type'], 'status_batch')
+        self.assertEqual(
+            [(change['user']['id'], change['status']) for change in batch['changes']],
+            [(self.contact.id, 'offline'), (self.stranger.id, 'online')]
+        )
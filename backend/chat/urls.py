@@ -10,6 +10,7 @@ urlpatterns = [
     
     # Messages
     path('messages/history/<str:room_name>/', views.MessageHistory.as_view(), name='message-history'),
+    path('messages/history/<str:room_name>/compact/', views.CompactMessageHistory.as_view(), name='message-history-compact'),
     path('message/edit/', views.MessageEdit.as_view(), name='message-edit'),
     path('message/read/<int:message_id>/', views.MessageRead.as_view(), name='message-read'),
     
@@ -21,4 +22,5 @@ urlpatterns = [
     
     # User Management
     path('users/active/', views.ActiveUsersList.as_view(), name='active-users'),
+    path('users/online/', views.OnlineUsersView.as_view(), name='online-users'),
 ]
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from elshawi_backend.response_cache import invalidate
+from .models import Post
+
+
+def _invalidate_posts():
+    transaction.on_commit(lambda: invalidate('posts'))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_responses(sender, instance, update_fields=None, **kwargs):
+    # Counting a view is not worth dropping the cache; view_count catches up on expiry.
+    if update_fields is not None and set(update_fields) == {'view_count'}:
+        return
+    _invalidate_posts()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def invalidate_tag_responses(sender, instance, **kwargs):
+    _invalidate_posts()
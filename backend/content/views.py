@@ -16,6 +16,7 @@ from django.http import HttpResponse, Http404
 from django.template.loader import render_to_string
 from django.core.exceptions import ObjectDoesNotExist
 from accounts.models import RoleModel, Role
+from elshawi_backend.response_cache import cache_response
 import logging
 from django.db.models import Q
 from django.contrib.auth import get_user_model
@@ -286,6 +287,7 @@ class PostViewSet(viewsets.ModelViewSet):
             raise ServiceUnavailable("Unable to retrieve post at this time.")
 
     @action(detail=False, methods=['get'])
+    @cache_response('posts')
     def featured(self, request):
         try:
             featured_posts = self.queryset.filter(is_featured=True)
@@ -302,6 +304,7 @@ class PostViewSet(viewsets.ModelViewSet):
             raise ServiceUnavailable("Unable to retrieve featured posts at this time.")
 
     @action(detail=False, methods=['get'])
+    @cache_response('posts')
     def tag_stats(self, request):
         try:
             # For django-taggit, we need to use the through table
@@ -354,6 +357,7 @@ class PostViewSet(viewsets.ModelViewSet):
                 logger.error(f"Fallback tag stats error: {str(fallback_error)}")
                 raise ServiceUnavailable("Unable to retrieve tag statistics at this time.")
 
+@cache_response('posts')
 def sitemap(request):
     """Generate XML sitemap"""
     try:
@@ -374,6 +378,7 @@ def sitemap(request):
             status=500
         )
 
+@cache_response('robots', timeout=3600)
 def robots(request):
     """Serve robots.txt file"""
     try:
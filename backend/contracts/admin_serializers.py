@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from elshawi_backend.serializers import SparseFieldsMixin
 from .models import Contract, Review, Signature
 
 User = get_user_model()
@@ -25,7 +26,7 @@ class AdminReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ['id', 'contract', 'lawyer', 'status', 'review_notes', 'created_at', 'updated_at']
 
-class AdminContractSerializer(serializers.ModelSerializer):
+class AdminContractSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client = UserSerializer(read_only=True)
     reviews = AdminReviewSerializer(many=True, read_only=True)
     signatures = AdminSignatureSerializer(many=True, read_only=True)
@@ -39,6 +40,7 @@ class AdminContractSerializer(serializers.ModelSerializer):
             'status',
             'data',
             'text_version',
+            'body_html',
             'full_text',
             'needs_review',
             'is_locked',
@@ -46,4 +48,5 @@ class AdminContractSerializer(serializers.ModelSerializer):
             'updated_at',
             'reviews',
             'signatures',
-        ]
\ No newline at end of file
+        ]
+        expandable_fields = ['reviews', 'signatures']
\ No newline at end of file
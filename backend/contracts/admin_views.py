@@ -1,23 +1,30 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from django.db.models import Q
+from django.http import FileResponse
 
 from .signals import send_notification_email
-from .models import Contract, Review, Signature
+from .models import Contract, ContractArchiveExport, Review, Signature
 from .admin_serializers import AdminContractSerializer, AdminReviewSerializer, AdminSignatureSerializer
 from .permissions import ContractPermissions
 from django.contrib.auth import get_user_model
 from .utils.pdf_generator import generate_pdf
 from .utils.doc_generator import generate_docx
+from .serializers import ContractArchiveExportSerializer
+from .tasks import export_contracts_archive
+from .utils.bulk_export import EXPORT_CONTENT_TYPES
+from .utils.search import search_contracts
+from elshawi_backend.pagination import paginate
+from elshawi_backend.serializers import requested_expansions
 from contracts.utils.gpt_integration import generate_contract_html, analyze_contract
-from django.template.loader import render_to_string
 from barcode import Code128
 from barcode.writer import SVGWriter
 from io import BytesIO
 from django.core.mail import send_mail
 from celery import shared_task
-from datetime import datetime
+import os
 
 User = get_user_model()
 
@@ -29,7 +36,12 @@ class AdminContractListView(APIView):
     permission_classes = [AdminPermission]
     
     def get(self, request):
-        contracts = Contract.objects.all()
+        contracts = Contract.objects.all().select_related('client', 'client__role')
+        expand = requested_expansions(request)
+        if 'reviews' in expand:
+            contracts = contracts.prefetch_related('reviews__lawyer__role')
+        if 'signatures' in expand:
+            contracts = contracts.prefetch_related('signatures__user__role')
         
         # Filter by status if provided
         status_filter = request.query_params.get('status')
@@ -45,9 +57,14 @@ class AdminContractListView(APIView):
         client_email = request.query_params.get('client_email')
         if client_email:
             contracts = contracts.filter(client__email__icontains=client_email)
+
+        # Full-text search, best matches first
+        query = request.query_params.get('q')
+        if query:
+            contracts = search_contracts(contracts, query)
+            self.cursor_ordering = 'search_rank'
             
-        serializer = AdminContractSerializer(contracts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginate(request, contracts, AdminContractSerializer, view=self)
 
 class AdminContractUpdateView(APIView):
     permission_classes = [AdminPermission]
@@ -156,7 +173,8 @@ class AdminContractForceSignView(APIView):
             signature = Signature.objects.create(
                 contract=contract,
                 user=user,
-                ip_address=request.META.get('REMOTE_ADDR', '0.0.0.0')
+                ip_address=request.META.get('REMOTE_ADDR', '0.0.0.0'),
+                signer_name=user.fullname
             )
             
             barcode_io = BytesIO()
@@ -164,15 +182,7 @@ class AdminContractForceSignView(APIView):
             signature.barcode_svg = barcode_io.getvalue().decode('utf-8')
             signature.save()
             
-            context = {
-                'contract_type': contract.contract_type,
-                'data_items': contract.data.items(),
-                'created_at': contract.created_at,
-                'signatures': contract.signatures.all(),
-                'gpt_html': contract.text_version
-            }
-            contract.full_text = render_to_string('contract_template.html', context)
-            
+            # The new signature is composed into full_text from its row; the body stays as it is.
             if user.role.name == 'Lawyer':
                 contract.status = 'SIGNED_BY_LAWYER'
             else:
@@ -181,7 +191,7 @@ class AdminContractForceSignView(APIView):
             if contract.signatures.count() >= 2:
                 contract.status = 'COMPLETED'
                 contract.is_locked = True
-            contract.save()
+            contract.save(update_fields=['status', 'is_locked', 'updated_at'])
             
             # Notify user of admin-forced signature
             send_notification_email.delay(
@@ -200,27 +210,47 @@ class AdminContractExportAllView(APIView):
     permission_classes = [AdminPermission]
     
     def post(self, request):
+        """Queue a ZIP of every contract; poll the returned job and download it when COMPLETED."""
         try:
             format = request.data.get('format', 'pdf')
-            contracts = Contract.objects.all()
-            
-            if format not in ['pdf', 'docx']:
+            if format not in EXPORT_CONTENT_TYPES:
                 return Response({'error': 'Invalid format'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            response = HttpResponse(content_type=f'application/{"pdf" if format == "pdf" else "vnd.openxmlformats-officedocument.wordprocessingml.document"}')
-            response['Content-Disposition'] = f'attachment; filename="all_contracts_{datetime.now().strftime("%Y%m%d")}.{format}"'
-            
-            for contract in contracts:
-                if format == 'pdf':
-                    pdf = generate_pdf(contract)
-                    response.write(pdf)
-                else:
-                    doc = generate_docx(contract)
-                    doc.save(response)
-                
-                contract.status = 'EXPORTED'
-                contract.save()
-                
-            return response
+
+            archive = ContractArchiveExport.objects.create(requested_by=request.user, format=format)
+            transaction.on_commit(lambda: export_contracts_archive.delay(archive.id))
+            return Response(ContractArchiveExportSerializer(archive).data, status=status.HTTP_202_ACCEPTED)
         except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AdminContractArchiveDetailView(APIView):
+    permission_classes = [AdminPermission]
+
+    def get(self, request, archive_id):
+        try:
+            archive = ContractArchiveExport.objects.get(id=archive_id)
+        except ContractArchiveExport.DoesNotExist:
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ContractArchiveExportSerializer(archive).data, status=status.HTTP_200_OK)
+
+
+class AdminContractArchiveDownloadView(APIView):
+    permission_classes = [AdminPermission]
+
+    def get(self, request, archive_id):
+        try:
+            archive = ContractArchiveExport.objects.get(id=archive_id)
+        except ContractArchiveExport.DoesNotExist:
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        if archive.status != 'COMPLETED' or not archive.file:
+            return Response(
+                {'error': f'Export is not ready (status: {archive.status})'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            archive.file.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(archive.file.name),
+            content_type='application/zip'
+        )
\ No newline at end of file
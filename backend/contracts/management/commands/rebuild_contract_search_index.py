@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from contracts.models import Contract
+from contracts.utils.search import index_contract
+
+
+class Command(BaseCommand):
+    help = 'Build or refresh the full-text search index rows of every contract'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Contracts read per database round trip')
+
+    def handle(self, *args, **options):
+        count = 0
+        contracts = Contract.objects.only('id', 'data', 'text_version', 'body_html').order_by('pk')
+        for contract in contracts.iterator(chunk_size=options['chunk_size']):
+            index_contract(contract)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} contracts'))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-17 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0007_contractexport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contract',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='signature',
+            name='is_verified',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='signature',
+            name='verified_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,77 @@
+import re
+
+from django.db import migrations, models
+
+SIGNATURE_SLOT = '<!-- signatures -->'
+
+# Blocks that signing used to splice into full_text, and the ones the contract
+# template rendered for admin-added signatures.
+SIGNATURE_ENTRY = re.compile(r'<div class="signature-entry">(.*?)</div>', re.DOTALL)
+SIGNATURE_BLOCK = re.compile(
+    r'(?:<h2>Signatures</h2>\s*)?<div class="signature-block">.*?<div class="barcode">.*?</div>\s*</div>', re.DOTALL
+)
+SIGNER_NAME = re.compile(r'<p>Signed by:\s*(.*?)</p>', re.DOTALL)
+QR_CODE = re.compile(r'src="data:image/png;base64,([^"]+)"')
+
+
+def _strip(pattern, body):
+    """Remove every match of ``pattern``, leaving the slot where the first one was."""
+    matches = list(pattern.finditer(body))
+    if not matches:
+        return body, matches
+    parts, last = [], 0
+    for index, match in enumerate(matches):
+        parts.append(body[last:match.start()])
+        if index == 0:
+            parts.append(SIGNATURE_SLOT)
+        last = match.end()
+    parts.append(body[last:])
+    return ''.join(parts), matches
+
+
+def split_signatures(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    Signature = apps.get_model('contracts', 'Signature')
+
+    contracts = Contract.objects.filter(signatures__isnull=False).distinct().only('id', 'body_html')
+    for contract in contracts.iterator(chunk_size=200):
+        body, entries = _strip(SIGNATURE_ENTRY, contract.body_html)
+        if not entries:
+            body, _ = _strip(SIGNATURE_BLOCK, body)
+
+        signatures = Signature.objects.filter(contract_id=contract.id).order_by('signed_at', 'pk')
+        for signature, entry in zip(signatures, entries):
+            name = SIGNER_NAME.search(entry.group(1))
+            qr_code = QR_CODE.search(entry.group(1))
+            Signature.objects.filter(pk=signature.pk).update(
+                signer_name=name.group(1).strip()[:255] if name else '',
+                qr_code=qr_code.group(1) if qr_code else ''
+            )
+        if body != contract.body_html:
+            Contract.objects.filter(pk=contract.pk).update(body_html=body)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0008_contract_content_hash'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='contract',
+            old_name='full_text',
+            new_name='body_html',
+        ),
+        migrations.AddField(
+            model_name='signature',
+            name='qr_code',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='signature',
+            name='signer_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(split_signatures, migrations.RunPython.noop),
+    ]
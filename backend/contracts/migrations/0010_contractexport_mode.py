@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0009_contract_body_html_signature_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractexport',
+            name='mode',
+            field=models.CharField(choices=[('full', 'Full render'), ('incremental', 'Stored body with signature appendix')], default='full', max_length=20),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.23 on 2026-10-17 19:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# SQLite: an external-content FTS5 table over the index rows, kept in sync by triggers.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE contracts_contractsearch_fts USING fts5(
+        document,
+        content='contracts_contractsearchindex',
+        content_rowid='contract_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER contracts_contractsearch_ai AFTER INSERT ON contracts_contractsearchindex BEGIN
+        INSERT INTO contracts_contractsearch_fts(rowid, document) VALUES (new.contract_id, new.document);
+    END
+    """,
+    """
+    CREATE TRIGGER contracts_contractsearch_ad AFTER DELETE ON contracts_contractsearchindex BEGIN
+        INSERT INTO contracts_contractsearch_fts(contracts_contractsearch_fts, rowid, document)
+        VALUES ('delete', old.contract_id, old.document);
+    END
+    """,
+    """
+    CREATE TRIGGER contracts_contractsearch_au AFTER UPDATE OF document ON contracts_contractsearchindex
+    WHEN old.document IS NOT new.document BEGIN
+        INSERT INTO contracts_contractsearch_fts(contracts_contractsearch_fts, rowid, document)
+        VALUES ('delete', old.contract_id, old.document);
+        INSERT INTO contracts_contractsearch_fts(rowid, document) VALUES (new.contract_id, new.document);
+    END
+    """,
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS contracts_contractsearch_au',
+    'DROP TRIGGER IF EXISTS contracts_contractsearch_ad',
+    'DROP TRIGGER IF EXISTS contracts_contractsearch_ai',
+    'DROP TABLE IF EXISTS contracts_contractsearch_fts',
+]
+
+# PostgreSQL: a generated tsvector column with a GIN index.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE contracts_contractsearchindex
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED
+    """,
+    """
+    CREATE INDEX contracts_contractsearch_vector_gin
+    ON contracts_contractsearchindex USING gin (search_vector)
+    """,
+]
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS contracts_contractsearch_vector_gin',
+    'ALTER TABLE contracts_contractsearchindex DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0010_contractexport_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractSearchIndex',
+            fields=[
+                ('contract', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_index', serialize=False, to='contracts.contract')),
+                ('document', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
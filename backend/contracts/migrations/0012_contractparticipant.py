@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-17 19:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def backfill_participants(apps, schema_editor):
+    Contract = apps.get_model('contracts', 'Contract')
+    Review = apps.get_model('contracts', 'Review')
+    ContractParticipant = apps.get_model('contracts', 'ContractParticipant')
+
+    clients = Contract.objects.filter(client__isnull=False).values_list('id', 'client_id')
+    lawyers = Review.objects.values_list('contract_id', 'lawyer_id').distinct()
+    for role, pairs in (('CLIENT', clients), ('LAWYER', lawyers)):
+        batch = []
+        for contract_id, user_id in pairs.iterator(chunk_size=BATCH_SIZE):
+            batch.append(ContractParticipant(contract_id=contract_id, user_id=user_id, role=role))
+            if len(batch) >= BATCH_SIZE:
+                ContractParticipant.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        ContractParticipant.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contracts', '0011_contractsearchindex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('CLIENT', 'Client'), ('LAWYER', 'Lawyer')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='contracts.contract')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contract_participations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'role', 'contract'], name='contract_participant_user_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='contractparticipant',
+            constraint=models.UniqueConstraint(fields=('contract', 'user', 'role'), name='unique_contract_participant'),
+        ),
+        migrations.RunPython(backfill_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0012_contractparticipant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractexport',
+            name='format',
+            field=models.CharField(choices=[('pdf', 'PDF'), ('docx', 'Word document')], default='pdf', max_length=10),
+        ),
+    ]
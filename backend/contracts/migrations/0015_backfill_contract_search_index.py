@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from django.db import migrations
+
+from contracts.utils.search import document_from
+
+BATCH_SIZE = 500
+
+
+def backfill_search_index(apps, schema_editor):
+    """Index the contracts that existed before 0011; later saves are indexed by the contract signals."""
+    Contract = apps.get_model('contracts', 'Contract')
+    ContractSearchIndex = apps.get_model('contracts', 'ContractSearchIndex')
+    Signature = apps.get_model('contracts', 'Signature')
+
+    contracts = Contract.objects.filter(search_index__isnull=True).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(contracts.filter(pk__gt=last_pk).only('id', 'data', 'text_version', 'body_html')[:BATCH_SIZE])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+
+        signer_names = defaultdict(list)
+        signatures = Signature.objects.filter(contract_id__in=[contract.pk for contract in batch]).order_by(
+            'signed_at', 'pk'
+        ).values_list('contract_id', 'signer_name', 'user__first_name', 'user__last_name')
+        for contract_id, signer_name, first_name, last_name in signatures:
+            # User.fullname is a property, which historical models do not have.
+            signer_names[contract_id].append(signer_name or f"{first_name or ''} {last_name or ''}".strip())
+
+        ContractSearchIndex.objects.bulk_create(
+            [
+                ContractSearchIndex(
+                    contract_id=contract.pk,
+                    document=document_from(
+                        contract.data, contract.text_version, contract.body_html, signer_names[contract.pk]
+                    )
+                )
+                for contract in batch
+            ],
+            ignore_conflicts=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0014_contractarchiveexport'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
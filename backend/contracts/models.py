@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from .utils.composition import get_full_text
+from .utils.signing import SIGNED_FIELDS, compute_contract_hash
 User = get_user_model()
 
 class Contract(models.Model):
@@ -29,12 +32,32 @@ class Contract(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='DRAFT')
     data = models.JSONField()
     text_version = models.TextField(blank=True)
-    full_text = models.TextField(blank=True)
+    body_html = models.TextField(blank=True)  # the document without signatures, see utils.composition
     needs_review = models.BooleanField(default=False)
     is_locked = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=64, blank=True)  # sha256 of the signed metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @property
+    def full_text(self):
+        return get_full_text(self)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self.pk is None:
+            super().save(*args, **kwargs)
+            # The id is part of the signed metadata, so hash once it exists.
+            self.content_hash = compute_contract_hash(self)
+            Contract.objects.filter(pk=self.pk).update(content_hash=self.content_hash)
+            return
+
+        if update_fields is None or set(update_fields) & set(SIGNED_FIELDS):
+            self.content_hash = compute_contract_hash(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_hash'}
+        super().save(*args, **kwargs)
+
 class Review(models.Model):
     contract = models.ForeignKey(Contract, related_name='reviews', on_delete=models.CASCADE)
     lawyer = models.ForeignKey(User, related_name='reviews', on_delete=models.CASCADE)
@@ -54,4 +77,106 @@ class Signature(models.Model):
     signed_at = models.DateTimeField(auto_now_add=True)
     signature_hash = models.TextField()  
     public_key = models.TextField()    
-    barcode_svg = models.TextField(blank=True)
\ No newline at end of file
+    barcode_svg = models.TextField(blank=True)
+    signer_name = models.CharField(max_length=255, blank=True)  # as shown on the document at signing time
+    qr_code = models.TextField(blank=True)  # base64 PNG linking to the verification page
+    verified_hash = models.CharField(max_length=64, blank=True)  # contract hash the cached result is for
+    is_verified = models.BooleanField(default=False)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.touch_contract()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.touch_contract()
+        return result
+
+    def touch_contract(self):
+        # Moves the contract to a new version so its composed full_text is rebuilt.
+        Contract.objects.filter(pk=self.contract_id).update(updated_at=timezone.now())
+
+class ContractParticipant(models.Model):
+    """Who can see a contract: its client and every lawyer assigned to review it."""
+    ROLE_CHOICES = (
+        ('CLIENT', 'Client'),
+        ('LAWYER', 'Lawyer'),
+    )
+
+    contract = models.ForeignKey(Contract, related_name='participants', on_delete=models.CASCADE)
+    user = models.ForeignKey(User, related_name='contract_participations', on_delete=models.CASCADE)
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['contract', 'user', 'role'], name='unique_contract_participant'),
+        ]
+        indexes = [
+            # "my contracts" lists: WHERE user_id = ? AND role = ? ORDER BY contract_id
+            models.Index(fields=['user', 'role', 'contract'], name='contract_participant_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.role} {self.user_id} on contract {self.contract_id}"
+
+class ContractSearchIndex(models.Model):
+    contract = models.OneToOneField(Contract, related_name='search_index', on_delete=models.CASCADE, primary_key=True)
+    document = models.TextField(blank=True)  # normalized tokens, see utils.search
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Search index of contract {self.contract_id}"
+
+class ContractExport(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+    MODE_CHOICES = (
+        ('full', 'Full render'),
+        ('incremental', 'Stored body with signature appendix'),
+    )
+    FORMAT_CHOICES = (
+        ('pdf', 'PDF'),
+        ('docx', 'Word document'),
+    )
+
+    contract = models.ForeignKey(Contract, related_name='exports', on_delete=models.CASCADE)
+    requested_by = models.ForeignKey(User, related_name='contract_exports', on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default='full')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='pdf')
+    content_hash = models.CharField(max_length=64, db_index=True)
+    file = models.FileField(upload_to='contracts/exports/', null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Export {self.id} of contract {self.contract_id} ({self.status})"
+
+
+class ContractArchiveExport(models.Model):
+    """A ZIP of every contract, rendered by a Celery task instead of in the request."""
+    STATUS_CHOICES = ContractExport.STATUS_CHOICES
+    FORMAT_CHOICES = ContractExport.FORMAT_CHOICES
+
+    requested_by = models.ForeignKey(User, related_name='contract_archive_exports', on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='pdf')
+    file = models.FileField(upload_to='contracts/archives/', null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Contract archive {self.id} ({self.format}, {self.status})"
@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .utils.participants import is_participant
+
 class ContractPermissions(permissions.BasePermission):
     def has_permission(self, request, view):
         # Basic check: User must be authenticated and active
@@ -9,7 +11,7 @@ class ContractPermissions(permissions.BasePermission):
         user = request.user
 
         # 1. Clients and assigned lawyers: Can view and modify their contracts
-        if (user == obj.client or obj.reviews.filter(lawyer=user).exists()) and request.method in ['GET', 'POST']:
+        if request.method in ['GET', 'POST'] and is_participant(user, obj):
             return True
 
         # 2. Staff: Have full permissions
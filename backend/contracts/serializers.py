@@ -1,17 +1,8 @@
 import json
 from rest_framework import serializers
 
-from .models import Contract, Review, Signature
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.backends import default_backend
-import hashlib
-import base64
-
-def sort_dict_recursive(d):
-    if not isinstance(d, dict):
-        return d
-    return {k: sort_dict_recursive(v) for k, v in sorted(d.items())}
+from .models import Contract, ContractArchiveExport, ContractExport, Review, Signature
+from .utils.signing import get_verification_status
 
 class ContractSerializer(serializers.ModelSerializer):
     class Meta:
@@ -47,30 +38,26 @@ class SignatureSerializer(serializers.ModelSerializer):
         fields = ['id', 'contract', 'user', 'ip_address', 'signed_at', 'signature_hash', 'public_key', 'barcode_svg', 'verification_status']
 
     def get_verification_status(self, obj):
-        try:
-            public_key = serialization.load_pem_public_key(
-                obj.public_key.encode(),
-                backend=default_backend()
-            )
-            contract_metadata = {
-                'id': obj.contract.id,
-                'contract_type': obj.contract.contract_type,
-                'status': obj.contract.status,
-                'data': sort_dict_recursive(obj.contract.data),
-                'needs_review': obj.contract.needs_review,
-                'is_locked': obj.contract.is_locked
-            }
-            contract_metadata_str = json.dumps(contract_metadata, separators=(',', ':'), sort_keys=True)
-            contract_hash = hashlib.sha256(contract_metadata_str.encode()).digest()
-            public_key.verify(
-                base64.b64decode(obj.signature_hash),
-                contract_hash,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=32
-                ),
-                hashes.SHA256()
-            )
-            return 'valid'
-        except Exception as e:
-            return 'invalid'
\ No newline at end of file
+        return get_verification_status(obj, self.context.get('contract'))
+
+
+class ContractExportSerializer(serializers.ModelSerializer):
+    file_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContractExport
+        fields = ['id', 'contract', 'status', 'mode', 'format', 'content_hash', 'file_url', 'error', 'created_at', 'completed_at']
+
+    def get_file_url(self, obj):
+        return obj.file.url if obj.file else None
+
+
+class ContractArchiveExportSerializer(serializers.ModelSerializer):
+    file_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContractArchiveExport
+        fields = ['id', 'status', 'format', 'file_url', 'error', 'created_at', 'completed_at']
+
+    def get_file_url(self, obj):
+        return obj.file.url if obj.file else None
@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from .models import Contract, Review, Signature
+from .utils.participants import sync_client, sync_lawyers
+from .utils.search import INDEXED_FIELDS, index_contract
 from django.core.mail import send_mail
 from celery import shared_task
 
@@ -24,4 +27,38 @@ def notify_signed(sender, instance, created, **kwargs):
             instance.contract.client.email,
             'Contract Signed',
             f'Contract {instance.contract.id} has been signed by {instance.user.username}.'
-        )
\ No newline at end of file
+        )
+
+@receiver(post_save, sender=Contract)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Status and lock changes do not touch the indexed text.
+    if raw or (update_fields is not None and not set(update_fields) & INDEXED_FIELDS):
+        return
+    index_contract(instance)
+
+@receiver(post_save, sender=Signature)
+@receiver(post_delete, sender=Signature)
+def update_signed_search_index(sender, instance, raw=False, **kwargs):
+    # Signer names are part of the full text. Deferred so that signatures removed
+    # along with their contract do not re-create its index row.
+    if raw:
+        return
+    contract_id = instance.contract_id
+
+    def reindex():
+        contract = Contract.objects.filter(pk=contract_id).first()
+        if contract is not None:
+            index_contract(contract)
+    transaction.on_commit(reindex)
+
+@receiver(post_save, sender=Contract)
+def update_client_participant(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'client' not in update_fields):
+        return
+    sync_client(instance)
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_lawyer_participants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_lawyers(instance.contract_id)
@@ -0,0 +1,126 @@
+import logging
+import tempfile
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .models import Contract, ContractArchiveExport, ContractExport
+from .serializers import ContractExportSerializer
+from .utils.bulk_export import stream_contracts_archive
+from .utils.doc_generator import render_docx
+from .utils.incremental_pdf import content_hash_for, get_signatures, render_incremental_pdf
+from .utils.pdf_generator import render_export_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def notify_export_update(export):
+    """Push the export job state to the requesting user's notification socket."""
+    if not export.requested_by_id:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f'notifications_{export.requested_by_id}',
+            {
+                'type': 'send_notification',
+                'content': {
+                    'type': 'CONTRACT_EXPORT_UPDATED',
+                    'export': ContractExportSerializer(export).data,
+                }
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Could not push export {export.id} update: {str(e)}")
+
+
+@shared_task
+def export_contract_pdf(export_id):
+    """Render a contract export job to its format and store it under its content hash."""
+    try:
+        export = ContractExport.objects.select_related('contract').get(id=export_id)
+    except ContractExport.DoesNotExist:
+        return f"Contract export {export_id} not found"
+
+    if export.status == 'COMPLETED':
+        return f"Contract export {export_id} already completed"
+
+    export.status = 'PROCESSING'
+    export.save(update_fields=['status'])
+    notify_export_update(export)
+
+    contract = export.contract
+    try:
+        signatures = get_signatures(contract) if export.mode == 'incremental' else None
+        content_hash = content_hash_for(contract, export.mode, signatures, export.format)
+        if content_hash != export.content_hash:
+            # The contract changed after the job was queued; export what is there now.
+            export.content_hash = content_hash
+            export.save(update_fields=['content_hash'])
+
+        cached = ContractExport.objects.filter(
+            content_hash=export.content_hash, format=export.format, status='COMPLETED'
+        ).exclude(file='').exclude(file__isnull=True).first()
+        if cached:
+            export.file.name = cached.file.name
+        else:
+            if export.format == 'docx':
+                content = render_docx(contract)
+            elif export.mode == 'incremental':
+                content = render_incremental_pdf(contract, signatures)
+            else:
+                content = render_export_pdf(contract.full_text)
+            export.file.save(f"{export.content_hash}.{export.format}", ContentFile(content), save=False)
+
+        export.status = 'COMPLETED'
+        export.completed_at = timezone.now()
+        export.save(update_fields=['file', 'status', 'completed_at'])
+        contract.status = 'EXPORTED'
+        contract.save(update_fields=['status', 'updated_at'])
+        logger.info(f"Contract {contract.id} exported by job {export.id}")
+    except Exception as e:
+        logger.error(f"Error exporting contract {contract.id} in job {export.id}: {str(e)}", exc_info=True)
+        export.status = 'FAILED'
+        export.error = str(e)
+        export.completed_at = timezone.now()
+        export.save(update_fields=['status', 'error', 'completed_at'])
+
+    notify_export_update(export)
+    return f"Contract export {export.id} {export.status.lower()}"
+
+
+@shared_task
+def export_contracts_archive(archive_id):
+    """Render every contract into a ZIP and store it on the archive export job."""
+    try:
+        archive = ContractArchiveExport.objects.get(id=archive_id)
+    except ContractArchiveExport.DoesNotExist:
+        return f"Contract archive {archive_id} not found"
+
+    if archive.status in ('COMPLETED', 'FAILED'):
+        return f"Contract archive {archive_id} already {archive.status.lower()}"
+
+    archive.status = 'PROCESSING'
+    archive.save(update_fields=['status'])
+    try:
+        # Spooled to disk: the archive can be far larger than a worker's memory.
+        with tempfile.TemporaryFile() as spool:
+            for chunk in stream_contracts_archive(Contract.objects.all(), format=archive.format):
+                spool.write(chunk)
+            spool.seek(0)
+            name = f"all_contracts_{timezone.now().strftime('%Y%m%d')}_{archive.format}.zip"
+            archive.file.save(name, File(spool), save=False)
+        archive.status = 'COMPLETED'
+        archive.completed_at = timezone.now()
+        archive.save(update_fields=['file', 'status', 'completed_at'])
+    except Exception as e:
+        logger.error(f"Error building contract archive {archive.id}: {str(e)}", exc_info=True)
+        archive.status = 'FAILED'
+        archive.error = str(e)
+        archive.completed_at = timezone.now()
+        archive.save(update_fields=['status', 'error', 'completed_at'])
+    return f"Contract archive {archive.id} {archive.status.lower()}"
@@ -1,3 +1,363 @@
-from django.test import TestCase
+import base64
+import importlib
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.apps import apps
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import RoleModel, User
+from .models import Contract, ContractExport, ContractParticipant, ContractSearchIndex, Review, Signature
+from .permissions import ContractPermissions
+from .tasks import export_contract_pdf, export_contracts_archive
+from .utils import signing
+from .utils.composition import SIGNATURE_SLOT, compose_html
+from .utils.participants import contracts_for
+from .utils.search import normalize_text, search_contracts, tokenize
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContractExportTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        role = RoleModel.objects.create(name='Client')
+        self.user = User.objects.create_user(email='client@example.com', password='pass', role=role)
+        self.contract = Contract.objects.create(
+            client=self.user, contract_type='NDA', data={'client_name': 'Client', 'details': 'Terms'},
+            body_html='<p>Body</p>'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def export(self, **data):
+        with mock.patch('contracts.views.export_contract_pdf') as task, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('contract-export', args=[self.contract.id]), data, format='json')
+        return response, task
+
+    def test_export_is_queued_as_a_job(self):
+        response, task = self.export()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertEqual(response.data['format'], 'pdf')
+        task.delay.assert_called_once_with(response.data['id'])
+
+    @mock.patch('contracts.tasks.notify_export_update')
+    @mock.patch('contracts.tasks.render_export_pdf', return_value=b'%PDF-1.4 rendered')
+    def test_same_content_is_served_from_the_stored_file(self, render, notify):
+        response, _ = self.export()
+        export_contract_pdf(response.data['id'])
+        first = ContractExport.objects.get(id=response.data['id'])
+        self.assertEqual(first.status, 'COMPLETED')
+
+        response, task = self.export()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'COMPLETED')
+        self.assertEqual(ContractExport.objects.get(id=response.data['id']).file.name, first.file.name)
+        task.delay.assert_not_called()
+        render.assert_called_once()
+
+    @mock.patch('contracts.tasks.notify_export_update')
+    def test_docx_export_downloads_a_word_document(self, notify):
+        response, _ = self.export(format='docx')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        export_contract_pdf(response.data['id'])
+
+        download = self.client.get(reverse('contract-export-download', args=[response.data['id']]))
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        self.assertIn(f'contract_{self.contract.id}.docx', download['Content-Disposition'])
+        self.assertTrue(b''.join(download.streaming_content).startswith(b'PK'))
+
+    def test_invalid_format_is_rejected(self):
+        response, task = self.export(format='odt')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response, task = self.export(format='docx', mode='incremental')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        task.delay.assert_not_called()
+
+    @mock.patch('contracts.signals.send_notification_email')
+    @mock.patch('contracts.tasks.notify_export_update')
+    def test_incremental_export_reuses_the_stored_body(self, notify, send_email):
+        buffer = BytesIO()
+        body = canvas.Canvas(buffer)
+        body.drawString(72, 720, 'Body')
+        body.save()
+
+        with mock.patch('contracts.utils.incremental_pdf.render_export_pdf', return_value=buffer.getvalue()) as render:
+            response, task = self.export(mode='incremental')
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            export_contract_pdf(response.data['id'])
+
+            Signature.objects.create(
+                contract=self.contract, user=self.user, ip_address='127.0.0.1',
+                signature_hash='hash', public_key='key', signer_name='Client'
+            )
+            response, task = self.export(mode='incremental')
+        render.assert_called_once()
+
+        # The body PDF is already stored, so only the appendix is drawn and no job is queued.
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'COMPLETED')
+        task.delay.assert_not_called()
+        download = self.client.get(reverse('contract-export-download', args=[response.data['id']]))
+        self.assertEqual(len(PdfReader(BytesIO(b''.join(download.streaming_content))).pages), 2)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContractArchiveExportTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create_user(
+            email='admin@example.com', password='pass', role=RoleModel.objects.create(name='Admin')
+        )
+        self.contracts = [
+            Contract.objects.create(contract_type='NDA', data={'client_name': f'Client {i}'}, body_html='<p>Body</p>')
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=admin)
+
+    def test_archive_is_built_by_a_task_and_downloaded(self):
+        with mock.patch('contracts.admin_views.export_contracts_archive') as task, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin-contract-export-all'), {'format': 'docx'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task.delay.assert_called_once_with(response.data['id'])
+
+        pending = self.client.get(reverse('admin-contract-archive-download', args=[response.data['id']]))
+        self.assertEqual(pending.status_code, status.HTTP_409_CONFLICT)
+
+        # Celery prefork workers are daemonic: DOCX has to render without a process pool.
+        with mock.patch('contracts.utils.bulk_export.multiprocessing.current_process', return_value=SimpleNamespace(daemon=True)), \
+                mock.patch('contracts.utils.bulk_export.ProcessPoolExecutor') as pool:
+            export_contracts_archive(response.data['id'])
+        pool.assert_not_called()
+
+        detail = self.client.get(reverse('admin-contract-archive-detail', args=[response.data['id']]))
+        self.assertEqual(detail.data['status'], 'COMPLETED')
+        download = self.client.get(reverse('admin-contract-archive-download', args=[response.data['id']]))
+        archive = zipfile.ZipFile(BytesIO(b''.join(download.streaming_content)))
+        self.assertEqual(
+            sorted(archive.namelist()), [f'contract_{contract.id}.docx' for contract in self.contracts]
+        )
+        self.assertEqual(set(Contract.objects.values_list('status', flat=True)), {'EXPORTED'})
+
+
+@mock.patch('contracts.signals.send_notification_email')
+class SignatureVerificationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='signer@example.com', password='pass')
+        self.contract = Contract.objects.create(client=self.user, contract_type='NDA', data={'client_name': 'Signer'})
+
+    def sign(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        signature_hash = key.sign(
+            bytes.fromhex(signing.compute_contract_hash(self.contract)), signing.SIGNATURE_PADDING, hashes.SHA256()
+        )
+        public_key = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode('utf-8')
+        return Signature.objects.create(
+            contract=self.contract, user=self.user, ip_address='127.0.0.1',
+            signature_hash=base64.b64encode(signature_hash).decode('ascii'), public_key=public_key
+        )
+
+    def test_result_is_cached_until_the_contract_changes(self, send_email):
+        signature = self.sign()
+        self.assertEqual(signing.get_verification_status(signature, self.contract), 'valid')
+
+        with mock.patch('contracts.utils.signing.verify_signature') as verify:
+            signature = Signature.objects.get(pk=signature.pk)
+            self.assertEqual(signing.get_verification_status(signature), 'valid')
+        verify.assert_not_called()
+
+        self.contract.data = {'client_name': 'Someone else'}
+        self.contract.save()
+        signature = Signature.objects.get(pk=signature.pk)
+        self.assertEqual(signing.get_verification_status(signature), 'invalid')
+        self.assertEqual(signature.verified_hash, self.contract.content_hash)
+
+
+@mock.patch('contracts.signals.send_notification_email')
+class ContractCompositionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='composer@example.com', password='pass')
+        self.contract = Contract.objects.create(
+            client=self.user, contract_type='NDA', data={},
+            body_html=f'<div class="container"><p>Terms</p>{SIGNATURE_SLOT}<p>Annex</p></div>'
+        )
+
+    def sign(self, name, **fields):
+        return Signature.objects.create(
+            contract=self.contract, user=self.user, ip_address='127.0.0.1', signature_hash='hash', public_key='key',
+            signer_name=name, **fields
+        )
+
+    def test_signatures_fill_the_first_slot(self, send_email):
+        signature = SimpleNamespace(
+            signer_name='Signer', user=self.user, signed_at='2026-01-01', qr_code='', barcode_svg=''
+        )
+        html = compose_html(f'<p>A</p>{{{{ signatures_block }}}}<p>B</p>{SIGNATURE_SLOT}', [signature])
+        self.assertEqual(html.count('signature-entry'), 1)
+        self.assertTrue(html.startswith('<p>A</p><div class="signature-entry"><p>Signed by: Signer</p>'))
+        self.assertTrue(html.endswith('<p>B</p>'))
+
+    def test_bodies_without_a_slot_get_a_section_in_the_container(self, send_email):
+        signature = SimpleNamespace(
+            signer_name='Signer', user=self.user, signed_at='2026-01-01', qr_code='', barcode_svg=''
+        )
+        html = compose_html('<div class="container"><p>Terms</p></div>', [signature])
+        self.assertTrue(html.startswith('<div class="container"><p>Terms</p><div class="signature-section">'))
+        self.assertTrue(html.endswith('</div></div></div>'))
+        self.assertEqual(compose_html('<p>Terms</p>', []), '<p>Terms</p>')
+
+    def test_full_text_is_rebuilt_when_a_signature_is_added(self, send_email):
+        self.assertNotIn('signature-entry', Contract.objects.get(pk=self.contract.pk).full_text)
+
+        self.sign('First Signer')
+        full_text = Contract.objects.get(pk=self.contract.pk).full_text
+        self.assertIn('Signed by: First Signer', full_text)
+        self.assertLess(full_text.index('Terms'), full_text.index('First Signer'))
+        self.assertLess(full_text.index('First Signer'), full_text.index('Annex'))
+        self.assertNotIn('signature-entry', Contract.objects.get(pk=self.contract.pk).body_html)
+
+    def test_migration_moves_spliced_signatures_onto_their_rows(self, send_email):
+        first, second = self.sign(''), self.sign('')
+        entries = ''.join(
+            f'<div class="signature-entry"><p>Signed by: {name}</p>'
+            f'<img src="data:image/png;base64,{qr_code}" alt="Signature QR Code"></div>'
+            for name, qr_code in (('First Signer', 'QR1'), ('Second Signer', 'QR2'))
+        )
+        Contract.objects.filter(pk=self.contract.pk).update(
+            body_html=f'<div class="container"><p>Terms</p>{entries}</div>'
+        )
+
+        migration = importlib.import_module('contracts.migrations.0009_contract_body_html_signature_slots')
+        migration.split_signatures(apps, None)
+
+        self.assertEqual(
+            Contract.objects.get(pk=self.contract.pk).body_html,
+            f'<div class="container"><p>Terms</p>{SIGNATURE_SLOT}</div>'
+        )
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.signer_name, first.qr_code), ('First Signer', 'QR1'))
+        self.assertEqual((second.signer_name, second.qr_code), ('Second Signer', 'QR2'))
+
+
+class ContractParticipantTests(APITestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            email='owner@example.com', password='pass', role=RoleModel.objects.create(name='Client')
+        )
+        self.lawyer = User.objects.create_user(
+            email='lawyer@example.com', password='pass', role=RoleModel.objects.create(name='Lawyer')
+        )
+        self.contract = Contract.objects.create(client=self.client_user, contract_type='NDA', data={})
+
+    def listed_ids(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('contract-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [contract['id'] for contract in response.data['results']]
+
+    def can_access(self, user):
+        request = SimpleNamespace(method='GET', user=user)
+        return ContractPermissions().has_object_permission(request, None, self.contract)
+
+    def test_assigned_lawyers_follow_reviews(self):
+        self.assertEqual(self.listed_ids(self.lawyer), [])
+        self.assertFalse(self.can_access(self.lawyer))
+
+        review = Review.objects.create(contract=self.contract, lawyer=self.lawyer)
+        self.assertEqual(self.listed_ids(self.lawyer), [self.contract.id])
+        self.assertTrue(self.can_access(self.lawyer))
+
+        review.delete()
+        self.assertEqual(self.listed_ids(self.lawyer), [])
+        self.assertFalse(self.can_access(self.lawyer))
+
+    def test_client_row_moves_with_the_contract(self):
+        self.assertEqual(self.listed_ids(self.client_user), [self.contract.id])
+
+        new_owner = User.objects.create_user(email='new@example.com', password='pass', role=self.client_user.role)
+        self.contract.client = new_owner
+        self.contract.save()
+        self.assertEqual(self.listed_ids(self.client_user), [])
+        self.assertEqual(self.listed_ids(new_owner), [self.contract.id])
+        self.assertEqual(
+            list(ContractParticipant.objects.filter(contract=self.contract).values_list('user_id', 'role')),
+            [(new_owner.id, 'CLIENT')]
+        )
+
+    def test_migration_backfills_existing_contracts(self):
+        Review.objects.create(contract=self.contract, lawyer=self.lawyer)
+        ContractParticipant.objects.all().delete()
+
+        migration = importlib.import_module('contracts.migrations.0012_contractparticipant')
+        migration.backfill_participants(apps, None)
+        migration.backfill_participants(apps, None)  # re-running is harmless
+
+        self.assertEqual(
+            sorted(ContractParticipant.objects.values_list('user_id', 'role')),
+            sorted([(self.client_user.id, 'CLIENT'), (self.lawyer.id, 'LAWYER')])
+        )
+
+
+class ContractSearchTests(APITestCase):
+    def setUp(self):
+        role = RoleModel.objects.create(name='Client')
+        self.user = User.objects.create_user(email='searcher@example.com', password='pass', role=role)
+        self.other = User.objects.create_user(email='stranger@example.com', password='pass', role=role)
+
+    def contract(self, user, **data):
+        return Contract.objects.create(client=user, contract_type='NDA', data=data)
+
+    def search(self, query):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('contract-create'), {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [contract['id'] for contract in response.data['results']]
+
+    def test_arabic_text_is_folded(self):
+        self.assertEqual(normalize_text('مُحَمَّد'), 'محمد')
+        self.assertEqual(normalize_text('مـحـمـد'), 'محمد')
+        self.assertEqual(tokenize('أحمد إسلام آمنة ٱلعقد'), ['احمد', 'اسلام', 'امنه', 'العقد'])
+        self.assertEqual(tokenize('مستشفى مدرسة ٢٠٢٤ NDA'), ['مستشفي', 'مدرسه', '2024', 'nda'])
+
+    def test_existing_and_new_contracts_are_found(self):
+        existing = self.contract(self.user, party='شركة الأمانة للتجارة')
+        ContractSearchIndex.objects.all().delete()  # as before 0011
+        self.assertEqual(self.search('الامانه'), [])
+
+        migration = importlib.import_module('contracts.migrations.0015_backfill_contract_search_index')
+        migration.backfill_search_index(apps, None)
+        new = self.contract(self.user, party='مؤسسة الأمانة', note='إيجار')
+
+        self.assertEqual(sorted(self.search('الامانه')), sorted([existing.id, new.id]))
+        self.assertEqual(self.search('الأما اِيجار'), [new.id])  # prefixes, every term required
+        self.assertEqual(self.search('للتجاره'), [existing.id])
+
+    def test_results_are_ranked_and_scoped_to_participants(self):
+        passing = self.contract(self.user, terms='إيجار شقة ومرافق وخدمات وصيانة وتأمين ودفعات')
+        focused = self.contract(self.user, terms='إيجار إيجار إيجار')
+        foreign = self.contract(self.other, terms='إيجار')
+
+        self.assertEqual(self.search('ايجار'), [focused.id, passing.id])
+        self.assertEqual(
+            list(search_contracts(contracts_for(self.other), 'ايجار').values_list('id', flat=True)), [foreign.id]
+        )
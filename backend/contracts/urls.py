@@ -1,13 +1,13 @@
 from django.urls import path
 from .views import (
     ContractAnalyticsView, ContractAnalyzeView, ContractAssignLawyerView, ContractCreateView, ContractDetailView, ContractEnhanceView, ContractGenerateView,
-    ContractSignView, ContractReviewView, ContractExportView, ContractSignaturesView, SignatureVerifyView,
+    ContractSignView, ContractReviewView, ContractExportView, ContractExportDetailView, ContractExportDownloadView, ContractSignaturesView, SignatureVerifyView,
  
 )
 from .admin_views import (
     AdminContractListView, AdminContractUpdateView, AdminContractDeleteView,
     AdminContractAssignLawyerView, AdminContractStatusView, AdminContractForceSignView,
-    AdminContractExportAllView
+    AdminContractExportAllView, AdminContractArchiveDetailView, AdminContractArchiveDownloadView
 )
 
 urlpatterns = [
@@ -18,6 +18,8 @@ urlpatterns = [
     path('contracts/<int:id>/review/', ContractReviewView.as_view(), name='contract-review'),
     path('contracts/<int:id>/analyze/', ContractAnalyzeView.as_view(), name='contract-analyze'),
     path('contracts/<int:id>/export/', ContractExportView.as_view(), name='contract-export'),
+    path('contracts/exports/<int:export_id>/', ContractExportDetailView.as_view(), name='contract-export-detail'),
+    path('contracts/exports/<int:export_id>/download/', ContractExportDownloadView.as_view(), name='contract-export-download'),
     path('contracts/analytics/', ContractAnalyticsView.as_view(), name='contract-analytics'),
     path('contracts/<int:id>/enhance/', ContractEnhanceView.as_view(), name='contract-enhance'),
     path('contracts/verify/<int:signature_id>/', SignatureVerifyView.as_view(), name='signature-verify'),
@@ -32,4 +34,6 @@ urlpatterns = [
     path('admin/contracts/<int:id>/status/', AdminContractStatusView.as_view(), name='admin-contract-status'),
     path('admin/contracts/<int:id>/force-sign/', AdminContractForceSignView.as_view(), name='admin-contract-force-sign'),
     path('admin/contracts/export-all/', AdminContractExportAllView.as_view(), name='admin-contract-export-all'),
+    path('admin/contracts/export-all/<int:archive_id>/', AdminContractArchiveDetailView.as_view(), name='admin-contract-archive-detail'),
+    path('admin/contracts/export-all/<int:archive_id>/download/', AdminContractArchiveDownloadView.as_view(), name='admin-contract-archive-download'),
 ]
\ No newline at end of file
@@ -0,0 +1,154 @@
+import logging
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+
+from elshawi_backend import pdf_renderer
+
+from .doc_generator import generate_docx
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = ('id', 'contract_type', 'data', 'full_text', 'text_version', 'created_at')
+# Columns read for the export; full_text is composed from body_html and the signatures.
+EXPORT_COLUMNS = ('id', 'contract_type', 'data', 'body_html', 'text_version', 'created_at', 'updated_at')
+
+EXPORT_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+def render_contract_docx(payload):
+    """Worker entry point: render one contract payload to DOCX bytes."""
+    buffer = BytesIO()
+    generate_docx(SimpleNamespace(**payload)).save(buffer)
+    return buffer.getvalue()
+
+
+def submit_contract_pdf(executor, payload):
+    """PDFs go to the shared renderer pool, which keeps its stylesheets warm."""
+    html_content = payload['full_text'] or payload['text_version']
+    if not html_content:
+        raise ValueError("Contract text_version or full_text is empty. Generate contract text first.")
+    return pdf_renderer.submit(html_content)
+
+
+def submit_contract_docx(executor, payload):
+    if executor is None:
+        future = Future()
+        future.set_result(render_contract_docx(payload))
+        return future
+    return executor.submit(render_contract_docx, payload)
+
+
+# format -> (submit function, whether it needs a local process pool)
+RENDERERS = {
+    'pdf': (submit_contract_pdf, False),
+    'docx': (submit_contract_docx, True),
+}
+
+
+class _StreamBuffer:
+    """Write-only, non-seekable sink that zipfile writes into and the generator drains."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _contract_payload(contract):
+    # Workers only get plain values, never model instances or a DB connection.
+    return {field: getattr(contract, field) for field in EXPORT_FIELDS}
+
+
+def stream_contracts_archive(queryset, format='pdf', max_workers=None, chunk_size=None):
+    """Yield a ZIP archive with one entry per contract, rendering in worker processes.
+
+    Contracts are read with a server-side iterator and at most ``2 * max_workers``
+    renders are in flight, so memory stays flat regardless of the queryset size.
+    Once every entry has been written, the successfully exported rows are marked
+    ``EXPORTED`` with a single UPDATE. Daemonic processes (the Celery workers
+    that build archive exports) cannot start a pool and render DOCX inline.
+    """
+    render, needs_pool = RENDERERS[format]
+    needs_pool = needs_pool and not multiprocessing.current_process().daemon
+    if needs_pool:
+        max_workers = max_workers or getattr(settings, 'CONTRACT_EXPORT_WORKERS', None) or os.cpu_count() or 1
+    else:
+        max_workers = max_workers or max(getattr(settings, 'PDF_RENDERER_WORKERS', 2), 1)
+    chunk_size = chunk_size or getattr(settings, 'CONTRACT_EXPORT_CHUNK_SIZE', 200)
+    window = max_workers * 2
+
+    buffer = _StreamBuffer()
+    # PDF and DOCX are already compressed, so entries are stored as-is.
+    archive = zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED)
+    pending = deque()
+    failed_ids = []
+    max_pk = None
+
+    def write_entry(contract_id, future):
+        try:
+            content = future.result()
+        except Exception as e:
+            logger.error(f"Bulk export failed for contract {contract_id}: {str(e)}")
+            failed_ids.append(contract_id)
+            return
+        archive.writestr(f"contract_{contract_id}.{format}", content)
+
+    with ProcessPoolExecutor(max_workers=max_workers) if needs_pool else nullcontext() as executor:
+        contracts = (
+            queryset.only(*EXPORT_COLUMNS)
+            .prefetch_related('signatures__user')
+            .order_by('pk')
+            .iterator(chunk_size=chunk_size)
+        )
+        for contract in contracts:
+            max_pk = contract.pk
+            try:
+                pending.append((contract.pk, render(executor, _contract_payload(contract))))
+            except Exception as e:
+                logger.error(f"Bulk export failed for contract {contract.pk}: {str(e)}")
+                failed_ids.append(contract.pk)
+                continue
+            if len(pending) >= window:
+                write_entry(*pending.popleft())
+                yield buffer.drain()
+
+        while pending:
+            write_entry(*pending.popleft())
+            yield buffer.drain()
+
+    if failed_ids:
+        archive.writestr(
+            'export_errors.txt',
+            '\n'.join(f"contract_{contract_id}" for contract_id in failed_ids)
+        )
+    archive.close()
+    yield buffer.drain()
+
+    if max_pk is not None:
+        # status is part of the signed metadata; clearing content_hash makes it recompute lazily.
+        updated = queryset.filter(pk__lte=max_pk).exclude(pk__in=failed_ids).update(
+            status='EXPORTED', updated_at=timezone.now(), content_hash=''
+        )
+        logger.info(f"Bulk export finished: {updated} contracts exported, {len(failed_ids)} failed")
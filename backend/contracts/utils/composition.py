@@ -0,0 +1,87 @@
+"""Compose a contract's HTML from its body and its signatures.
+
+``Contract.body_html`` never contains signatures. Templates render a
+``SIGNATURE_SLOT`` where the signature entries go; each ``Signature`` row
+renders to one entry and the composed document is cached per contract
+version, so signing is a row insert instead of rewriting the whole body.
+Bodies without a slot (AI rewrites, older documents) get a signature section
+appended at the end of the outer container, as signing used to do.
+"""
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+SIGNATURE_SLOT = '<!-- signatures -->'
+
+# The AI prompts ask for a literal ``{{ signatures_block }}`` placeholder.
+SLOT_PATTERN = re.compile(r'<!-- signatures -->|\{\{\s*signatures_block(?:\|safe)?\s*\}\}')
+
+SIGNATURE_SECTION = (
+    '<div class="signature-section">'
+    '<h3 class="section-title">التوقيع والتاريخ - <span class="english">SIGNATURE AND DATE</span></h3>'
+    '{}'
+    '</div>'
+)
+
+
+def render_signature_entry(signature):
+    qr_code = signature.qr_code
+    return format_html(
+        '<div class="signature-entry"><p>Signed by: {}</p><p>Date: {}</p>{}{}</div>',
+        signature.signer_name or signature.user.fullname,
+        signature.signed_at,
+        format_html(
+            '<img src="data:image/png;base64,{}" alt="Signature QR Code" width="100" height="100">', qr_code
+        ) if qr_code else '',
+        # The barcode SVG is generated server-side when an admin adds a signature.
+        format_html('<div class="barcode">{}</div>', mark_safe(signature.barcode_svg)) if signature.barcode_svg else '',
+    )
+
+
+def compose_html(body_html, signatures):
+    """Place the rendered ``signatures`` into ``body_html``."""
+    entries = format_html_join('', '{}', ((render_signature_entry(signature),) for signature in signatures))
+    if SLOT_PATTERN.search(body_html):
+        # Only the first slot gets the entries; any others are cleared.
+        first = [True]
+
+        def fill(match):
+            if first[0]:
+                first[0] = False
+                return entries
+            return ''
+        return SLOT_PATTERN.sub(fill, body_html)
+
+    if not entries:
+        return body_html
+    container_start = body_html.find('<div class="container">')
+    container_end = body_html.rfind('</div>', max(container_start, 0))
+    section = SIGNATURE_SECTION.format(entries)
+    if container_start == -1 or container_end == -1:
+        return body_html + section
+    return body_html[:container_end] + section + body_html[container_end:]
+
+
+def _cache_key(contract):
+    version = contract.updated_at.timestamp() if contract.updated_at else 0
+    return f'contract_full_text:{contract.pk}:{version}'
+
+
+def get_full_text(contract):
+    """The composed contract HTML, cached until the contract or one of its signatures changes."""
+    if not contract.body_html:
+        return contract.body_html
+    cache = caches['local']
+    key = _cache_key(contract)
+    full_text = cache.get(key)
+    if full_text is None:
+        if 'signatures' in getattr(contract, '_prefetched_objects_cache', {}):
+            signatures = sorted(contract.signatures.all(), key=lambda signature: (signature.signed_at, signature.pk))
+        else:
+            signatures = contract.signatures.select_related('user').order_by('signed_at', 'pk')
+        full_text = compose_html(contract.body_html, signatures)
+        cache.set(key, full_text, getattr(settings, 'CONTRACT_FULL_TEXT_CACHE_TIMEOUT', 3600))
+    return full_text
@@ -1,4 +1,9 @@
+import hashlib
+import json
+from io import BytesIO
+
 from docx import Document
+from django.core.serializers.json import DjangoJSONEncoder
 from django.template.loader import render_to_string
 
 def generate_docx(contract):
@@ -7,4 +12,18 @@ def generate_docx(contract):
     doc.add_paragraph(f'Client: {contract.data.get("client_name", "")}')
     doc.add_paragraph(f'Details: {contract.data.get("details", "")}')
     doc.add_paragraph(f'Generated on: {contract.created_at}')
-    return doc
\ No newline at end of file
+    return doc
+
+
+def render_docx(contract):
+    buffer = BytesIO()
+    generate_docx(contract).save(buffer)
+    return buffer.getvalue()
+
+
+def docx_content_hash(contract):
+    """Cache key for a DOCX export: the fields generate_docx reads."""
+    payload = [contract.contract_type, contract.data, contract.created_at]
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode('utf-8')
+    ).hexdigest()
@@ -1,4 +1,4 @@
-from openai import AsyncOpenAI
+from elshawi_backend.llm_gateway import chat_completion, create_embeddings
 from django.conf import settings
 from .template_registry import TEMPLATES
 import logging
@@ -6,13 +6,6 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-async def get_openai_client():
-    """Initialize OpenAI client with OpenRouter configuration."""
-    return AsyncOpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=settings.OPENROUTER_API_KEY
-    )
-
 async def generate_contract_html(contract):
     """Generate contract HTML using OpenAI API."""
     template = TEMPLATES.get(contract.contract_type)
@@ -44,8 +37,7 @@ async def generate_contract_html(contract):
 async def call_gpt_api(prompt):
     """Call OpenAI API to generate contract HTML."""
     try:
-        client = await get_openai_client()
-        response = await client.chat.completions.create(
+        response = await chat_completion(
             model="qwen/qwen3-14b:free",
             messages=[
                 {
@@ -83,8 +75,7 @@ async def call_gpt_api(prompt):
 async def create_document_embedding(document_text):
     """Create embeddings for document text using qwen/qwen3-14b:free."""
     try:
-        client = await get_openai_client()
-        response = await client.embeddings.create(
+        response = await create_embeddings(
             input=document_text[:8192],  # Truncate for ada-002 limit
             model="qwen/qwen3-14b:free"
         )
@@ -96,8 +87,7 @@ async def create_document_embedding(document_text):
 async def analyze_contract(contract_text):
     """Analyze contract and provide suggestions."""
     try:
-        client = await get_openai_client()
-        response = await client.chat.completions.create(
+        response = await chat_completion(
             model="qwen/qwen3-14b:free",
             messages=[
                 {
@@ -124,8 +114,7 @@ async def process_contract_embedding(contract_text):
 async def generate_contract_summary(contract_text):
     """Generate a summary of the contract."""
     try:
-        client = await get_openai_client()
-        response = await client.chat.completions.create(
+        response = await chat_completion(
             model="qwen/qwen3-14b:free",
             messages=[
                 {
@@ -147,8 +136,7 @@ async def generate_contract_summary(contract_text):
 async def extract_contract_terms(contract_text):
     """Extract key terms from the contract."""
     try:
-        client = await get_openai_client()
-        response = await client.chat.completions.create(
+        response = await chat_completion(
             model="qwen/qwen3-14b:free",
             messages=[
                 {
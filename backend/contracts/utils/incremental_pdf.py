@@ -0,0 +1,173 @@
+"""Incremental contract export: a cached body PDF plus a signature appendix.
+
+The contract body is rendered through WeasyPrint once per distinct body and
+stored under its hash. Each export then only draws the signature appendix
+(one block per signature, with its QR code and hashes) with reportlab and
+appends it to the stored body PDF, so a new signer costs milliseconds rather
+than a full re-layout of the document.
+"""
+import base64
+import hashlib
+import os
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from .composition import compose_html
+from .doc_generator import docx_content_hash
+from .pdf_generator import EXPORT_FONT_FILES, export_content_hash, render_export_pdf
+
+# Bump when the appendix layout changes so stored exports are not reused.
+APPENDIX_LAYOUT_VERSION = '1'
+
+BODY_PDF_DIR = 'contracts/exports/bodies'
+
+QR_SIZE = 28 * mm
+BLOCK_HEIGHT = 36 * mm
+MARGIN = 18 * mm
+
+
+def _signature_digest(signature):
+    return hashlib.sha256(signature.signature_hash.encode('utf-8')).hexdigest()
+
+
+def get_body_html(contract):
+    """The contract document with its signature slot left empty."""
+    return compose_html(contract.body_html, [])
+
+
+def body_content_hash(contract):
+    return export_content_hash(get_body_html(contract))
+
+
+def incremental_content_hash(contract, signatures):
+    """Export cache key: the body hash plus everything drawn on the appendix."""
+    digest = hashlib.sha256()
+    digest.update(f'incremental:{APPENDIX_LAYOUT_VERSION}:{body_content_hash(contract)}'.encode('utf-8'))
+    for signature in signatures:
+        digest.update(b'\0')
+        digest.update('|'.join([
+            str(signature.pk),
+            signature.signer_name or signature.user.fullname,
+            signature.signed_at.isoformat(),
+            signature.verified_hash,
+            _signature_digest(signature),
+            hashlib.sha256(signature.qr_code.encode('utf-8')).hexdigest(),
+        ]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _body_pdf_name(body_hash):
+    return f'{BODY_PDF_DIR}/{body_hash}.pdf'
+
+
+def has_body_pdf(contract):
+    return default_storage.exists(_body_pdf_name(body_content_hash(contract)))
+
+
+def get_body_pdf(contract):
+    """Return the body PDF bytes, rendering and storing them only if this body was never rendered."""
+    body_html = get_body_html(contract)
+    name = _body_pdf_name(export_content_hash(body_html))
+    if default_storage.exists(name):
+        with default_storage.open(name, 'rb') as body_file:
+            return body_file.read()
+    pdf_bytes = render_export_pdf(body_html)
+    default_storage.save(name, ContentFile(pdf_bytes))
+    return pdf_bytes
+
+
+@lru_cache(maxsize=1)
+def _appendix_fonts():
+    """Use the export's Amiri font when it is installed, otherwise the built-in Helvetica."""
+    font_base_path = os.path.join(settings.BASE_DIR, 'static', 'fonts')
+    regular = os.path.join(font_base_path, EXPORT_FONT_FILES['amiri_regular'])
+    bold = os.path.join(font_base_path, EXPORT_FONT_FILES['amiri_bold'])
+    if os.path.exists(regular) and os.path.exists(bold):
+        pdfmetrics.registerFont(TTFont('Amiri', regular))
+        pdfmetrics.registerFont(TTFont('Amiri-Bold', bold))
+        return 'Amiri', 'Amiri-Bold'
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+def render_signature_appendix(contract, signatures):
+    """Draw one block per signature on as many A4 pages as needed."""
+    regular, bold = _appendix_fonts()
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    def start_page():
+        pdf.setFont(bold, 14)
+        pdf.drawString(MARGIN, height - MARGIN, f"Signatures - Contract #{contract.pk}")
+        return height - MARGIN - 12 * mm
+
+    y = start_page()
+    for signature in signatures:
+        if y - BLOCK_HEIGHT < MARGIN:
+            pdf.showPage()
+            y = start_page()
+
+        top = y
+        if signature.qr_code:
+            qr_image = ImageReader(BytesIO(base64.b64decode(signature.qr_code)))
+            pdf.drawImage(qr_image, width - MARGIN - QR_SIZE, top - QR_SIZE, QR_SIZE, QR_SIZE)
+
+        pdf.setFont(bold, 11)
+        pdf.drawString(MARGIN, top - 5 * mm, f"Signed by: {signature.signer_name or signature.user.fullname}")
+        pdf.setFont(regular, 8)
+        lines = [
+            f"Signature ID: {signature.pk}",
+            f"Signed at: {signature.signed_at.isoformat()}",
+            f"Contract hash: {signature.verified_hash or '-'}",
+            f"Signature digest: {_signature_digest(signature)}",
+        ]
+        for index, line in enumerate(lines):
+            pdf.drawString(MARGIN, top - (11 + 5 * index) * mm, line)
+        pdf.line(MARGIN, top - BLOCK_HEIGHT + 2 * mm, width - MARGIN, top - BLOCK_HEIGHT + 2 * mm)
+        y = top - BLOCK_HEIGHT
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def merge_pdfs(*documents):
+    writer = PdfWriter()
+    for document in documents:
+        for page in PdfReader(BytesIO(document)).pages:
+            writer.add_page(page)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def render_incremental_pdf(contract, signatures):
+    """Stored body PDF followed by a freshly drawn signature appendix."""
+    body_pdf = get_body_pdf(contract)
+    if not signatures:
+        return body_pdf
+    return merge_pdfs(body_pdf, render_signature_appendix(contract, signatures))
+
+
+def get_signatures(contract):
+    return list(contract.signatures.select_related('user').order_by('signed_at', 'pk'))
+
+
+def content_hash_for(contract, mode, signatures=None, export_format='pdf'):
+    """The export cache key of ``contract`` in ``mode`` ('full' or 'incremental') and ``export_format``."""
+    if export_format == 'docx':
+        return docx_content_hash(contract)
+    if mode == 'incremental':
+        return incremental_content_hash(contract, get_signatures(contract) if signatures is None else signatures)
+    return export_content_hash(contract.full_text)
@@ -0,0 +1,49 @@
+"""The contract participant table behind ``ContractPermissions`` and "my contracts".
+
+A contract's client and the lawyers assigned to review it each get one
+``ContractParticipant`` row. The rows are kept in sync by the contract and
+review signals, so access checks and per-user lists are single indexed
+queries instead of joins through ``Review``.
+"""
+from ..models import Contract, ContractParticipant, Review
+
+
+def sync_client(contract):
+    """Point the contract's CLIENT row at ``contract.client_id``."""
+    current = list(
+        ContractParticipant.objects.filter(contract_id=contract.pk, role='CLIENT').values_list('user_id', flat=True)
+    )
+    if current == ([contract.client_id] if contract.client_id else []):
+        return
+    ContractParticipant.objects.filter(contract_id=contract.pk, role='CLIENT').exclude(user_id=contract.client_id).delete()
+    if contract.client_id and contract.client_id not in current:
+        ContractParticipant.objects.create(contract_id=contract.pk, user_id=contract.client_id, role='CLIENT')
+
+
+def sync_lawyers(contract_id):
+    """Make the contract's LAWYER rows match the lawyers of its reviews."""
+    assigned = set(Review.objects.filter(contract_id=contract_id).values_list('lawyer_id', flat=True))
+    current = set(
+        ContractParticipant.objects.filter(contract_id=contract_id, role='LAWYER').values_list('user_id', flat=True)
+    )
+    if current - assigned:
+        ContractParticipant.objects.filter(
+            contract_id=contract_id, role='LAWYER', user_id__in=current - assigned
+        ).delete()
+    if assigned - current:
+        ContractParticipant.objects.bulk_create(
+            [ContractParticipant(contract_id=contract_id, user_id=user_id, role='LAWYER') for user_id in assigned - current],
+            ignore_conflicts=True
+        )
+
+
+def is_participant(user, contract):
+    if contract.client_id == user.pk:
+        return True
+    return ContractParticipant.objects.filter(contract_id=contract.pk, user_id=user.pk).exists()
+
+
+def contracts_for(user):
+    """The contracts listed as the user's own: assigned ones for lawyers, their own for everyone else."""
+    role = 'LAWYER' if user.role and user.role.name == 'Lawyer' else 'CLIENT'
+    return Contract.objects.filter(participants__user=user, participants__role=role)
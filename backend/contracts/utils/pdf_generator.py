@@ -1,8 +1,203 @@
-from weasyprint import HTML
+import hashlib
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+from elshawi_backend.pdf_renderer import render_pdf
+
+EXPORT_FONT_FILES = {
+    'amiri_regular': 'amiri-regular.ttf',
+    'amiri_bold': 'amiri-bold.ttf',
+    'inter_regular': 'inter-regular.ttf',
+    'inter_bold': 'inter-bold.ttf',
+}
+
+EXPORT_BASE_CSS = """
+    @page {
+        size: A4;
+        margin: 3mm;
+    }
+    * {
+        box-sizing: border-box;
+        margin: 0;
+        padding: 0;
+    }
+    html {
+        font-family: %(body_font)s;
+        font-size: 9pt;
+    }
+    body {
+        font-family: %(body_font)s;
+        background: white;
+        padding: 3mm;
+        direction: rtl;
+        text-align: right;
+        color: #000;
+        line-height: 1.2;
+    }
+    .container {
+        max-width: 204mm;
+        margin: 0 auto;
+        background: white;
+        border: 1px solid #000;
+        padding: 8mm;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 8mm;
+        padding-bottom: 3mm;
+        border-bottom: 1px solid #000;
+        break-inside: avoid;
+    }
+    .header h1 {
+        font-family: %(arabic_font)s;
+        font-size: 14pt;
+        font-weight: bold;
+        color: #000;
+        margin-bottom: 2mm;
+        text-transform: uppercase;
+    }
+    .header .english {
+        font-family: %(latin_font)s;
+        font-size: 10pt;
+        font-weight: normal;
+        color: #333;
+        font-style: italic;
+    }
+    .section {
+        margin-bottom: 3mm;
+        break-inside: avoid;
+    }
+    .section-title {
+        font-family: %(arabic_font)s;
+        font-size: 10pt;
+        font-weight: bold;
+        color: #000;
+        margin-bottom: 2mm;
+        text-decoration: underline;
+        text-align: right;
+    }
+    .section-title .english {
+        font-family: %(latin_font)s;
+        font-style: italic;
+        font-weight: normal;
+        color: #666;
+    }
+    .section-content {
+        font-family: %(arabic_font)s;
+        color: #000;
+        font-size: 8pt;
+        text-align: justify;
+        margin-right: 3mm;
+    }
+    .section-content p {
+        margin-bottom: 2mm;
+    }
+    .form-field {
+        display: inline-block;
+        border-bottom: 1px solid #000;
+        min-width: 50mm;
+        padding: 0.5mm 1mm;
+        margin: 0 0.5mm;
+        font-weight: bold;
+    }
+    .signature-section {
+        margin-top: 5mm;
+        padding-top: 3mm;
+        border-top: 1px solid #000;
+        break-inside: avoid;
+    }
+    .signature-entry {
+        margin-bottom: 3mm;
+    }
+    .signature-entry p {
+        font-family: %(latin_font)s;
+        margin-bottom: 1mm;
+        font-size: 8pt;
+    }
+    .signature-entry img {
+        margin-top: 1mm;
+        width: 15mm;
+        height: 15mm;
+    }
+"""
+
+EXPORT_FONT_FACE_CSS = """
+    @font-face {
+        font-family: 'Amiri';
+        src: url('file://%(amiri_regular)s') format('truetype');
+        font-weight: normal;
+        font-style: normal;
+    }
+    @font-face {
+        font-family: 'Amiri';
+        src: url('file://%(amiri_bold)s') format('truetype');
+        font-weight: bold;
+        font-style: normal;
+    }
+    @font-face {
+        font-family: 'Inter';
+        src: url('file://%(inter_regular)s') format('truetype');
+        font-weight: normal;
+        font-style: normal;
+    }
+    @font-face {
+        font-family: 'Inter';
+        src: url('file://%(inter_bold)s') format('truetype');
+        font-weight: bold;
+        font-style: normal;
+    }
+"""
+
 
 def generate_pdf(contract):
-    html_content = contract.full_text or contract.text_version  
+    html_content = contract.full_text or contract.text_version
     if not html_content:
         raise ValueError("Contract text_version or full_text is empty. Generate contract text first.")
-    pdf_file = HTML(string=html_content).write_pdf()
-    return pdf_file
\ No newline at end of file
+    return render_pdf(html_content)
+
+
+@lru_cache(maxsize=1)
+def get_export_stylesheet():
+    """Build the contract export stylesheet once per process.
+
+    Custom Amiri/Inter fonts are used when all font files are present under
+    static/fonts, otherwise the stylesheet falls back to system fonts.
+    """
+    font_base_path = os.path.join(settings.BASE_DIR, 'static', 'fonts')
+    font_paths = {
+        key: os.path.join(font_base_path, filename)
+        for key, filename in EXPORT_FONT_FILES.items()
+    }
+
+    if all(os.path.exists(path) for path in font_paths.values()):
+        return EXPORT_FONT_FACE_CSS % font_paths + EXPORT_BASE_CSS % {
+            'body_font': "'Amiri', 'Inter', Arial, sans-serif",
+            'arabic_font': "'Amiri', Arial, sans-serif",
+            'latin_font': "'Inter', Arial, sans-serif",
+        }
+    return EXPORT_BASE_CSS % {
+        'body_font': "Arial, 'Times New Roman', sans-serif",
+        'arabic_font': "Arial, 'Times New Roman', sans-serif",
+        'latin_font': "Arial, 'Times New Roman', sans-serif",
+    }
+
+
+def get_export_stylesheets():
+    """Stylesheets of the renderer's ``contract`` profile."""
+    return [get_export_stylesheet()]
+
+
+def export_content_hash(html_content):
+    """Cache key for a rendered export: the HTML plus the stylesheet it is rendered with."""
+    digest = hashlib.sha256()
+    digest.update(html_content.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(get_export_stylesheet().encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_export_pdf(html_content):
+    """Render contract HTML with the export stylesheet in the renderer pool."""
+    return render_pdf(html_content, 'contract')
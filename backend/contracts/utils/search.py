@@ -0,0 +1,128 @@
+"""Full-text search over contracts.
+
+Each contract has one ``ContractSearchIndex`` row holding the normalized
+tokens of its data values, text version and full text (body plus signer
+names; see ``utils.composition``). The row is
+refreshed by the contract signals; the database indexes it with FTS5 on
+SQLite and a GIN-indexed ``tsvector`` column on PostgreSQL (migration 0011).
+
+Text and queries go through the same normalization: Arabic diacritics and
+tatweel are dropped, alef/hamza variants, taa marbuta and alef maqsura are
+folded, Arabic-Indic digits become ASCII and everything is casefolded, so
+"مُحَمَّد", "محمد" and "مـحـمـد" all match. Query terms are prefix matches
+and all of them must be present.
+"""
+import html
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+from ..models import Contract, ContractSearchIndex
+
+FTS_TABLE = 'contracts_contractsearch_fts'
+
+# Quranic annotation marks, harakat, superscript alef and tatweel.
+ARABIC_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+ARABIC_FOLDING = str.maketrans({
+    'آ': 'ا',  # alef with madda
+    'أ': 'ا',  # alef with hamza above
+    'إ': 'ا',  # alef with hamza below
+    'ٱ': 'ا',  # alef wasla
+    'ة': 'ه',  # taa marbuta -> haa
+    'ى': 'ي',  # alef maqsura -> yaa
+    'ؤ': 'و',  # waw with hamza
+    'ئ': 'ي',  # yaa with hamza
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},
+})
+TOKEN = re.compile(r'[^\W_]+')
+
+# Fields a contract save has to touch for its indexed text to change.
+INDEXED_FIELDS = {'data', 'text_version', 'body_html'}
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFKC', text)
+    text = ARABIC_MARKS.sub('', text)
+    return text.translate(ARABIC_FOLDING).casefold()
+
+
+def tokenize(text):
+    return TOKEN.findall(normalize_text(text))
+
+
+def _data_strings(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _data_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _data_strings(item)
+    elif value is not None:
+        yield str(value)
+
+
+def document_from(data, text_version, body_html, signer_names):
+    """The normalized tokens for a contract's data values, markup and signer names."""
+    parts = list(_data_strings(data))
+    for markup in (text_version, body_html):
+        text = html.unescape(strip_tags(markup or ''))
+        if text and text not in parts:
+            parts.append(text)
+    return ' '.join(tokenize(' '.join(parts + list(signer_names))))
+
+
+def build_document(contract):
+    """The normalized tokens stored for ``contract``."""
+    # Read from the rows rather than the cached full_text, which signature signals may see before it is bumped.
+    signer_names = [
+        signature.signer_name or signature.user.fullname
+        for signature in contract.signatures.select_related('user').order_by('signed_at', 'pk')
+    ]
+    return document_from(contract.data, contract.text_version, contract.body_html, signer_names)
+
+
+def index_contract(contract):
+    document = build_document(contract)
+    index, created = ContractSearchIndex.objects.get_or_create(contract_id=contract.pk, defaults={'document': document})
+    if not created and index.document != document:
+        index.document = document
+        index.save(update_fields=['document', 'updated_at'])
+
+
+def search_contracts(queryset, query):
+    """Filter ``queryset`` to contracts matching ``query``, annotated with ``search_rank`` (lower is better)."""
+    terms = tokenize(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    contract_id = f'{connection.ops.quote_name(Contract._meta.db_table)}.{connection.ops.quote_name("id")}'
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).annotate(search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {contract_id}',
+            [match], output_field=FloatField()
+        ))
+    if connection.vendor == 'postgresql':
+        ts_query = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT contract_id FROM contracts_contractsearchindex "
+                "WHERE search_vector @@ to_tsquery('simple', %s)", [ts_query]
+            )
+        ).annotate(search_rank=RawSQL(
+            "SELECT -ts_rank(search_vector, to_tsquery('simple', %s)) FROM contracts_contractsearchindex "
+            f"WHERE contract_id = {contract_id}",
+            [ts_query], output_field=FloatField()
+        ))
+
+    # No full-text support: a substring scan of the normalized documents, unranked.
+    for term in terms:
+        queryset = queryset.filter(search_index__document__contains=term)
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,93 @@
+import base64
+import hashlib
+import json
+from functools import lru_cache
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+
+# Contract fields covered by a signature; changing any of them changes the contract hash.
+SIGNED_FIELDS = ('id', 'contract_type', 'status', 'data', 'needs_review', 'is_locked')
+
+SIGNATURE_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=32
+)
+
+
+def sort_dict_recursive(data):
+    if isinstance(data, dict):
+        return {k: sort_dict_recursive(v) for k, v in sorted(data.items())}
+    return data
+
+
+def contract_metadata(contract):
+    """The canonical metadata a client signs for ``contract``."""
+    return {
+        'id': contract.id,
+        'contract_type': contract.contract_type,
+        'status': contract.status,
+        'data': sort_dict_recursive(contract.data),
+        'needs_review': contract.needs_review,
+        'is_locked': contract.is_locked
+    }
+
+
+def compute_contract_hash(contract):
+    """Hex sha256 of the canonical metadata JSON, as signed by the frontend."""
+    contract_metadata_str = json.dumps(
+        contract_metadata(contract), separators=(',', ':'), sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(contract_metadata_str.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def load_public_key(public_key_pem):
+    """Parse a PEM public key once; signers reuse the same key across contracts and requests."""
+    return serialization.load_pem_public_key(
+        public_key_pem.encode('utf-8'),
+        backend=default_backend()
+    )
+
+
+def verify_signature(public_key_pem, signature_b64, contract_hash):
+    """Raise ``InvalidSignature`` (or ``ValueError`` for malformed input) unless the signature matches."""
+    load_public_key(public_key_pem).verify(
+        base64.b64decode(signature_b64),
+        bytes.fromhex(contract_hash),
+        SIGNATURE_PADDING,
+        hashes.SHA256()
+    )
+
+
+def get_contract_hash(contract):
+    """Return the stored contract hash, filling it in for rows written before it was tracked."""
+    if not contract.content_hash:
+        contract.content_hash = compute_contract_hash(contract)
+        type(contract).objects.filter(pk=contract.pk).update(content_hash=contract.content_hash)
+    return contract.content_hash
+
+
+def get_verification_status(signature, contract=None):
+    """Return 'valid' or 'invalid' for ``signature`` against the current contract state.
+
+    The result is stored on the signature together with the contract hash it
+    was computed for, so RSA verification only runs again after the contract
+    changes.
+    """
+    contract = contract or signature.contract
+    contract_hash = get_contract_hash(contract)
+
+    if signature.verified_hash != contract_hash:
+        try:
+            verify_signature(signature.public_key, signature.signature_hash, contract_hash)
+            is_verified = True
+        except Exception:
+            is_verified = False
+        signature.verified_hash = contract_hash
+        signature.is_verified = is_verified
+        type(signature).objects.filter(pk=signature.pk).update(
+            verified_hash=contract_hash, is_verified=is_verified
+        )
+    return 'valid' if signature.is_verified else 'invalid'
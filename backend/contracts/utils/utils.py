@@ -1,16 +1,15 @@
 import openai
 from django.conf import settings
+from elshawi_backend.llm_gateway import chat_completion_sync
+from ai_assistant.llm_cache import get_cached_response, make_cache_key, set_cached_response
 import logging
 
 logger = logging.getLogger(__name__)
 
-# إعداد عميل OpenAI
-client = openai.AsyncOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=settings.OPENROUTER_API_KEY
-)
+ENHANCE_MODEL = "qwen/qwen3-14b:free"
+ENHANCE_PROMPT_VERSION = 1  # bump when the refinement prompt changes to invalidate cached results
 
-async def generate_html_for_contract(html_template: str, context: dict, additional_instruction: str = "") -> str:
+def generate_html_for_contract(html_template: str, context: dict, additional_instruction: str = "") -> str:
     if not html_template or not html_template.strip():
         raise ValueError("HTML template cannot be empty")
 
@@ -34,8 +33,15 @@ Here is the HTML content:
 {html_template}
 """
 
-        response = await client.chat.completions.create(
-            model="qwen/qwen3-14b:free",
+        cache_key = make_cache_key(
+            'contract_html', ENHANCE_MODEL, ENHANCE_PROMPT_VERSION, html_template, additional_instruction
+        )
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        response = chat_completion_sync(
+            model=ENHANCE_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -65,6 +71,7 @@ Here is the HTML content:
         if not html_content or len(html_content) < 20:
             raise ValueError("Generated HTML content is too short or empty")
 
+        set_cached_response(cache_key, 'contract_html', html_content)
         return html_content
 
     except openai.APIError as e:
@@ -1,15 +1,24 @@
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Count, Avg
-from django.http import HttpResponse
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse
 from django.db import models, transaction
 from .utils.utils import generate_html_for_contract
 from contracts.signals import send_notification_email
-from asgiref.sync import async_to_sync
-from .models import Contract, Review, Signature
-from .serializers import AssignReviewSerializer, ContractSerializer, ReviewSerializer, SignatureSerializer
+from .models import Contract, ContractExport, Review, Signature
+from .serializers import AssignReviewSerializer, ContractExportSerializer, ContractSerializer, ReviewSerializer, SignatureSerializer
+from .tasks import export_contract_pdf
 from .permissions import ContractPermissions
+from elshawi_backend.pagination import paginate
 from .utils.pdf_generator import generate_pdf
+from .utils.bulk_export import EXPORT_CONTENT_TYPES
+from .utils.composition import SIGNATURE_SLOT
+from .utils.incremental_pdf import content_hash_for, get_signatures, has_body_pdf, render_incremental_pdf
+from .utils.participants import contracts_for
+from .utils.search import search_contracts
+from .utils.signing import compute_contract_hash, get_verification_status, verify_signature
 from .utils.doc_generator import generate_docx
 from .utils.gpt_integration import generate_contract_html, analyze_contract
 from django.template.loader import render_to_string
@@ -24,9 +33,7 @@ from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.asymmetric.padding import PSS, MGF1
 from cryptography.hazmat.backends import default_backend
 from cryptography.exceptions import InvalidSignature
-import hashlib
 import base64
-import json
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
@@ -34,37 +41,26 @@ from io import BytesIO
 from rest_framework.permissions import BasePermission
 import qrcode
 from rest_framework.views import APIView
+from rest_framework.exceptions import PermissionDenied
 from django.template import Template, Context
+from django.utils import timezone
 import logging
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
-def sort_dict_recursive(data):
-    if isinstance(data, dict):
-        return {k: sort_dict_recursive(v) for k, v in sorted(data.items())}
-    return data
-
 class ContractCreateView(APIView):
     permission_classes = [ContractPermissions]
     
     def get(self, request):
-        try:
-            if request.user.role and request.user.role.name == 'Lawyer':
-                # Fetch contracts assigned to the lawyer via Review
-                reviews = Review.objects.filter(lawyer=request.user).select_related('contract')
-                contracts = [review.contract for review in reviews]
-                logger.info(f"Retrieved {len(contracts)} assigned contracts for lawyer {request.user.id}")
-            else:
-                # Fetch contracts where the user is the client
-                contracts = Contract.objects.filter(client=request.user)
-                logger.info(f"Retrieved {len(contracts)} contracts for client {request.user.id}")
-            
-            serializer = ContractSerializer(contracts, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Exception as e:
-            logger.error(f"Error retrieving contracts for user {request.user.id}: {str(e)}")
-            return Response({'detail': f'No contracts found: {str(e)}'}, status=status.HTTP_404_NOT_FOUND)
+        # Assigned contracts for lawyers, their own for clients; one indexed query, paginated
+        contracts = contracts_for(request.user)
+        query = request.query_params.get('q')
+        if query:
+            # Ranked full-text search within the same contracts
+            contracts = search_contracts(contracts, query)
+            self.cursor_ordering = 'search_rank'
+        return paginate(request, contracts, ContractSerializer, view=self)
 
     def post(self, request):
         data = request.data.copy()
@@ -93,11 +89,10 @@ class ContractCreateView(APIView):
                     'data_items': contract.data.items(),
                     'data': contract.data,
                     'created_at': contract.created_at,
-                    'signatures': contract.signatures.all(),
-                    'signatures_block': ''
+                    'signatures_block': SIGNATURE_SLOT
                 }
                 contract.text_version = render_to_string(template_name, context)
-                contract.full_text = contract.text_version
+                contract.body_html = contract.text_version
                 contract.save()
                 logger.info(f"Contract {contract.id} created and rendered with template {template_name}")
             except Exception as e:
@@ -174,11 +169,10 @@ class ContractGenerateView(APIView):
                     'data_items': contract.data.items(),
                     'data': contract.data,
                     'created_at': contract.created_at,
-                    'signatures': contract.signatures.all(),
-                    'signatures_block': ''
+                    'signatures_block': SIGNATURE_SLOT
                 }
                 contract.text_version = render_to_string(template_name, context)
-                contract.full_text = contract.text_version
+                contract.body_html = contract.text_version
                 contract.status = 'DRAFT'
                 contract.save()
                 logger.info(f"Contract {contract.id} generated with template {template_name}")
@@ -213,7 +207,7 @@ class ContractEnhanceView(APIView):
                                 status=status.HTTP_400_BAD_REQUEST)
             
             contract = Contract.objects.get(id=id)
-            if not contract.full_text:
+            if not contract.body_html:
                 return Response({'error': 'Contract has no full text to enhance'}, 
                                 status=status.HTTP_400_BAD_REQUEST)
             
@@ -233,8 +227,8 @@ class ContractEnhanceView(APIView):
                 )
             
             try:
-                enhanced_html = async_to_sync(generate_html_for_contract)(
-                    contract.full_text,
+                enhanced_html = generate_html_for_contract(
+                    contract.body_html,
                     contract.data,
                     additional_instruction=prompt_instruction
                 )
@@ -254,7 +248,7 @@ class ContractEnhanceView(APIView):
             try:
                 html_cleaned = contract.text_version.strip().lower()
                 if html_cleaned.startswith('<!doctype html') and html_cleaned.endswith('</html>'):
-                    contract.full_text = contract.text_version
+                    contract.body_html = contract.text_version
                     logger.info(f"AI HTML used directly for contract {contract.id}")
                 else:
                     template_name = 'nda.html' if contract.contract_type == 'NDA' else 'contract_template.html'
@@ -263,11 +257,10 @@ class ContractEnhanceView(APIView):
                         'data_items': contract.data.items(),
                         'data': contract.data,
                         'created_at': contract.created_at,
-                        'signatures': contract.signatures.all(),
                         'gpt_html': contract.text_version,
-                        'signatures_block': ''
+                        'signatures_block': SIGNATURE_SLOT
                     }
-                    contract.full_text = render_to_string(template_name, context)
+                    contract.body_html = render_to_string(template_name, context)
                     logger.warning(f"Fallback template rendering used for contract {contract.id}")
                 
                 contract.save()
@@ -399,20 +392,8 @@ class ContractSignView(APIView):
             try:
                 logger.debug(f"Creating contract metadata for contract {id}")
                 print(f"DEBUG: Generating contract metadata for contract {id}")
-                contract_metadata = {
-                    'id': contract.id,
-                    'contract_type': contract.contract_type,
-                    'status': contract.status,
-                    'data': sort_dict_recursive(contract.data),
-                    'needs_review': contract.needs_review,
-                    'is_locked': contract.is_locked
-                }
-                contract_metadata_str = json.dumps(contract_metadata, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
-                logger.debug(f"Backend contract_metadata_str: {contract_metadata_str}")
-                print(f"DEBUG: Contract metadata string: {contract_metadata_str}")
-                contract_hash = hashlib.sha256(contract_metadata_str.encode('utf-8')).digest()
-                logger.debug(f"Backend contract_hash: {contract_hash.hex()}")
-                print(f"DEBUG: Contract hash: {contract_hash.hex()}")
+                contract_hash = compute_contract_hash(contract)
+                logger.debug(f"Backend contract_hash: {contract_hash}")
             except (TypeError, ValueError) as e:
                 logger.error(f"Error creating contract metadata for contract {id}: {str(e)}")
                 print(f"ERROR: Failed to create contract metadata for {id}: {str(e)}")
@@ -423,25 +404,9 @@ class ContractSignView(APIView):
             
             # Cryptographic verification
             try:
-                logger.debug(f"Attempting to load public key for contract {id}")
-                print(f"DEBUG: Loading public key for contract {id}")
-                public_key = serialization.load_pem_public_key(
-                    public_key_pem.encode('utf-8'),
-                    backend=default_backend()
-                )
-                logger.debug(f"Successfully loaded public key for contract {id}")
-                print(f"DEBUG: Public key loaded for contract {id}")
                 logger.debug(f"Verifying signature for contract {id} with signature_hash: {signature_hash}")
                 print(f"DEBUG: Verifying signature for contract {id}, hash: {signature_hash}")
-                public_key.verify(
-                    base64.b64decode(signature_hash),
-                    contract_hash,
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=32
-                    ),
-                    hashes.SHA256()
-                )
+                verify_signature(public_key_pem, signature_hash, contract_hash)
                 logger.debug(f"Signature verification successful for contract {id}")
                 print(f"DEBUG: Signature verified successfully for contract {id}")
             except InvalidSignature:
@@ -476,12 +441,15 @@ class ContractSignView(APIView):
                         user=request.user,
                         ip_address=request.META.get('REMOTE_ADDR'),
                         signature_hash=signature_hash,
-                        public_key=public_key_pem
+                        public_key=public_key_pem,
+                        verified_hash=contract_hash,
+                        is_verified=True,
+                        signer_name=request.user.fullname
                     )
                     logger.debug(f"Signature created with ID: {signature.id}")
                     print(f"DEBUG: Signature created with ID: {signature.id}")
                     
-                    # Generate QR code
+                    # Generate QR code; the signature block is composed into full_text at render time
                     try:
                         verify_url = request.build_absolute_uri(f'/verify/{signature.id}/')
                         logger.debug(f"Generated verify URL: {verify_url}")
@@ -492,89 +460,13 @@ class ContractSignView(APIView):
                         qr_img = qr.make_image(fill_color="black", back_color="white")
                         qr_buffer = BytesIO()
                         qr_img.save(qr_buffer, format="PNG")
-                        qr_code_b64 = base64.b64encode(qr_buffer.getvalue()).decode('utf-8')
+                        signature.qr_code = base64.b64encode(qr_buffer.getvalue()).decode('utf-8')
+                        Signature.objects.filter(pk=signature.pk).update(qr_code=signature.qr_code)
                         logger.debug(f"QR code generated for contract {id}")
                         print(f"DEBUG: QR code generated for contract {id}")
                     except Exception as e:
                         logger.error(f"Error generating QR code for contract {id}: {str(e)}")
                         print(f"ERROR: Failed to generate QR code for contract {id}: {str(e)}")
-                        qr_code_b64 = None
-                    
-                    # Render signature block
-                    logger.debug(f"Rendering signature block for contract {id}")
-                    print(f"DEBUG: Rendering signature block for contract {id}")
-                    signature_block = f"""
-                        <div class="signature-entry">
-                            <p>Signed by: {request.user.fullname}</p>
-                            <p>Date: {signature.signed_at}</p>
-                            {f'<img src="data:image/png;base64,{qr_code_b64}" alt="Signature QR Code" width="100" height="100">' if qr_code_b64 else ''}
-                        </div>
-                    """
-                    logger.debug(f"Signature block rendered successfully for contract {id}")
-                    print(f"DEBUG: Signature block rendered for contract {id}")
-                    
-                    # Update contract full_text
-                    logger.debug(f"Updating contract full_text for contract {id}")
-                    print(f"DEBUG: Updating contract full_text for contract {id}")
-                    container_start = contract.full_text.find('<div class="container">')
-                    container_end = contract.full_text.rfind('</div>', container_start)  # Closing </div> of container
-                    if container_start == -1 or container_end == -1:
-                        logger.error(f"Invalid HTML structure: no container div found in contract {id}")
-                        print(f"ERROR: No container div found in contract {id}")
-                        return Response(
-                            {'error': 'Invalid HTML structure: no container div found'},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                        )
-                    
-                    signature_section = '<div class="signature-section">'
-                    if signature_section in contract.full_text:
-                        print("DEBUG: Signature section found")
-                        # Find section-content within signature-section
-                        section_content_start = contract.full_text.find('<div class="section-content">', contract.full_text.find(signature_section))
-                        section_content_end = contract.full_text.find('</div>', section_content_start) + 6
-                        if section_content_start == -1 or section_content_end == -1:
-                            logger.error(f"Invalid HTML structure in signature section for contract {id}")
-                            print(f"ERROR: Invalid HTML structure in signature section for contract {id}")
-                            return Response(
-                                {'error': 'Invalid HTML structure: no section-content found in signature section'},
-                                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                            )
-                        # Check if section-content contains any signature-entry
-                        section_content = contract.full_text[section_content_start:section_content_end]
-                        if '<div class="signature-entry">' in section_content:
-                            # Append new signature-entry before closing </div> of signature-section
-                            signature_section_end = contract.full_text.rfind('</div>', contract.full_text.find(signature_section))
-                            contract.full_text = (
-                                contract.full_text[:signature_section_end] +
-                                signature_block +
-                                contract.full_text[signature_section_end:]
-                            )
-                            logger.debug(f"Appended signature-entry to existing signature-section for contract {id}")
-                            print(f"DEBUG: Appended signature-entry to existing signature-section for contract {id}")
-                        else:
-                            # Replace section-content with signature-entry for first signature
-                            contract.full_text = (
-                                contract.full_text[:section_content_start] +
-                                signature_block +
-                                contract.full_text[section_content_end:]
-                            )
-                            logger.debug(f"Replaced section-content with signature-entry for contract {id}")
-                            print(f"DEBUG: Replaced section-content with signature-entry for contract {id}")
-                    else:
-                        # Add new signature-section before closing </div> of container
-                        new_signature_section = f"""
-                            <div class="signature-section">
-                                <h3 class="section-title">التوقيع والتاريخ - <span class="english">SIGNATURE AND DATE</span></h3>
-                                {signature_block}
-                            </div>
-                        """
-                        contract.full_text = (
-                            contract.full_text[:container_end] +
-                            new_signature_section +
-                            contract.full_text[container_end:]
-                        )
-                        logger.debug(f"Created new signature-section with signature-entry inside container for contract {id}")
-                        print(f"DEBUG: Created new signature-section with signature-entry inside container for contract {id}")
                     
                     # Update contract status
                     try:
@@ -593,7 +485,8 @@ class ContractSignView(APIView):
                             contract.is_locked = True
                             logger.debug(f"Contract {id} status set to COMPLETED, locked: {contract.is_locked}")
                             print(f"DEBUG: Contract {id} status set to COMPLETED, locked: {contract.is_locked}")
-                        contract.save()
+                        # The body is untouched by signing, so only the small columns are written
+                        contract.save(update_fields=['status', 'is_locked', 'updated_at'])
                         logger.debug(f"Contract {id} saved with updated status: {contract.status}")
                         print(f"DEBUG: Contract {id} saved with status: {contract.status}")
                     except Exception as e:
@@ -666,51 +559,20 @@ class SignatureVerifyView(APIView):
     
     def get(self, request, signature_id):
         try:
-            signature = Signature.objects.get(id=signature_id)
+            signature = Signature.objects.select_related('contract', 'user').get(id=signature_id)
             contract = signature.contract
             
-            contract_metadata = {
-                'id': contract.id,
-                'contract_type': contract.contract_type,
-                'status': contract.status,
-                'data': sort_dict_recursive(contract.data),
-                'needs_review': contract.needs_review,
-                'is_locked': contract.is_locked
-            }
-            contract_metadata_str = json.dumps(contract_metadata, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
-            contract_hash = hashlib.sha256(contract_metadata_str.encode('utf-8')).digest()
-            
-            try:
-                public_key = serialization.load_pem_public_key(
-                    signature.public_key.encode('utf-8'),
-                    backend=default_backend()
-                )
-                public_key.verify(
-                    base64.b64decode(signature.signature_hash),
-                    contract_hash,
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=32
-                    ),
-                    hashes.SHA256()
-                )
+            if get_verification_status(signature, contract) == 'valid':
                 return Response({
                     'status': 'valid',
                     'message': f'Signature {signature.id} is valid for contract {contract.id}',
                     'signed_by':  signature.user.fullname,
                     'signed_at': signature.signed_at
                 }, status=status.HTTP_200_OK)
-            except InvalidSignature:
-                return Response({
-                    'status': 'invalid',
-                    'message': f'Signature verification failed for contract {contract.id}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            except Exception as e:
-                logger.error(f"Signature verification error for signature {signature_id}: {str(e)}")
-                return Response({
-                    'status': 'invalid',
-                    'message': f'Signature verification failed: {str(e)}'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'status': 'invalid',
+                'message': f'Signature verification failed for contract {contract.id}'
+            }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Signature.DoesNotExist:
             return Response({'error': 'Signature not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -724,44 +586,11 @@ class ContractSignaturesView(APIView):
     def get(self, request, contract_id):
         try:
             contract = Contract.objects.get(id=contract_id)
-            
             signatures = contract.signatures.all()
-            signature_data = []
-            
-            contract_metadata = {
-                'id': contract.id,
-                'contract_type': contract.contract_type,
-                'status': contract.status,
-                'data': sort_dict_recursive(contract.data),
-                'needs_review': contract.needs_review,
-                'is_locked': contract.is_locked
-            }
-            contract_metadata_str = json.dumps(contract_metadata, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
-            contract_hash = hashlib.sha256(contract_metadata_str.encode('utf-8')).digest()
-            
-            for signature in signatures:
-                try:
-                    public_key = serialization.load_pem_public_key(
-                        signature.public_key.encode('utf-8'),
-                        backend=default_backend()
-                    )
-                    public_key.verify(
-                        base64.b64decode(signature.signature_hash),
-                        contract_hash,
-                        padding.PSS(
-                            mgf=padding.MGF1(hashes.SHA256()),
-                            salt_length=32
-                        ),
-                        hashes.SHA256()
-                    )
-                    verification_status = 'valid'
-                except Exception:
-                    verification_status = 'invalid'
-                
-                signature_serializer = SignatureSerializer(signature).data
-                signature_serializer['verification_status'] = verification_status
-                signature_data.append(signature_serializer)
             
+            # verification_status is served from the per-signature cache and
+            # only recomputed for signatures checked against an older contract hash.
+            signature_data = SignatureSerializer(signatures, many=True, context={'contract': contract}).data
             return Response(signature_data, status=status.HTTP_200_OK)
         except Contract.DoesNotExist:
             return Response({'error': 'Contract not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -814,361 +643,157 @@ class ContractAnalyticsView(APIView):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-from weasyprint.text.fonts import FontConfiguration
-from weasyprint import HTML, CSS
-import os
-from django.conf import settings
 class ContractExportView(APIView):
     permission_classes = [ContractPermissions]
-    
+
     def post(self, request, id):
+        """Queue an export job, or return the stored file if this exact content was already rendered.
+
+        ``format`` is ``pdf`` (default) or ``docx``. ``mode=incremental``
+        appends a signature appendix to the stored body PDF; once the body
+        has been rendered this is done inline.
+        """
         try:
             logger.debug(f"Starting PDF export process for contract ID: {id}, user: {request.user.id}")
-            print(f"DEBUG: Initiating PDF export for contract ID: {id}, user: {request.user.id}")
-            
+
             # Validate contract ID
             if not isinstance(id, int) and not str(id).isdigit():
                 logger.error(f"Invalid contract ID format: {id}")
-                print(f"ERROR: Invalid contract ID format: {id}")
                 return Response(
                     {'error': 'Invalid contract ID format'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             # Get contract
             try:
-                logger.debug(f"Fetching contract with ID: {id}")
-                print(f"DEBUG: Attempting to fetch contract ID: {id}")
                 contract = Contract.objects.get(id=id)
-                logger.debug(f"Successfully fetched contract: ID={contract.id}, type={contract.contract_type}, status={contract.status}")
-                print(f"DEBUG: Contract fetched: ID={contract.id}, type={contract.contract_type}, status={contract.status}")
             except Contract.DoesNotExist:
                 logger.error(f"Contract not found: {id}")
-                print(f"ERROR: Contract not found: {id}")
                 return Response(
                     {'error': 'Contract not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
-            # Prepare HTML content
+            self.check_object_permissions(request, contract)
+
             html_content = contract.full_text
             if not html_content:
                 logger.error(f"Contract {id} has no HTML content")
-                print(f"ERROR: Contract {id} has no HTML content")
                 return Response(
                     {'error': 'Contract has no content to export'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            # SOLUTION 1: Use absolute file paths for fonts
-            font_config = FontConfiguration()
-            
-            # Define font paths - adjust these paths to match your actual font locations
-            font_base_path = os.path.join(settings.BASE_DIR, 'static', 'fonts')
-            amiri_regular_path = os.path.join(font_base_path, 'amiri-regular.ttf')
-            amiri_bold_path = os.path.join(font_base_path, 'amiri-bold.ttf')
-            inter_regular_path = os.path.join(font_base_path, 'inter-regular.ttf')
-            inter_bold_path = os.path.join(font_base_path, 'inter-bold.ttf')
-            
-            # Check if fonts exist and provide fallback
-            fonts_available = all(os.path.exists(path) for path in [
-                amiri_regular_path, amiri_bold_path, inter_regular_path, inter_bold_path
-            ])
-            
-            if fonts_available:
-                # Use custom fonts with absolute paths
-                css_content = f"""
-                    @page {{
-                        size: A4;
-                        margin: 3mm;
-                    }}
-                    @font-face {{
-                        font-family: 'Amiri';
-                        src: url('file://{amiri_regular_path}') format('truetype');
-                        font-weight: normal;
-                        font-style: normal;
-                    }}
-                    @font-face {{
-                        font-family: 'Amiri';
-                        src: url('file://{amiri_bold_path}') format('truetype');
-                        font-weight: bold;
-                        font-style: normal;
-                    }}
-                    @font-face {{
-                        font-family: 'Inter';
-                        src: url('file://{inter_regular_path}') format('truetype');
-                        font-weight: normal;
-                        font-style: normal;
-                    }}
-                    @font-face {{
-                        font-family: 'Inter';
-                        src: url('file://{inter_bold_path}') format('truetype');
-                        font-weight: bold;
-                        font-style: normal;
-                    }}
-                    * {{
-                        box-sizing: border-box;
-                        margin: 0;
-                        padding: 0;
-                    }}
-                    html {{
-                        font-family: 'Amiri', 'Inter', Arial, sans-serif;
-                        font-size: 9pt;
-                    }}
-                    body {{
-                        font-family: 'Amiri', 'Inter', Arial, sans-serif;
-                        background: white;
-                        padding: 3mm;
-                        direction: rtl;
-                        text-align: right;
-                        color: #000;
-                        line-height: 1.2;
-                    }}
-                    .container {{
-                        max-width: 204mm;
-                        margin: 0 auto;
-                        background: white;
-                        border: 1px solid #000;
-                        padding: 8mm;
-                    }}
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 8mm;
-                        padding-bottom: 3mm;
-                        border-bottom: 1px solid #000;
-                        break-inside: avoid;
-                    }}
-                    .header h1 {{
-                        font-family: 'Amiri', Arial, sans-serif;
-                        font-size: 14pt;
-                        font-weight: bold;
-                        color: #000;
-                        margin-bottom: 2mm;
-                        text-transform: uppercase;
-                    }}
-                    .header .english {{
-                        font-family: 'Inter', Arial, sans-serif;
-                        font-size: 10pt;
-                        font-weight: normal;
-                        color: #333;
-                        font-style: italic;
-                    }}
-                    .section {{
-                        margin-bottom: 3mm;
-                        break-inside: avoid;
-                    }}
-                    .section-title {{
-                        font-family: 'Amiri', Arial, sans-serif;
-                        font-size: 10pt;
-                        font-weight: bold;
-                        color: #000;
-                        margin-bottom: 2mm;
-                        text-decoration: underline;
-                        text-align: right;
-                    }}
-                    .section-title .english {{
-                        font-family: 'Inter', Arial, sans-serif;
-                        font-style: italic;
-                        font-weight: normal;
-                        color: #666;
-                    }}
-                    .section-content {{
-                        font-family: 'Amiri', Arial, sans-serif;
-                        color: #000;
-                        font-size: 8pt;
-                        text-align: justify;
-                        margin-right: 3mm;
-                    }}
-                    .section-content p {{
-                        margin-bottom: 2mm;
-                    }}
-                    .form-field {{
-                        display: inline-block;
-                        border-bottom: 1px solid #000;
-                        min-width: 50mm;
-                        padding: 0.5mm 1mm;
-                        margin: 0 0.5mm;
-                        font-weight: bold;
-                    }}
-                    .signature-section {{
-                        margin-top: 5mm;
-                        padding-top: 3mm;
-                        border-top: 1px solid #000;
-                        break-inside: avoid;
-                    }}
-                    .signature-entry {{
-                        margin-bottom: 3mm;
-                    }}
-                    .signature-entry p {{
-                        font-family: 'Inter', Arial, sans-serif;
-                        margin-bottom: 1mm;
-                        font-size: 8pt;
-                    }}
-                    .signature-entry img {{
-                        margin-top: 1mm;
-                        width: 15mm;
-                        height: 15mm;
-                    }}
-                """
-                logger.debug(f"Using custom fonts for contract {id}")
-                print(f"DEBUG: Using custom fonts for contract {id}")
-            else:
-                # Fallback to system fonts only
-                css_content = """
-                    @page {
-                        size: A4;
-                        margin: 3mm;
-                    }
-                    * {
-                        box-sizing: border-box;
-                        margin: 0;
-                        padding: 0;
-                    }
-                    html {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        font-size: 9pt;
-                    }
-                    body {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        background: white;
-                        padding: 3mm;
-                        direction: rtl;
-                        text-align: right;
-                        color: #000;
-                        line-height: 1.2;
-                    }
-                    .container {
-                        max-width: 204mm;
-                        margin: 0 auto;
-                        background: white;
-                        border: 1px solid #000;
-                        padding: 8mm;
-                    }
-                    .header {
-                        text-align: center;
-                        margin-bottom: 8mm;
-                        padding-bottom: 3mm;
-                        border-bottom: 1px solid #000;
-                        break-inside: avoid;
-                    }
-                    .header h1 {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        font-size: 14pt;
-                        font-weight: bold;
-                        color: #000;
-                        margin-bottom: 2mm;
-                        text-transform: uppercase;
-                    }
-                    .header .english {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        font-size: 10pt;
-                        font-weight: normal;
-                        color: #333;
-                        font-style: italic;
-                    }
-                    .section {
-                        margin-bottom: 3mm;
-                        break-inside: avoid;
-                    }
-                    .section-title {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        font-size: 10pt;
-                        font-weight: bold;
-                        color: #000;
-                        margin-bottom: 2mm;
-                        text-decoration: underline;
-                        text-align: right;
-                    }
-                    .section-title .english {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        font-style: italic;
-                        font-weight: normal;
-                        color: #666;
-                    }
-                    .section-content {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        color: #000;
-                        font-size: 8pt;
-                        text-align: justify;
-                        margin-right: 3mm;
-                    }
-                    .section-content p {
-                        margin-bottom: 2mm;
-                    }
-                    .form-field {
-                        display: inline-block;
-                        border-bottom: 1px solid #000;
-                        min-width: 50mm;
-                        padding: 0.5mm 1mm;
-                        margin: 0 0.5mm;
-                        font-weight: bold;
-                    }
-                    .signature-section {
-                        margin-top: 5mm;
-                        padding-top: 3mm;
-                        border-top: 1px solid #000;
-                        break-inside: avoid;
-                    }
-                    .signature-entry {
-                        margin-bottom: 3mm;
-                    }
-                    .signature-entry p {
-                        font-family: Arial, 'Times New Roman', sans-serif;
-                        margin-bottom: 1mm;
-                        font-size: 8pt;
-                    }
-                    .signature-entry img {
-                        margin-top: 1mm;
-                        width: 15mm;
-                        height: 15mm;
-                    }
-                """
-                logger.warning(f"Font files not found, using system fonts for contract {id}")
-                print(f"WARNING: Font files not found, using system fonts for contract {id}")
-            
-            try:
-                logger.debug(f"Generating PDF for contract {id}")
-                print(f"DEBUG: Generating PDF for contract {id}")
-                
-                # Generate PDF using weasyprint
-                html = HTML(string=html_content)
-                css = CSS(string=css_content, font_config=font_config)
-                pdf_buffer = html.write_pdf(stylesheets=[css], font_config=font_config)
-                
-                # Prepare HTTP response
-                response = HttpResponse(
-                    content_type='application/pdf',
-                    content=pdf_buffer
+
+            mode = request.data.get('mode') or request.query_params.get('mode') \
+                or getattr(settings, 'CONTRACT_EXPORT_DEFAULT_MODE', 'full')
+            if mode not in dict(ContractExport.MODE_CHOICES):
+                return Response(
+                    {'error': 'Invalid export mode'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-                response['Content-Disposition'] = f'attachment; filename="contract_{id}.pdf"'
-                
-                # Update contract status
-                try:
-                    contract.status = 'EXPORTED'
-                    contract.save()
-                    logger.debug(f"Contract {id} status updated to EXPORTED")
-                    print(f"DEBUG: Contract {id} status updated to EXPORTED")
-                except Exception as e:
-                    logger.error(f"Error updating contract status for contract {id}: {str(e)}")
-                    print(f"ERROR: Failed to update contract status for contract {id}: {str(e)}")
-                    # Don't return error here, PDF generation was successful
-                
-                logger.info(f"Successfully generated PDF for contract {id}")
-                print(f"INFO: PDF generated successfully for contract {id}")
-                return response
-                
-            except Exception as e:
-                logger.error(f"Error generating PDF for contract {id}: {str(e)}")
-                print(f"ERROR: Failed to generate PDF for contract {id}: {str(e)}")
+
+            export_format = request.data.get('format') or request.query_params.get('format') or 'pdf'
+            if export_format not in dict(ContractExport.FORMAT_CHOICES):
                 return Response(
-                    {'error': f'Failed to generate PDF: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    {'error': 'Invalid export format'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-                
+            if export_format == 'docx' and mode == 'incremental':
+                return Response(
+                    {'error': 'Incremental exports are only available as PDF'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            signatures = get_signatures(contract) if mode == 'incremental' else None
+            content_hash = content_hash_for(contract, mode, signatures, export_format)
+            cached = ContractExport.objects.filter(
+                content_hash=content_hash, format=export_format, status='COMPLETED'
+            ).exclude(file='').exclude(file__isnull=True).first()
+
+            if cached:
+                export = ContractExport.objects.create(
+                    contract=contract,
+                    requested_by=request.user,
+                    status='COMPLETED',
+                    mode=mode,
+                    format=export_format,
+                    content_hash=content_hash,
+                    file=cached.file.name,
+                    completed_at=timezone.now()
+                )
+                contract.status = 'EXPORTED'
+                contract.save(update_fields=['status', 'updated_at'])
+                logger.info(f"Contract {id} export served from cached artifact {cached.id}")
+                return Response(ContractExportSerializer(export).data, status=status.HTTP_200_OK)
+
+            if mode == 'incremental' and has_body_pdf(contract):
+                # Only the signature appendix is drawn; no need to go through the queue.
+                export = ContractExport(
+                    contract=contract,
+                    requested_by=request.user,
+                    status='COMPLETED',
+                    mode=mode,
+                    content_hash=content_hash,
+                    completed_at=timezone.now()
+                )
+                pdf_bytes = render_incremental_pdf(contract, signatures)
+                export.file.save(f"{content_hash}.pdf", ContentFile(pdf_bytes), save=False)
+                export.save()
+                contract.status = 'EXPORTED'
+                contract.save(update_fields=['status', 'updated_at'])
+                logger.info(f"Contract {id} exported incrementally as job {export.id}")
+                return Response(ContractExportSerializer(export).data, status=status.HTTP_200_OK)
+
+            export = ContractExport.objects.create(
+                contract=contract,
+                requested_by=request.user,
+                mode=mode,
+                format=export_format,
+                content_hash=content_hash
+            )
+            transaction.on_commit(lambda: export_contract_pdf.delay(export.id))
+            logger.info(f"Contract {id} export queued as job {export.id}")
+            return Response(ContractExportSerializer(export).data, status=status.HTTP_202_ACCEPTED)
+
+        except PermissionDenied:
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error in PDF export for contract {id}: {str(e)}")
-            print(f"ERROR: Unexpected error during PDF export for contract {id}: {str(e)}")
+            logger.error(f"Unexpected error in export for contract {id}: {str(e)}")
             return Response(
                 {'error': 'An unexpected error occurred'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class ContractExportDetailView(APIView):
+    permission_classes = [ContractPermissions]
+
+    def get(self, request, export_id):
+        try:
+            export = ContractExport.objects.select_related('contract').get(id=export_id)
+        except ContractExport.DoesNotExist:
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+        self.check_object_permissions(request, export.contract)
+        return Response(ContractExportSerializer(export).data, status=status.HTTP_200_OK)
+
+
+class ContractExportDownloadView(APIView):
+    permission_classes = [ContractPermissions]
+
+    def get(self, request, export_id):
+        try:
+            export = ContractExport.objects.select_related('contract').get(id=export_id)
+        except ContractExport.DoesNotExist:
+            return Response({'error': 'Export not found'}, status=status.HTTP_404_NOT_FOUND)
+        self.check_object_permissions(request, export.contract)
+
+        if export.status != 'COMPLETED' or not export.file:
+            return Response(
+                {'error': f'Export is not ready (status: {export.status})'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            export.file.open('rb'),
+            as_attachment=True,
+            filename=f"contract_{export.contract_id}.{export.format}",
+            content_type=EXPORT_CONTENT_TYPES[export.format]
+        )
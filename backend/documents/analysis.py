@@ -0,0 +1,84 @@
+import logging
+
+from ai_assistant.llm_cache import get_cached_response, make_cache_key, set_cached_response
+from elshawi_backend.llm_gateway import chat_completion_sync
+
+logger = logging.getLogger(__name__)
+
+# The one definition of the legal analysis prompt, shared by the analysis job
+# and the streaming AI assistant so both read and fill the same cache entries.
+ANALYSIS_MODEL = "qwen/qwen3-14b:free"
+ANALYSIS_PROMPT_VERSION = 1  # bump when the analysis prompt changes to invalidate cached results
+ANALYSIS_CACHE_NAMESPACE = 'document_analysis'
+ANALYSIS_REQUEST_OPTIONS = {
+    'extra_headers': {
+        "HTTP-Referer": "https://your-site-url.com",  # Replace with your site URL
+        "X-Title": "Legal Document Analyzer",  # Replace with your site title
+    },
+    'extra_body': {},
+}
+
+
+def analysis_messages(document_text):
+    return [
+        {
+            "role": "system",
+            "content": "أنت مستشار قانوني محترف، ومصمم محتوى مبدع في تقديم التحليلات القانونية بطريقة بصرية جذابة باستخدام Markdown. استعمل عناوين كبيرة (h1)، فرعية (h2، h3)، ونسق المحتوى باستخدام **bold**، *italic*، و`اقتباسات`. استعمل الرموز التعبيرية حسب السياق القانوني إن أمكن. يجب أن يكون النص منسقًا بدقة ليسهل قراءته ونسخه، وبلغة عربية فصحى احترافية. لا تخرج عن إطار القانون، ولا تتحدث عن نفسك."
+        },
+        {
+            "role": "user",
+            "content": f"""
+يرجى تحليل الوثيقة التالية بدقة واحترافية، مستخدمًا تنسيق **Markdown كامل**، يتضمن:
+
+# ✅ ملخص عام للوثيقة:
+- ما طبيعة الوثيقة؟ (عقد، مذكرة، حكم...)
+- من هم الأطراف الأساسية؟
+- ما الهدف منها؟
+
+## ⚖️ البنود القانونية الجوهرية:
+- أهم البنود القانونية الواردة؟
+- هل توجد شروط غامضة أو تحتاج تفسيرًا؟
+- هل وردت إشارات إلى قوانين معينة أو مواد نظامية؟
+
+## ❗ المخاطر أو الثغرات القانونية:
+- هل هناك بنود قد تُستخدم ضد أحد الأطراف؟
+- هل يوجد غموض قانوني قد يسبب نزاعًا؟
+
+## 🛡️ التوصيات القانونية:
+- هل تُنصح بصياغة بديلة لبعض البنود؟
+- ما الإجراءات الاحتياطية القانونية المقترحة؟
+
+---
+
+### 📄 الوثيقة الكاملة:
+
+> ```
+{document_text}
+> ```
+
+📌 **ملحوظة**: اجعل كل قسم واضحًا بعنوان بارز، ونسّق الفقرات داخل كل محور لجعل التجربة بصرية رائعة وسهلة الفهم.
+"""
+        }
+    ]
+
+
+def analysis_cache_key(document_text):
+    return make_cache_key(ANALYSIS_CACHE_NAMESPACE, ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION, document_text)
+
+
+def analyze_document_text(document_text):
+    """Run the legal analysis prompt over a document's text, reusing cached results."""
+    cache_key = analysis_cache_key(document_text)
+    analysis_text = get_cached_response(cache_key)
+    if analysis_text is None:
+        # Perform analysis using OpenRouter
+        completion = chat_completion_sync(
+            model=ANALYSIS_MODEL,
+            messages=analysis_messages(document_text),
+            **ANALYSIS_REQUEST_OPTIONS
+        )
+
+        # Extract analysis text from the response
+        analysis_text = completion.choices[0].message.content
+        set_cached_response(cache_key, ANALYSIS_CACHE_NAMESPACE, analysis_text)
+    return analysis_text
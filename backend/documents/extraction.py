@@ -0,0 +1,158 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from docx import Document as DocxDocument
+
+from .models import DocumentPassage, DocumentText
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_pdf_page_range(file_path, start, stop):
+    """Worker entry point: extract the text of pages ``start:stop`` of a PDF."""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+def extract_text_from_pdf(file_path):
+    """Return the text of each page of a PDF, splitting large files across processes.
+
+    Daemonic processes (Celery prefork workers) cannot start children, so
+    they always extract inline.
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            page_count = len(PyPDF2.PdfReader(file).pages)
+
+        threshold = getattr(settings, 'DOCUMENT_EXTRACTION_PARALLEL_PAGES', 40)
+        workers = min(getattr(settings, 'DOCUMENT_EXTRACTION_WORKERS', None) or os.cpu_count() or 1, page_count)
+        if page_count < threshold or workers < 2 or multiprocessing.current_process().daemon:
+            return _extract_pdf_page_range(file_path, 0, page_count)
+
+        step = -(-page_count // workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(_extract_pdf_page_range, file_path, start, stop) for start, stop in ranges]
+            return [page for future in futures for page in future.result()]
+    except Exception as e:
+        raise Exception(f"Error reading PDF: {str(e)}")
+
+
+def extract_text_from_docx(file_path):
+    try:
+        doc = DocxDocument(file_path)
+        return [''.join(f"{paragraph.text}\n" for paragraph in doc.paragraphs)]
+    except Exception as e:
+        raise Exception(f"Error reading DOCX: {str(e)}")
+
+
+def extract_text_from_txt(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return [file.read()]
+    except Exception as e:
+        raise Exception(f"Error reading TXT: {str(e)}")
+
+
+EXTRACTORS = {
+    '.pdf': extract_text_from_pdf,
+    '.docx': extract_text_from_docx,
+    '.txt': extract_text_from_txt,
+}
+
+
+def extract_pages(file_path):
+    """Extract a file's text as a list of pages (one entry for non-paginated formats)."""
+    extension = os.path.splitext(file_path)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise Exception(f"Unsupported file type: {extension}")
+    return extractor(file_path)
+
+
+def join_pages(pages):
+    """Concatenate pages in one pass and record where each page starts."""
+    offsets, position = [], 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page)
+    return ''.join(pages), offsets
+
+
+def split_passages(text, size=None, overlap=None):
+    """Split text into overlapping ``(start_offset, passage)`` windows, cutting at whitespace."""
+    size = size or getattr(settings, 'DOCUMENT_PASSAGE_CHARS', 1200)
+    overlap = getattr(settings, 'DOCUMENT_PASSAGE_OVERLAP', 200) if overlap is None else overlap
+
+    passages, start, length = [], 0, len(text)
+    while start < length:
+        end = min(start + size, length)
+        if end < length:
+            cut = max(text.rfind(' ', start + size // 2, end), text.rfind('\n', start + size // 2, end))
+            if cut > start:
+                end = cut
+        passage = text[start:end].strip()
+        if passage:
+            passages.append((start, passage))
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+    return passages
+
+
+def store_passages(document_text):
+    """Create the retrieval passages for extracted text if they do not exist yet."""
+    if DocumentPassage.objects.filter(file_hash=document_text.file_hash).exists():
+        return
+    DocumentPassage.objects.bulk_create(
+        [
+            DocumentPassage(
+                file_hash=document_text.file_hash,
+                position=position,
+                start_offset=start_offset,
+                text=passage
+            )
+            for position, (start_offset, passage) in enumerate(split_passages(document_text.text))
+        ],
+        ignore_conflicts=True
+    )
+
+
+def extract_document_text(document):
+    """Extract and persist the text of ``document``, once per file hash."""
+    existing = DocumentText.objects.filter(file_hash=document.file_hash).first()
+    if existing:
+        store_passages(existing)
+        return existing
+
+    text, page_offsets = join_pages(extract_pages(document.file.path))
+    try:
+        with transaction.atomic():
+            document_text = DocumentText.objects.create(
+                file_hash=document.file_hash,
+                text=text,
+                page_offsets=page_offsets
+            )
+    except IntegrityError:
+        # Another worker stored the same content first.
+        return DocumentText.objects.get(file_hash=document.file_hash)
+    store_passages(document_text)
+    return document_text
+
+
+def get_document_text(document):
+    """Return the document's text from the extraction cache, extracting it on a miss."""
+    if not document.file_hash:
+        return join_pages(extract_pages(document.file.path))[0]
+
+    cached = DocumentText.objects.filter(file_hash=document.file_hash).values_list('text', flat=True).first()
+    if cached is not None:
+        return cached
+    logger.info(f"Text cache miss for document {document.id}, extracting inline")
+    return extract_document_text(document).text
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-17 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_documenttext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentPassage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(db_index=True, max_length=64)),
+                ('position', models.PositiveIntegerField()),
+                ('start_offset', models.PositiveIntegerField()),
+                ('text', models.TextField()),
+            ],
+            options={
+                'ordering': ['file_hash', 'position'],
+                'unique_together': {('file_hash', 'position')},
+            },
+        ),
+    ]
@@ -37,5 +37,52 @@ class AIAnalysisResult(models.Model):
 
     def __str__(self):
         return f"Analysis for {self.document.title} at {self.created_at}"
-    
-    
\ No newline at end of file
+
+
+class DocumentAnalysisJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name='analysis_jobs')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='document_analysis_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    progress = models.PositiveSmallIntegerField(default=0)
+    result = models.ForeignKey(AIAnalysisResult, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Analysis job {self.id} for {self.document.title} ({self.status})"
+
+
+class DocumentText(models.Model):
+    """Text extracted from a document file, shared by every upload with the same file hash."""
+    file_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    page_offsets = models.JSONField(default=list, blank=True)  # start offset of each page in `text`
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Text for {self.file_hash[:12]}"
+
+
+class DocumentPassage(models.Model):
+    """Overlapping slice of a document's extracted text, used as retrieval context."""
+    file_hash = models.CharField(max_length=64, db_index=True)
+    position = models.PositiveIntegerField()
+    start_offset = models.PositiveIntegerField()
+    text = models.TextField()
+
+    class Meta:
+        ordering = ['file_hash', 'position']
+        unique_together = ('file_hash', 'position')
+
+    def __str__(self):
+        return f"Passage {self.position} of {self.file_hash[:12]}"
@@ -1,6 +1,6 @@
 # documents/serializers.py
 from rest_framework import serializers
-from .models import Document, AIAnalysisResult
+from .models import Document, AIAnalysisResult, DocumentAnalysisJob
 
 
 class AIAnalysisResultSerializer(serializers.ModelSerializer):
@@ -24,3 +24,12 @@ class DocumentSerializer(serializers.ModelSerializer):
         if sum(1 for source in sources if source) != 1:
             raise serializers.ValidationError("Exactly one of file, file_url, or file_path must be provided.")
         return data
+
+
+class DocumentAnalysisJobSerializer(serializers.ModelSerializer):
+    document_id = serializers.PrimaryKeyRelatedField(source='document', read_only=True)
+    result = AIAnalysisResultSerializer(read_only=True)
+
+    class Meta:
+        model = DocumentAnalysisJob
+        fields = ['id', 'document_id', 'status', 'progress', 'result', 'error', 'created_at', 'completed_at']
@@ -0,0 +1,89 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+from django.utils import timezone
+
+from .analysis import analyze_document_text
+from .extraction import extract_document_text, get_document_text
+from .models import AIAnalysisResult, Document, DocumentAnalysisJob
+from .serializers import DocumentAnalysisJobSerializer
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def extract_text_for_document(document_id):
+    """Extract and cache the text of an uploaded document."""
+    try:
+        document = Document.objects.get(id=document_id)
+    except Document.DoesNotExist:
+        return f"Document {document_id} not found"
+
+    if not document.file_hash or not document.file:
+        return f"Document {document_id} has no file to extract"
+
+    try:
+        document_text = extract_document_text(document)
+    except Exception as e:
+        logger.error(f"Error extracting text for document {document_id}: {str(e)}")
+        return f"Text extraction failed for document {document_id}"
+    return f"Document {document_id} extracted ({len(document_text.page_offsets)} pages)"
+
+
+def update_analysis_job(job, **fields):
+    """Save job state and push it to the requester's notification socket."""
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.save(update_fields=list(fields))
+
+    if not job.requested_by_id:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f'notifications_{job.requested_by_id}',
+            {
+                'type': 'send_notification',
+                'content': {
+                    'type': 'DOCUMENT_ANALYSIS_UPDATED',
+                    'job': DocumentAnalysisJobSerializer(job).data,
+                }
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Could not push analysis job {job.id} update: {str(e)}")
+
+
+@shared_task
+def analyze_document_job(job_id):
+    """Extract a document's text, run the AI analysis and store the AIAnalysisResult."""
+    try:
+        job = DocumentAnalysisJob.objects.select_related('document').get(id=job_id)
+    except DocumentAnalysisJob.DoesNotExist:
+        return f"Analysis job {job_id} not found"
+
+    if job.status in ('COMPLETED', 'FAILED'):
+        return f"Analysis job {job_id} already {job.status.lower()}"
+
+    document = job.document
+    try:
+        update_analysis_job(job, status='PROCESSING', progress=10)
+        document_text = get_document_text(document)
+
+        update_analysis_job(job, progress=40)
+        analysis_text = analyze_document_text(document_text)
+
+        result = AIAnalysisResult.objects.create(
+            document=document,
+            analysis_text=analysis_text,
+            # Confidence score is not provided by OpenRouter's response; using placeholder
+            confidence_score=0.95,
+            analysis_type='general'
+        )
+        update_analysis_job(job, status='COMPLETED', progress=100, result=result, completed_at=timezone.now())
+    except Exception as e:
+        logger.error(f"Error analyzing document {document.id} in job {job.id}: {str(e)}")
+        update_analysis_job(job, status='FAILED', error=f'Analysis failed: {str(e)}', completed_at=timezone.now())
+    return f"Analysis job {job.id} {job.status.lower()}"
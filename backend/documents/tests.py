@@ -1,3 +1,113 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import RoleModel, User
+from .extraction import extract_text_from_pdf
+from .models import Document, DocumentAnalysisJob
+from .tasks import analyze_document_job
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class DocumentAnalysisJobTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        role = RoleModel.objects.create(name='Client')
+        self.user = User.objects.create_user(email='client@example.com', password='pass', role=role)
+        self.document = Document.objects.create(
+            title='Lease', document_type='TXT', uploaded_by=self.user,
+            file=ContentFile('Lease agreement text'.encode('utf-8'), name='lease.txt')
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def analyze(self):
+        with mock.patch('documents.views.analyze_document_job') as task, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('document-analyze', args=[self.document.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task.delay.assert_called_once_with(response.data['id'])
+        return response.data
+
+    def get_job(self, job_id):
+        response = self.client.get(reverse('analysis-job-detail', args=[job_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    @mock.patch('documents.tasks.analyze_document_text', return_value='Analysis')
+    def test_job_completes_with_a_result(self, analyze_text):
+        job = self.analyze()
+        self.assertEqual(job['status'], 'PENDING')
+        self.assertIsNone(job['result'])
+
+        analyze_document_job(job['id'])
+        job = self.get_job(job['id'])
+        self.assertEqual(job['status'], 'COMPLETED')
+        self.assertEqual(job['progress'], 100)
+        self.assertEqual(job['result']['analysis_text'], 'Analysis')
+        analyze_text.assert_called_once_with('Lease agreement text')
+
+    @mock.patch('documents.tasks.analyze_document_text', side_effect=Exception('model unavailable'))
+    def test_failed_job_reports_the_error(self, analyze_text):
+        job = self.analyze()
+        analyze_document_job(job['id'])
+        job = self.get_job(job['id'])
+        self.assertEqual(job['status'], 'FAILED')
+        self.assertIn('model unavailable', job['error'])
+        self.assertIsNone(job['result'])
+
+    def test_jobs_are_only_visible_to_their_requester(self):
+        job = DocumentAnalysisJob.objects.create(document=self.document, requested_by=self.user)
+        other = User.objects.create_user(email='other@example.com', password='pass', role=self.user.role)
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('analysis-job-detail', args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PdfExtractionTests(SimpleTestCase):
+    PAGES = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from reportlab.pdfgen import canvas
+
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, 'pages.pdf')
+        pdf = canvas.Canvas(cls.path)
+        for page in range(cls.PAGES):
+            pdf.drawString(72, 720, f'Page {page}')
+            pdf.showPage()
+        pdf.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+        super().tearDownClass()
+
+    @override_settings(DOCUMENT_EXTRACTION_PARALLEL_PAGES=2, DOCUMENT_EXTRACTION_WORKERS=2)
+    def test_daemonic_process_extracts_large_pdfs_inline(self):
+        with mock.patch('documents.extraction.multiprocessing.current_process', return_value=SimpleNamespace(daemon=True)), \
+                mock.patch('documents.extraction.ProcessPoolExecutor') as pool:
+            pages = extract_text_from_pdf(self.path)
+        pool.assert_not_called()
+        self.assertEqual([page.strip() for page in pages], [f'Page {page}' for page in range(self.PAGES)])
+
+    @override_settings(DOCUMENT_EXTRACTION_PARALLEL_PAGES=2, DOCUMENT_EXTRACTION_WORKERS=2)
+    def test_large_pdfs_are_split_across_processes(self):
+        pages = extract_text_from_pdf(self.path)
+        self.assertEqual([page.strip() for page in pages], [f'Page {page}' for page in range(self.PAGES)])
 
-# Create your tests here.
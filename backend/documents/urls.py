@@ -6,5 +6,6 @@ urlpatterns = [
     path('<int:pk>/', views.DocumentDetailView.as_view(), name='document-detail'),
     path('<int:id>/analyze/', views.DocumentAnalyzeView.as_view(), name='document-analyze'),
     path('<int:id>/analyses/', views.DocumentAnalysisListView.as_view(), name='document-analyses'),
-    path('analyses/', views.AIAnalysisResultListView.as_view(), name='analysis-list')
+    path('analyses/', views.AIAnalysisResultListView.as_view(), name='analysis-list'),
+    path('analysis-jobs/<int:job_id>/', views.DocumentAnalysisJobDetailView.as_view(), name='analysis-job-detail'),
 ]
\ No newline at end of file
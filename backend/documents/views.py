@@ -1,13 +1,12 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Document, AIAnalysisResult
-from .serializers import DocumentSerializer, AIAnalysisResultSerializer
+from .models import Document, AIAnalysisResult, DocumentAnalysisJob
+from .serializers import DocumentSerializer, AIAnalysisResultSerializer, DocumentAnalysisJobSerializer
+from .tasks import analyze_document_job
+from django.db import transaction
 import hashlib
-from openai import OpenAI
 from django.conf import settings
-import PyPDF2
-from docx import Document as DocxDocument
 import os
 import requests
 from django.core.files.base import ContentFile
@@ -51,132 +50,26 @@ class DocumentDetailView(generics.RetrieveAPIView):
 class DocumentAnalyzeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def extract_text_from_pdf(self, file_path):
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ''
-                for page in pdf_reader.pages:
-                    text += page.extract_text() or ''
-                return text
-        except Exception as e:
-            raise Exception(f"Error reading PDF: {str(e)}")
-
-    def extract_text_from_docx(self, file_path):
-        try:
-            doc = DocxDocument(file_path)
-            text = ''
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + '\n'
-            return text
-        except Exception as e:
-            raise Exception(f"Error reading DOCX: {str(e)}")
-
-    def extract_text_from_txt(self, file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except Exception as e:
-            raise Exception(f"Error reading TXT: {str(e)}")
-
-    def get_file_content(self, document):
-        file_path = document.file.path
-        extension = os.path.splitext(file_path)[1].lower()
-
-        if extension == '.pdf':
-            return self.extract_text_from_pdf(file_path)
-        elif extension == '.docx':
-            return self.extract_text_from_docx(file_path)
-        elif extension == '.txt':
-            return self.extract_text_from_txt(file_path)
-        else:
-            raise Exception(f"Unsupported file type: {extension}")
-
     def post(self, request, id):
+        """Queue an analysis job and return its id; progress is pushed over the notifications socket."""
         try:
             document = Document.objects.get(id=id)
-            try:
-                # Extract text based on file type
-                document_text = self.get_file_content(document)
-
-                # Initialize OpenRouter client
-                client = OpenAI(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=settings.OPENROUTER_API_KEY,  # Ensure this is set in settings.py
-                )
-
-                # Perform analysis using OpenRouter
-                completion = client.chat.completions.create(
-                    extra_headers={
-                        "HTTP-Referer": "https://your-site-url.com",  # Replace with your site URL
-                        "X-Title": "Legal Document Analyzer",  # Replace with your site title
-                    },
-                    extra_body={},
-                    model="qwen/qwen3-14b:free",
-                    messages=[
-    {
-        "role": "system",
-        "content": "أنت مستشار قانوني محترف، ومصمم محتوى مبدع في تقديم التحليلات القانونية بطريقة بصرية جذابة باستخدام Markdown. استعمل عناوين كبيرة (h1)، فرعية (h2، h3)، ونسق المحتوى باستخدام **bold**، *italic*، و`اقتباسات`. استعمل الرموز التعبيرية حسب السياق القانوني إن أمكن. يجب أن يكون النص منسقًا بدقة ليسهل قراءته ونسخه، وبلغة عربية فصحى احترافية. لا تخرج عن إطار القانون، ولا تتحدث عن نفسك."
-    },
-    {
-        "role": "user",
-        "content": f"""
-يرجى تحليل الوثيقة التالية بدقة واحترافية، مستخدمًا تنسيق **Markdown كامل**، يتضمن:
-
-# ✅ ملخص عام للوثيقة:
-- ما طبيعة الوثيقة؟ (عقد، مذكرة، حكم...)
-- من هم الأطراف الأساسية؟
-- ما الهدف منها؟
-
-## ⚖️ البنود القانونية الجوهرية:
-- أهم البنود القانونية الواردة؟
-- هل توجد شروط غامضة أو تحتاج تفسيرًا؟
-- هل وردت إشارات إلى قوانين معينة أو مواد نظامية؟
-
-## ❗ المخاطر أو الثغرات القانونية:
-- هل هناك بنود قد تُستخدم ضد أحد الأطراف؟
-- هل يوجد غموض قانوني قد يسبب نزاعًا؟
-
-## 🛡️ التوصيات القانونية:
-- هل تُنصح بصياغة بديلة لبعض البنود؟
-- ما الإجراءات الاحتياطية القانونية المقترحة؟
-
----
-
-### 📄 الوثيقة الكاملة:
-
-> ```
-{document_text}
-> ```
-
-📌 **ملحوظة**: اجعل كل قسم واضحًا بعنوان بارز، ونسّق الفقرات داخل كل محور لجعل التجربة بصرية رائعة وسهلة الفهم.
-"""
-    }
-]
-
-
-
-                )
-
-                # Extract analysis text from the response
-                analysis_text = completion.choices[0].message.content
-                # Note: Confidence score is not provided by OpenRouter's response; using placeholder
-                confidence_score = 0.95  # Adjust based on your requirements or model output if available
-
-                # Save the analysis result
-                analysis = AIAnalysisResult.objects.create(
-                    document=document,
-                    analysis_text=analysis_text,
-                    confidence_score=confidence_score,
-                    analysis_type='general'
-                )
-                serializer = AIAnalysisResultSerializer(analysis)
-                return Response(serializer.data)
-            except Exception as e:
-                return Response({'error': f'Analysis failed: {str(e)}'}, status=400)
         except Document.DoesNotExist:
             return Response({'error': 'Document not found'}, status=404)
 
+        job = DocumentAnalysisJob.objects.create(document=document, requested_by=request.user)
+        transaction.on_commit(lambda: analyze_document_job.delay(job.id))
+        return Response(DocumentAnalysisJobSerializer(job).data, status=202)
+
+
+class DocumentAnalysisJobDetailView(generics.RetrieveAPIView):
+    serializer_class = DocumentAnalysisJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_url_kwarg = 'job_id'
+
+    def get_queryset(self):
+        return DocumentAnalysisJob.objects.filter(requested_by=self.request.user).select_related('result')
+
 class AIAnalysisResultListView(generics.ListAPIView):
     serializer_class = AIAnalysisResultSerializer
     permission_classes = [permissions.IsAuthenticated]
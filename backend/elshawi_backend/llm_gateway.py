@@ -0,0 +1,341 @@
+"""Process-wide gateway for every OpenRouter (OpenAI-compatible) call.
+
+All AI features go through this module so they share pooled, keep-alive
+(HTTP/2 when ``h2`` is installed) connections, a per-process concurrency
+limit and token-bucket rate limit, and one jittered retry policy. Latency,
+in-flight and queue-depth figures are recorded in ``elshawi_backend.metrics``.
+"""
+import asyncio
+import importlib.util
+import logging
+import random
+import threading
+import time
+import weakref
+
+import httpx
+import openai
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``reserve()`` takes a token and returns how long to wait for it."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class ConcurrencyLimiter:
+    """Process-wide cap on in-flight calls, usable from threads and from any event loop."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._active = 0
+        self._waiting = 0
+        self._condition = threading.Condition()
+
+    def _try_acquire(self):
+        with self._condition:
+            if self._active < self.limit:
+                self._active += 1
+                metrics.set_gauge('llm.in_flight', self._active)
+                return True
+            return False
+
+    def set_waiting(self, delta):
+        with self._condition:
+            self._waiting += delta
+            metrics.set_gauge('llm.queue_depth', self._waiting)
+
+    def acquire(self):
+        if self._try_acquire():
+            return
+        self.set_waiting(1)
+        try:
+            with self._condition:
+                while self._active >= self.limit:
+                    self._condition.wait()
+                self._active += 1
+                metrics.set_gauge('llm.in_flight', self._active)
+        finally:
+            self.set_waiting(-1)
+
+    async def acquire_async(self):
+        if self._try_acquire():
+            return
+        self.set_waiting(1)
+        try:
+            delay = 0.01
+            while not self._try_acquire():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.25)
+        finally:
+            self.set_waiting(-1)
+
+    def release(self):
+        with self._condition:
+            self._active -= 1
+            metrics.set_gauge('llm.in_flight', self._active)
+            self._condition.notify()
+
+
+class RetryBudget:
+    """Allow retries only while they stay a small fraction of recent traffic."""
+
+    def __init__(self, ratio, minimum):
+        self.ratio = ratio
+        self.maximum = max(minimum, 1)
+        self._balance = float(minimum)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.maximum, self._balance + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+_bucket = TokenBucket(_setting('LLM_RATE_LIMIT_PER_SECOND', 5), _setting('LLM_RATE_LIMIT_BURST', 10))
+_limiter = ConcurrencyLimiter(_setting('LLM_MAX_CONCURRENCY', 8))
+_retry_budget = RetryBudget(_setting('LLM_RETRY_BUDGET_RATIO', 0.2), _setting('LLM_RETRY_BUDGET_MIN', 10))
+
+_async_clients = weakref.WeakKeyDictionary()
+_sync_client = None
+_client_lock = threading.Lock()
+
+
+def _client_options():
+    return {
+        'limits': httpx.Limits(
+            max_connections=_setting('LLM_MAX_CONNECTIONS', 20),
+            max_keepalive_connections=_setting('LLM_MAX_KEEPALIVE_CONNECTIONS', 10),
+        ),
+        'timeout': httpx.Timeout(_setting('LLM_TIMEOUT', 120), connect=10),
+        'http2': HTTP2_AVAILABLE,
+    }
+
+
+def get_async_client():
+    """Return the AsyncOpenAI client bound to the running event loop.
+
+    httpx async pools cannot be shared across event loops, so there is one
+    client per loop (in practice one per ASGI worker). Sync code must use the
+    ``*_sync`` helpers instead of wrapping the async ones in async_to_sync:
+    each call would run on a new loop and leave an open client behind.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=settings.OPENROUTER_API_KEY,
+            http_client=httpx.AsyncClient(**_client_options()),
+            max_retries=0,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_sync_client():
+    """Return the process-wide blocking OpenAI client (views, Celery tasks)."""
+    global _sync_client
+    if _sync_client is None:
+        with _client_lock:
+            if _sync_client is None:
+                _sync_client = openai.OpenAI(
+                    base_url=OPENROUTER_BASE_URL,
+                    api_key=settings.OPENROUTER_API_KEY,
+                    http_client=httpx.Client(**_client_options()),
+                    max_retries=0,
+                )
+    return _sync_client
+
+
+async def _admit_async():
+    """Wait for a rate-limit token and a concurrency slot; both waits count as queued."""
+    wait = _bucket.reserve()
+    if wait:
+        _limiter.set_waiting(1)
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            _limiter.set_waiting(-1)
+    await _limiter.acquire_async()
+
+
+def _admit_sync():
+    wait = _bucket.reserve()
+    if wait:
+        _limiter.set_waiting(1)
+        try:
+            time.sleep(wait)
+        finally:
+            _limiter.set_waiting(-1)
+    _limiter.acquire()
+
+
+def _retry_delay(error, attempt):
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), _setting('LLM_RETRY_MAX_DELAY', 8))
+        except ValueError:
+            pass
+    cap = min(_setting('LLM_RETRY_MAX_DELAY', 8), _setting('LLM_RETRY_BASE_DELAY', 0.5) * 2 ** attempt)
+    return random.uniform(0, cap)  # full jitter
+
+
+def _should_retry(operation, error, attempt):
+    if not isinstance(error, RETRYABLE_ERRORS) or attempt >= _setting('LLM_MAX_RETRIES', 3):
+        return False
+    if not _retry_budget.withdraw():
+        metrics.increment(f'llm.{operation}.retry_budget_exhausted')
+        return False
+    metrics.increment(f'llm.{operation}.retries')
+    logger.warning(f"LLM {operation} failed ({error.__class__.__name__}), retrying (attempt {attempt + 1})")
+    return True
+
+
+def _record(operation, started, outcome):
+    metrics.observe(f'llm.{operation}.latency', time.monotonic() - started)
+    metrics.increment(f'llm.{operation}.{outcome}')
+
+
+async def _call_async(operation, call):
+    _retry_budget.deposit()
+    attempt = 0
+    while True:
+        await _admit_async()
+        started = time.monotonic()
+        try:
+            result = await call(get_async_client())
+            _record(operation, started, 'success')
+            return result
+        except Exception as e:
+            _record(operation, started, 'error')
+            if not _should_retry(operation, e, attempt):
+                raise
+            delay = _retry_delay(e, attempt)
+        finally:
+            _limiter.release()
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def _call_sync(operation, call):
+    _retry_budget.deposit()
+    attempt = 0
+    while True:
+        _admit_sync()
+        started = time.monotonic()
+        try:
+            result = call(get_sync_client())
+            _record(operation, started, 'success')
+            return result
+        except Exception as e:
+            _record(operation, started, 'error')
+            if not _should_retry(operation, e, attempt):
+                raise
+            delay = _retry_delay(e, attempt)
+        finally:
+            _limiter.release()
+        attempt += 1
+        time.sleep(delay)
+
+
+async def chat_completion(**kwargs):
+    return await _call_async('chat', lambda client: client.chat.completions.create(**kwargs))
+
+
+async def create_embeddings(**kwargs):
+    return await _call_async('embeddings', lambda client: client.embeddings.create(**kwargs))
+
+
+def chat_completion_sync(**kwargs):
+    return _call_sync('chat', lambda client: client.chat.completions.create(**kwargs))
+
+
+def create_embeddings_sync(**kwargs):
+    return _call_sync('embeddings', lambda client: client.embeddings.create(**kwargs))
+
+
+async def stream_chat_completion(**kwargs):
+    """Yield the text deltas of a streamed chat completion.
+
+    The concurrency slot is held until the stream is exhausted. Retries only
+    happen before the first chunk, so callers never see duplicated text.
+    """
+    _retry_budget.deposit()
+    attempt = 0
+    while True:
+        await _admit_async()
+        started = time.monotonic()
+        first_chunk = True
+        try:
+            stream = await get_async_client().chat.completions.create(stream=True, **kwargs)
+            async for chunk in stream:
+                if first_chunk:
+                    metrics.observe('llm.chat_stream.first_token', time.monotonic() - started)
+                    first_chunk = False
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            _record('chat_stream', started, 'success')
+            return
+        except Exception as e:
+            _record('chat_stream', started, 'error')
+            if not first_chunk or not _should_retry('chat_stream', e, attempt):
+                raise
+            delay = _retry_delay(e, attempt)
+        finally:
+            _limiter.release()
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def get_metrics():
+    data = metrics.snapshot('llm.')
+    data['config'] = {
+        'http2': HTTP2_AVAILABLE,
+        'max_concurrency': _limiter.limit,
+        'rate_limit_per_second': _bucket.rate,
+    }
+    return data
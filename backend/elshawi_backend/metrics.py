@@ -0,0 +1,64 @@
+"""Small in-process metrics registry (counters, gauges and latency summaries)."""
+import threading
+from collections import defaultdict, deque
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = defaultdict(float)
+_timings = {}
+
+TIMING_WINDOW = 500
+
+
+def increment(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name, value):
+    with _lock:
+        _gauges[name] = value
+
+
+def add_to_gauge(name, delta):
+    with _lock:
+        _gauges[name] += delta
+
+
+def observe(name, seconds):
+    """Record a duration; the summary keeps totals plus a window of recent samples for percentiles."""
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'recent': deque(maxlen=TIMING_WINDOW)}
+        timing['count'] += 1
+        timing['total'] += seconds
+        timing['max'] = max(timing['max'], seconds)
+        timing['recent'].append(seconds)
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def snapshot(prefix=''):
+    """Return the current metric values whose names start with ``prefix``."""
+    with _lock:
+        timings = {
+            name: {
+                'count': timing['count'],
+                'avg': timing['total'] / timing['count'] if timing['count'] else 0.0,
+                'max': timing['max'],
+                'p50': _percentile(timing['recent'], 0.5),
+                'p95': _percentile(timing['recent'], 0.95),
+            }
+            for name, timing in _timings.items() if name.startswith(prefix)
+        }
+        return {
+            'counters': {name: value for name, value in _counters.items() if name.startswith(prefix)},
+            'gauges': {name: value for name, value in _gauges.items() if name.startswith(prefix)},
+            'timings': timings,
+        }
@@ -1,47 +1,181 @@
+"""Websocket authentication from the ``?token=`` query parameter.
+
+Handshakes are the hot path during reconnect storms, so neither step touches
+the database once warm: verified tokens are cached by digest until the token
+expires (per process, then Redis), and the user comes from the profile
+snapshot cache in ``accounts.profile_cache``. Handshake and auth latency are
+recorded in ``elshawi_backend.metrics`` under ``ws.``.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs
+
+import redis
 from channels.middleware import BaseMiddleware
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework.authtoken.models import Token
 
+from accounts.profile_cache import aget_profile_snapshot
+from . import metrics
+from .redis_client import get_redis, mark_unavailable
+
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = 'ws_auth:'
+
+# Snapshot keys that are concrete User fields; anything else is loaded lazily on access.
+USER_SNAPSHOT_FIELDS = ('id', 'email', 'first_name', 'last_name', 'is_active')
+
+_verified = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def _token_digest(token_string):
+    # Keyed by the whole token, not just its jti, so a forged token cannot hit a cached entry.
+    return hashlib.sha256(token_string.encode('utf-8')).hexdigest()
 
-@database_sync_to_async
-def get_user_from_token(token_string):
+
+def _local_get(digest):
+    with _verified_lock:
+        entry = _verified.get(digest)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if expires_at < time.time():
+            del _verified[digest]
+            return None
+        _verified.move_to_end(digest)
+        return user_id
+
+
+def _local_set(digest, user_id, expires_at):
+    with _verified_lock:
+        _verified[digest] = (user_id, expires_at)
+        _verified.move_to_end(digest)
+        while len(_verified) > getattr(settings, 'WS_AUTH_CACHE_SIZE', 10000):
+            _verified.popitem(last=False)
+
+
+def _verify_token(token_string):
+    """Return ``(user_id, expires_at)`` for a valid token, or ``(None, None)``."""
     try:
-        # Try JWT token first
+        access_token = AccessToken(token_string)
+        return access_token['user_id'], access_token['exp']
+    except (InvalidToken, TokenError):
+        if '.' in token_string:
+            # A JWT that failed verification; DRF token keys never contain dots.
+            return None, None
+        user_id = Token.objects.filter(key=token_string).values_list('user_id', flat=True).first()
+        if user_id is None:
+            return None, None
+        # DRF tokens do not expire; re-check them periodically so deleted tokens stop working.
+        return user_id, time.time() + getattr(settings, 'WS_AUTH_DRF_TOKEN_TTL', 300)
+
+
+def authenticate_token(token_string):
+    """Return the id of the user ``token_string`` belongs to, or None."""
+    digest = _token_digest(token_string)
+    user_id = _local_get(digest)
+    if user_id is not None:
+        return user_id
+
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.get(f'{REDIS_KEY_PREFIX}{digest}')
+            pipe.ttl(f'{REDIS_KEY_PREFIX}{digest}')
+            cached, ttl = pipe.execute()
+            if cached is not None and ttl > 0:
+                user_id = int(cached)
+                _local_set(digest, user_id, time.time() + ttl)
+                metrics.increment('ws.auth.cache_hit')
+                return user_id
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    metrics.increment('ws.auth.cache_miss')
+    user_id, expires_at = _verify_token(token_string)
+    if user_id is None:
+        return None
+    _local_set(digest, user_id, expires_at)
+    ttl = int(expires_at - time.time())
+    if client is not None and ttl > 0:
         try:
-            access_token = AccessToken(token_string)
-            user = User.objects.get(id=access_token['user_id'])
-            return user
-        except (InvalidToken, TokenError):
-            # Try DRF Token
-            try:
-                token = Token.objects.get(key=token_string)
-                return token.user
-            except Token.DoesNotExist:
-                return AnonymousUser()
-    except Exception:
+            client.set(f'{REDIS_KEY_PREFIX}{digest}', user_id, ex=ttl)
+        except redis.RedisError as e:
+            mark_unavailable(e)
+    return user_id
+
+
+def _user_from_snapshot(snapshot):
+    # Fields outside the snapshot are deferred and fetched only if a consumer touches them.
+    return User.from_db(
+        DEFAULT_DB_ALIAS,
+        list(USER_SNAPSHOT_FIELDS),
+        [snapshot[field] for field in USER_SNAPSHOT_FIELDS]
+    )
+
+
+async def get_user_from_token(token_string):
+    try:
+        user_id = _local_get(_token_digest(token_string))
+        if user_id is None:
+            user_id = await database_sync_to_async(authenticate_token)(token_string)
+        else:
+            metrics.increment('ws.auth.cache_hit')
+        if user_id is None:
+            metrics.increment('ws.auth.rejected')
+            return AnonymousUser()
+
+        snapshot = await aget_profile_snapshot(user_id)
+        if snapshot is None:
+            metrics.increment('ws.auth.rejected')
+            return AnonymousUser()
+        return _user_from_snapshot(snapshot)
+    except Exception as e:
+        logger.error(f"Websocket token authentication failed: {str(e)}")
         return AnonymousUser()
 
+
 class TokenAuthMiddleware(BaseMiddleware):
     def __init__(self, inner):
         super().__init__(inner)
 
     async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
         try:
             query_params = parse_qs(scope["query_string"].decode())
             token = query_params.get("token", [None])[0]
-            
+
             if token:
                 scope["user"] = await get_user_from_token(token)
             else:
                 scope["user"] = AnonymousUser()
-                
+
         except Exception:
             scope["user"] = AnonymousUser()
-            
-        return await super().__call__(scope, receive, send)
\ No newline at end of file
+        metrics.observe('ws.auth', time.perf_counter() - started)
+
+        handshake_done = False
+
+        async def timed_send(message):
+            # The handshake ends when the consumer accepts or rejects the connection
+            nonlocal handshake_done
+            if not handshake_done and message.get('type') in ('websocket.accept', 'websocket.close'):
+                handshake_done = True
+                metrics.observe('ws.handshake', time.perf_counter() - started)
+                metrics.increment(f"ws.handshake.{message['type'].split('.')[1]}")
+            await send(message)
+
+        return await super().__call__(scope, receive, timed_send)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination for the list endpoints that opt into it.
+
+    Pages are fetched with ``WHERE sort_key < cursor LIMIT n`` instead of an
+    OFFSET, so the cost of a page does not grow with the table. Views order by
+    the primary key unless they set ``cursor_ordering`` or use an
+    ``OrderingFilter``; a primary-key tiebreaker is always appended so the
+    order is total.
+    """
+    page_size_query_param = 'page_size'
+    ordering = '-pk'
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+
+    def get_ordering(self, request, queryset, view):
+        cursor_ordering = getattr(view, 'cursor_ordering', None)
+        if cursor_ordering:
+            ordering = (cursor_ordering,) if isinstance(cursor_ordering, str) else tuple(cursor_ordering)
+        else:
+            ordering = super().get_ordering(request, queryset, view)
+
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering += ('-pk' if ordering[0].startswith('-') else 'pk',)
+        return ordering
+
+
+def paginate(request, queryset, serializer_class, view=None, context=None, ordering=None):
+    """Paginated response for APIViews and function views that don't go through GenericAPIView."""
+    paginator = KeysetPagination()
+    if ordering:
+        paginator.ordering = ordering
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    serializer = serializer_class(page, many=True, context={'request': request, **(context or {})})
+    return paginator.get_paginated_response(serializer.data)
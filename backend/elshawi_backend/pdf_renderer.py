@@ -0,0 +1,180 @@
+"""Shared WeasyPrint renderer for contracts, invoices and AI exports.
+
+Renders run in a pool of long-lived worker processes. Each worker sets up
+Django once and parses the stylesheets and font configuration of every
+profile at start-up, so a render job only carries the HTML. To cap the
+memory WeasyPrint accumulates, the pool is retired once its workers have
+taken ``PDF_RENDERER_MAX_TASKS_PER_CHILD`` jobs each on average; it finishes
+what it was given while a fresh pool takes new jobs. Render timings are
+recorded in ``elshawi_backend.metrics`` under ``pdf.``.
+
+Processes that cannot start children (Celery prefork workers are daemonic)
+or deployments with ``PDF_RENDERER_WORKERS = 0`` render inline, with the
+same per-process stylesheet cache.
+"""
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Profile name -> (dotted path of a function returning a list of CSS strings, its arguments).
+PROFILES = {
+    'default': None,
+    'contract': ('contracts.utils.pdf_generator.get_export_stylesheets', ()),
+    'invoice_en': ('invoices.utils.get_invoice_stylesheets', ('en',)),
+    'invoice_ar': ('invoices.utils.get_invoice_stylesheets', ('ar',)),
+}
+
+_assets = {}
+
+_pool = None
+_pool_jobs = 0
+_pool_lock = threading.Lock()
+
+
+def _load_assets(profile):
+    """Font configuration and parsed stylesheets of ``profile``, built once per process."""
+    if profile not in _assets:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        stylesheets = []
+        spec = PROFILES[profile]
+        if spec is not None:
+            path, args = spec
+            stylesheets = [CSS(string=css, font_config=font_config) for css in import_string(path)(*args)]
+        _assets[profile] = (font_config, stylesheets)
+    return _assets[profile]
+
+
+def _init_worker():
+    import django
+    django.setup()
+    for profile in PROFILES:
+        try:
+            _load_assets(profile)
+        except Exception as e:
+            # The job for this profile will raise the same error to its caller.
+            logger.error(f"Could not preload PDF profile {profile}: {str(e)}")
+
+
+def _render(html_content, profile, base_url):
+    """Render in the current process; returns the PDF bytes and the render time."""
+    from weasyprint import HTML
+
+    started = time.perf_counter()
+    font_config, stylesheets = _load_assets(profile)
+    pdf_bytes = HTML(string=html_content, base_url=base_url).write_pdf(
+        stylesheets=stylesheets, font_config=font_config
+    )
+    return pdf_bytes, time.perf_counter() - started
+
+
+def _use_pool():
+    if getattr(settings, 'PDF_RENDERER_WORKERS', 2) <= 0:
+        return False
+    return not multiprocessing.current_process().daemon
+
+
+def _get_pool():
+    """The pool for the next job, recycling the current one once it has used up its jobs."""
+    global _pool, _pool_jobs
+    with _pool_lock:
+        workers = getattr(settings, 'PDF_RENDERER_WORKERS', 2)
+        # ProcessPoolExecutor's own max_tasks_per_child deadlocks with queued jobs on Python 3.11.
+        if _pool is not None and _pool_jobs >= workers * getattr(settings, 'PDF_RENDERER_MAX_TASKS_PER_CHILD', 50):
+            _pool.shutdown(wait=False)
+            _pool = None
+            metrics.increment('pdf.pool.recycled')
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                # fork would copy the caller's threads and DB connections into the workers
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+            _pool_jobs = 0
+        _pool_jobs += 1
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderJob:
+    """A submitted render; ``result()`` returns the PDF bytes."""
+
+    def __init__(self, profile, future=None, pool=None, pdf_bytes=None):
+        self.profile = profile
+        self._future = future
+        self._pool = pool
+        self._pdf_bytes = pdf_bytes
+        self._submitted = time.perf_counter()
+
+    def result(self, timeout=None):
+        if self._future is None:
+            return self._pdf_bytes
+        if timeout is None:
+            timeout = getattr(settings, 'PDF_RENDERER_TIMEOUT', 120)
+        try:
+            pdf_bytes, render_seconds = self._future.result(timeout=timeout)
+        except BrokenProcessPool:
+            metrics.increment('pdf.render.failed')
+            _discard_pool(self._pool)
+            raise
+        except Exception:
+            metrics.increment('pdf.render.failed')
+            raise
+        metrics.observe(f'pdf.render.{self.profile}', render_seconds)
+        metrics.observe('pdf.job', time.perf_counter() - self._submitted)
+        return pdf_bytes
+
+
+def submit(html_content, profile='default', base_url=None):
+    """Queue ``html_content`` for rendering with the stylesheets of ``profile``."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown PDF profile: {profile}")
+    if not _use_pool():
+        pdf_bytes, render_seconds = _render(html_content, profile, base_url)
+        metrics.observe(f'pdf.render.{profile}', render_seconds)
+        return RenderJob(profile, pdf_bytes=pdf_bytes)
+
+    pool = _get_pool()
+    try:
+        future = pool.submit(_render, html_content, profile, base_url)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool for this job.
+        _discard_pool(pool)
+        pool = _get_pool()
+        future = pool.submit(_render, html_content, profile, base_url)
+    return RenderJob(profile, future=future, pool=pool)
+
+
+def render_pdf(html_content, profile='default', base_url=None, timeout=None):
+    """Render ``html_content`` to PDF bytes in the renderer pool."""
+    return submit(html_content, profile, base_url).result(timeout)
@@ -0,0 +1,52 @@
+"""Shared Redis connection for application-level caching.
+
+Callers must treat Redis as optional: ``get_redis()`` returns ``None`` while
+Redis is unreachable, and is retried after ``REDIS_RETRY_INTERVAL`` seconds.
+"""
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_unavailable_until = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    global _client, _unavailable_until
+    if _client is not None:
+        return _client
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=getattr(settings, 'REDIS_CONNECT_TIMEOUT', 0.5),
+                socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 0.5),
+                health_check_interval=30,
+            )
+            client.ping()
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable, falling back: {str(e)}")
+            _unavailable_until = time.monotonic() + getattr(settings, 'REDIS_RETRY_INTERVAL', 30)
+            return None
+        _client = client
+        return _client
+
+
+def mark_unavailable(error):
+    """Drop the shared connection after a failed command so callers fall back for a while."""
+    global _client, _unavailable_until
+    logger.warning(f"Redis command failed, falling back: {str(error)}")
+    with _lock:
+        _client = None
+        _unavailable_until = time.monotonic() + getattr(settings, 'REDIS_RETRY_INTERVAL', 30)
@@ -0,0 +1,158 @@
+"""Read-through response cache for hot public read endpoints.
+
+Rendered responses are kept in the ``local`` (per-process) cache and in the
+shared ``default`` Redis cache. Cache keys embed a version per namespace;
+model signals call ``invalidate`` to bump that version instead of hunting
+down keys. Versions are themselves cached locally for
+``RESPONSE_CACHE_VERSION_TTL`` seconds, which bounds how long other processes
+keep serving a superseded entry.
+
+Every cached response carries an ETag, and a matching ``If-None-Match``
+gets a 304 without rendering anything. While Redis is down only the local
+level is used.
+"""
+import hashlib
+import logging
+from functools import wraps
+
+import redis
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views import View
+
+from .redis_client import get_redis, mark_unavailable
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'response:'
+
+
+def _shared(method, *args, **kwargs):
+    """Call ``method`` on the shared Redis cache, skipping it while Redis is known to be down."""
+    if get_redis() is None:
+        return None
+    try:
+        return getattr(caches['default'], method)(*args, **kwargs)
+    except redis.RedisError as e:
+        mark_unavailable(e)
+        return None
+
+
+def _version_key(namespace):
+    return f'{KEY_PREFIX}version:{namespace}'
+
+
+def get_version(namespace):
+    key = _version_key(namespace)
+    local = caches['local']
+    version = local.get(key)
+    if version is None:
+        version = _shared('get_or_set', key, 1, None) or 1
+        local.set(key, version, getattr(settings, 'RESPONSE_CACHE_VERSION_TTL', 5))
+    return version
+
+
+def invalidate(namespace, user_id=None):
+    """Make every cached response of ``namespace`` (or of one user within it) unreachable."""
+    if user_id is not None:
+        namespace = f'{namespace}:user:{user_id}'
+    key = _version_key(namespace)
+    local = caches['local']
+    try:
+        version = _shared('incr', key)
+    except ValueError:
+        # No version stored yet: anything cached was keyed under the implicit version 1.
+        version = 2
+        _shared('set', key, version, None)
+    if version is not None:
+        local.set(key, version, getattr(settings, 'RESPONSE_CACHE_VERSION_TTL', 5))
+    else:
+        # Redis is down: bump this process's copy for as long as its local entries can live.
+        local.set(key, (local.get(key) or 1) + 1, getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 60))
+
+
+def _etag(content):
+    return f'"{hashlib.sha1(content).hexdigest()}"'
+
+
+def _not_modified(request, etag):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+
+def _cache_key(request, namespace, per_user):
+    user = getattr(request, 'user', None)
+    parts = [namespace, str(get_version(namespace)), request.get_host(), request.get_full_path()]
+    accepted_renderer = getattr(request, 'accepted_renderer', None)
+    if accepted_renderer is not None:
+        parts.append(accepted_renderer.format)
+    if per_user and user is not None and user.is_authenticated:
+        user_namespace = f'{namespace}:user:{user.pk}'
+        parts += [str(user.pk), str(get_version(user_namespace))]
+    return KEY_PREFIX + hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _build_response(entry, request):
+    if _not_modified(request, entry['etag']):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    return response
+
+
+def _store_when_rendered(response, key, timeout):
+    def store(rendered):
+        content = rendered.content
+        entry = {
+            'status': rendered.status_code,
+            'content': content,
+            'content_type': rendered.get('Content-Type'),
+            'etag': _etag(content),
+        }
+        rendered['ETag'] = entry['etag']
+        caches['local'].set(key, entry, getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 60))
+        _shared('set', key, entry, timeout or getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+
+    if hasattr(response, 'add_post_render_callback') and not response.is_rendered:
+        # DRF/template responses are rendered after the view returns
+        response.add_post_render_callback(store)
+    else:
+        store(response)
+
+
+def cache_response(namespace, timeout=None, per_user=False):
+    """Cache successful GET responses of a view function or a (DRF) view method.
+
+    With ``per_user`` the cached copy is private to the authenticated user and
+    ``invalidate(namespace, user_id)`` drops just that user's copies;
+    anonymous requests always share one copy.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = args[1] if args and isinstance(args[0], View) else args[0]
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(*args, **kwargs)
+
+            key = _cache_key(request, namespace, per_user)
+            entry = caches['local'].get(key)
+            if entry is None:
+                entry = _shared('get', key)
+                if entry is not None:
+                    caches['local'].set(key, entry, getattr(settings, 'RESPONSE_CACHE_LOCAL_TIMEOUT', 60))
+            if entry is not None:
+                response = _build_response(entry, request)
+            else:
+                response = view_func(*args, **kwargs)
+                if response.status_code != 200 or response.has_header('Set-Cookie'):
+                    return response
+                _store_when_rendered(response, key, timeout)
+            if per_user:
+                patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
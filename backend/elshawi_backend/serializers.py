@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+
+def requested_expansions(request):
+    """Names passed in ``?expand=a,b``."""
+    if request is None:
+        return set()
+    return {name.strip() for name in request.query_params.get('expand', '').split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Trim a read serializer from the query string.
+
+    ``?fields=id,title`` keeps only the named top-level fields. Nested fields
+    listed in ``Meta.expandable_fields`` are left out unless named in
+    ``?expand=`` or in the ``expand`` serializer context set by the view.
+    Only applies to the top-level serializer of a GET request.
+    """
+
+    def _is_root(self):
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_root():
+            return fields
+
+        expand = requested_expansions(request) | set(self.context.get('expand', ()))
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                fields.pop(name, None)
+
+        only = {name.strip() for name in request.query_params.get('fields', '').split(',') if name.strip()}
+        if only:
+            fields = {name: field for name, field in fields.items() if name in only}
+        return fields
@@ -168,7 +168,9 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'], 
+    'PAGE_SIZE': 50,
 }
+API_MAX_PAGE_SIZE = 200
 
 # Simple JWT configuration
 SIMPLE_JWT = {
@@ -226,6 +228,55 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'purge-llm-response-cache': {
+        'task': 'ai_assistant.tasks.purge_llm_response_cache',
+        'schedule': 6 * 3600,
+    },
+    'send-notification-digests': {
+        'task': 'notifications.tasks.send_notification_digests',
+        'schedule': 60,
+    },
+    'reconcile-unread-notification-counters': {
+        'task': 'notifications.tasks.reconcile_unread_notification_counters',
+        'schedule': 3600,
+    },
+    'expire-stale-presence': {
+        'task': 'chat.tasks.expire_stale_presence',
+        'schedule': 30,
+    },
+}
+
+# Redis is the shared cache; 'local' is a small per-process L1 in front of it
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'elshawi',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'socket_connect_timeout': 0.5,
+            'socket_timeout': 0.5,
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'elshawi-local',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+}
+
+# Response cache for public read endpoints (elshawi_backend.response_cache)
+RESPONSE_CACHE_TIMEOUT = 300
+RESPONSE_CACHE_LOCAL_TIMEOUT = 60
+RESPONSE_CACHE_VERSION_TTL = 5
+
+# LLM response cache (Redis first, database fallback)
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_DB_MAX_ENTRIES = 5000
 
 # Channels configuration
 CHANNEL_LAYERS = {
@@ -237,6 +288,21 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Presence: heartbeats expire after PRESENCE_TTL seconds, broadcasts are debounced
+PRESENCE_TTL = 90
+PRESENCE_HEARTBEAT_INTERVAL = 30
+PRESENCE_DEBOUNCE_SECONDS = 2
+PRESENCE_QUERY_MAX_USERS = 500
+
+# Contract PDF exports: 'full' re-renders the document, 'incremental' appends
+# a signature appendix to the stored body PDF (contracts.utils.incremental_pdf)
+CONTRACT_EXPORT_DEFAULT_MODE = os.getenv('CONTRACT_EXPORT_DEFAULT_MODE', 'full')
+
+# WeasyPrint renderer pool (elshawi_backend.pdf_renderer); 0 workers renders inline
+PDF_RENDERER_WORKERS = int(os.getenv('PDF_RENDERER_WORKERS', 2))
+PDF_RENDERER_MAX_TASKS_PER_CHILD = 50
+PDF_RENDERER_TIMEOUT = 120
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
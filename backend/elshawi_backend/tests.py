@@ -0,0 +1,105 @@
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from . import pdf_renderer
+
+
+def stylesheets(language):
+    return [f'body {{ direction: {language}; }}', 'h1 { color: black; }']
+
+
+def finished(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class PdfRendererTests(SimpleTestCase):
+    def setUp(self):
+        patchers = (
+            mock.patch.object(pdf_renderer, '_pool', None),
+            mock.patch.object(pdf_renderer, '_pool_jobs', 0),
+            mock.patch.object(pdf_renderer, '_assets', {}),
+            mock.patch.object(pdf_renderer, '_render', return_value=(b'%PDF', 0.01)),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def executor(self):
+        """Stand-in for ProcessPoolExecutor whose pools answer every job immediately."""
+        pools = []
+
+        def make_pool(**kwargs):
+            pool = mock.Mock()
+            pool.submit.side_effect = lambda function, *args: finished(function(*args))
+            pools.append(pool)
+            return pool
+        return mock.patch.object(pdf_renderer, 'ProcessPoolExecutor', side_effect=make_pool), pools
+
+    def test_profile_stylesheets_are_parsed_once(self):
+        weasyprint = mock.MagicMock()
+        modules = {'weasyprint': weasyprint, 'weasyprint.text': weasyprint.text, 'weasyprint.text.fonts': weasyprint.text.fonts}
+        profiles = {**pdf_renderer.PROFILES, 'test_rtl': ('elshawi_backend.tests.stylesheets', ('rtl',))}
+        with mock.patch.dict(sys.modules, modules), mock.patch.object(pdf_renderer, 'PROFILES', profiles):
+            first = pdf_renderer._load_assets('test_rtl')
+            self.assertIs(pdf_renderer._load_assets('test_rtl'), first)
+            self.assertEqual(pdf_renderer._load_assets('default')[1], [])
+        self.assertEqual(
+            [call.kwargs['string'] for call in weasyprint.CSS.call_args_list],
+            ['body { direction: rtl; }', 'h1 { color: black; }']
+        )
+
+    @override_settings(PDF_RENDERER_WORKERS=2)
+    def test_jobs_carry_their_profile(self):
+        patcher, pools = self.executor()
+        with patcher:
+            self.assertEqual(pdf_renderer.render_pdf('<p>Invoice</p>', profile='invoice_ar'), b'%PDF')
+        pdf_renderer._render.assert_called_once_with('<p>Invoice</p>', 'invoice_ar', None)
+        with self.assertRaises(ValueError):
+            pdf_renderer.submit('<p>Invoice</p>', profile='invoice_fr')
+
+    @override_settings(PDF_RENDERER_WORKERS=2, PDF_RENDERER_MAX_TASKS_PER_CHILD=3)
+    def test_whole_pool_is_recycled_after_its_job_budget(self):
+        patcher, pools = self.executor()
+        with patcher:
+            for _ in range(2 * 3):
+                pdf_renderer.render_pdf('<p>Contract</p>', profile='contract')
+            self.assertEqual(len(pools), 1)
+            pools[0].shutdown.assert_not_called()
+
+            pdf_renderer.render_pdf('<p>Contract</p>', profile='contract')
+        self.assertEqual(len(pools), 2)
+        pools[0].shutdown.assert_called_once_with(wait=False)
+        self.assertEqual((pools[0].submit.call_count, pools[1].submit.call_count), (6, 1))
+
+    @override_settings(PDF_RENDERER_WORKERS=2)
+    def test_broken_pool_is_replaced(self):
+        patcher, pools = self.executor()
+        with patcher:
+            pdf_renderer.render_pdf('<p>Contract</p>')
+            pools[0].submit.side_effect = BrokenProcessPool()
+            self.assertEqual(pdf_renderer.render_pdf('<p>Contract</p>'), b'%PDF')
+        self.assertEqual(len(pools), 2)
+        pools[0].shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    @override_settings(PDF_RENDERER_WORKERS=2)
+    def test_daemonic_processes_render_inline(self):
+        patcher, pools = self.executor()
+        daemon = SimpleNamespace(daemon=True)
+        with patcher, mock.patch.object(pdf_renderer.multiprocessing, 'current_process', return_value=daemon):
+            self.assertEqual(pdf_renderer.render_pdf('<p>Contract</p>', profile='contract'), b'%PDF')
+        self.assertEqual(pools, [])
+        pdf_renderer._render.assert_called_once_with('<p>Contract</p>', 'contract', None)
+
+    @override_settings(PDF_RENDERER_WORKERS=0)
+    def test_zero_workers_render_inline(self):
+        patcher, pools = self.executor()
+        with patcher:
+            pdf_renderer.render_pdf('<p>Contract</p>')
+        self.assertEqual(pools, [])
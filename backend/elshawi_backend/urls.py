@@ -34,7 +34,11 @@ urlpatterns = [
 from django.conf import settings
 from django.conf.urls.static import static
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+from .views import LLMMetricsView, PdfRendererMetricsView, WebsocketMetricsView
 urlpatterns += [
     path("health/", lambda request: JsonResponse({"status": "ok"})),
+    path("health/llm/", LLMMetricsView.as_view(), name='health-llm'),
+    path("health/websockets/", WebsocketMetricsView.as_view(), name='health-websockets'),
+    path("health/pdf/", PdfRendererMetricsView.as_view(), name='health-pdf'),
 ]
 
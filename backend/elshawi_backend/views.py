@@ -0,0 +1,30 @@
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import metrics
+from .llm_gateway import get_metrics
+from .permissions import IsAdminUser
+
+
+class LLMMetricsView(APIView):
+    """Latency, error, retry and queue-depth figures for this process's LLM gateway."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_metrics())
+
+
+class WebsocketMetricsView(APIView):
+    """Handshake latency and auth cache figures for this process's websocket middleware."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot('ws.'))
+
+
+class PdfRendererMetricsView(APIView):
+    """Render timings and failures of this process's PDF renderer pool."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot('pdf.'))
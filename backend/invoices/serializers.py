@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Invoice, InvoiceItem
 from marketplace.models import Service
+from elshawi_backend.serializers import SparseFieldsMixin
 
 class InvoiceItemSerializer(serializers.ModelSerializer):
     service_title = serializers.CharField(source='service.title', read_only=True)
@@ -9,7 +10,7 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
         model = InvoiceItem
         fields = ['id', 'description', 'quantity', 'unit_price', 'total_price', 'service', 'service_title']
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     items = InvoiceItemSerializer(many=True, read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     is_overdue = serializers.BooleanField(read_only=True)
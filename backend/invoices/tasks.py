@@ -3,8 +3,6 @@ from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
-from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration
 import os
 import tempfile
 from .models import Invoice
@@ -1,7 +1,6 @@
 from django.template.loader import render_to_string
 from django.conf import settings
-from weasyprint import HTML, CSS
-from weasyprint.text.fonts import FontConfiguration
+from elshawi_backend.pdf_renderer import render_pdf
 import os
 import tempfile
 from .models import Invoice
@@ -21,21 +20,9 @@ class InvoiceGenerator:
                 'items': invoice.items.all(),
             })
             
-            # Create CSS configuration
-            font_config = FontConfiguration()
-            
-            # CSS files
-            css_files = [
-                CSS(string=InvoiceGenerator.get_base_css()),
-                CSS(string=InvoiceGenerator.get_language_css(invoice.language)),
-            ]
-            
-            # Generate PDF
-            html_doc = HTML(string=html_content, base_url=settings.BASE_DIR)
-            pdf_buffer = html_doc.write_pdf(
-                stylesheets=css_files,
-                font_config=font_config
-            )
+            # Generate PDF; the stylesheets are parsed once per renderer worker
+            profile = 'invoice_ar' if invoice.language == 'ar' else 'invoice_en'
+            pdf_buffer = render_pdf(html_content, profile, base_url=str(settings.BASE_DIR))
             
             # Save to file
             pdf_filename = f"invoice_{invoice.invoice_number}.pdf"
@@ -317,3 +304,8 @@ class InvoiceGenerator:
             }
             """
         return ""
+
+
+def get_invoice_stylesheets(language):
+    """Stylesheets of the renderer's ``invoice_<language>`` profiles."""
+    return [css for css in (InvoiceGenerator.get_base_css(), InvoiceGenerator.get_language_css(language)) if css]
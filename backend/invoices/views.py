@@ -11,6 +11,7 @@ from rest_framework import status
 from invoices.tasks import generate_and_send_invoice, send_invoice_email
 from .models import Invoice, InvoiceItem
 from .serializers import InvoiceSerializer
+from elshawi_backend.pagination import paginate
 from .utils import InvoiceGenerator
 from django.utils import timezone
 from decimal import Decimal
@@ -80,7 +81,7 @@ def download_invoice_pdf(request, invoice_number):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def api_invoice_list(request):
-    invoices = Invoice.objects.filter(user=request.user).order_by('-created_at')
+    invoices = Invoice.objects.filter(user=request.user).prefetch_related('items__service')
     search_query = request.GET.get('search', '')
     status = request.GET.get('status', '')
     start_date = request.GET.get('start_date', '')
@@ -96,8 +97,7 @@ def api_invoice_list(request):
         invoices = invoices.filter(issue_date__gte=start_date)
     if end_date:
         invoices = invoices.filter(issue_date__lte=end_date)
-    serializer = InvoiceSerializer(invoices, many=True)
-    return Response(serializer.data)
+    return paginate(request, invoices, InvoiceSerializer, ordering='-created_at')
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from elshawi_backend.serializers import SparseFieldsMixin
 from .models import Service, ServiceRequest, ChatThread, Message, Payment, Document, Review
 User = get_user_model()
 
@@ -49,7 +50,7 @@ class DocumentSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.file.url)
         return None
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     lawyer = UserSerializer(read_only=True)
     lawyer_fullname = serializers.CharField(source='lawyer.fullname', read_only=True)
     requests = serializers.SerializerMethodField()
@@ -58,9 +59,13 @@ class ServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
         fields = ['id', 'title', 'price', 'category', 'description', 'lawyer', 'lawyer_fullname', 'created_at', 'updated_at', 'requests']
+        expandable_fields = ['requests']
 
     def get_requests(self, obj):
-        requests = ServiceRequest.objects.filter(service=obj).select_related('client', 'client__profile', 'lawyer', 'lawyer__profile').prefetch_related('documents', 'review')
+        if 'requests' in getattr(obj, '_prefetched_objects_cache', {}):
+            requests = obj.requests.all()
+        else:
+            requests = ServiceRequest.objects.filter(service=obj).select_related('client', 'client__profile', 'client__role', 'lawyer', 'lawyer__profile').prefetch_related('documents__uploaded_by', 'review')
         return ServiceRequestSerializer(requests, many=True, context=self.context).data
     
  
@@ -129,7 +134,7 @@ class ServiceRequestStatusSerializer(serializers.ModelSerializer):
 import logging
 logger = logging.getLogger(__name__)
 
-class SimpleServiceSerializer(serializers.ModelSerializer):
+class SimpleServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     lawyer = UserSerializer(read_only=True)
     lawyer_fullname = serializers.CharField(source='lawyer.fullname', read_only=True)
     price = serializers.CharField()
@@ -140,6 +145,9 @@ class SimpleServiceSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'price', 'category', 'description', 'lawyer', 'lawyer_fullname', 'created_at', 'updated_at', 'request_status']
 
     def get_request_status(self, obj):
+        if hasattr(obj, 'latest_request_status'):
+            # Annotated by marketplace.views.annotate_request_status
+            return obj.latest_request_status
         user = self.context.get('request').user if self.context.get('request') else None
         if not user or not user.is_authenticated:
             logger.debug(f"No authenticated user for service {obj.id}")
@@ -168,7 +176,7 @@ class ChatThreadSerializer(serializers.ModelSerializer):
         fields = ['id', 'service_request', 'created_at', 'messages']
         read_only_fields = ['created_at']
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = ['id', 'request', 'amount', 'status', 'timestamp']
@@ -181,10 +189,32 @@ class PaymentSerializer(serializers.ModelSerializer):
 
 
 
-class MarketplaceOrderSerializer(serializers.ModelSerializer):
+class ServiceSummarySerializer(serializers.ModelSerializer):
+    lawyer_fullname = serializers.CharField(source='lawyer.fullname', read_only=True)
+    price = serializers.CharField()
+
+    class Meta:
+        model = Service
+        fields = ['id', 'title', 'price', 'category', 'lawyer_fullname']
+
+
+class ServiceSummaryWithRequestsSerializer(ServiceSummarySerializer):
+    requests = ServiceRequestSerializer(many=True, read_only=True)
+
+    class Meta(ServiceSummarySerializer.Meta):
+        fields = ServiceSummarySerializer.Meta.fields + ['requests']
+
+
+class MarketplaceOrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Read model for order lists.
+
+    The service is a compact summary; its sibling requests are only included
+    when the view passes ``expand_requests`` in the context, and must then be
+    prefetched (see ``marketplace.views.OrderListMixin``).
+    """
     client = UserSerializer(read_only=True)
     lawyer = UserSerializer(read_only=True)
-    service = ServiceSerializer(read_only=True)
+    service = ServiceSummarySerializer(read_only=True)
     documents = DocumentSerializer(many=True, read_only=True)
     review = ReviewSerializer(read_only=True)
 
@@ -194,4 +224,10 @@ class MarketplaceOrderSerializer(serializers.ModelSerializer):
             'id', 'client', 'lawyer', 'service',
             'status', 'created_at', 'updated_at',
             'documents', 'review'
-        ]
\ No newline at end of file
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('expand_requests'):
+            fields['service'] = ServiceSummaryWithRequestsSerializer(read_only=True)
+        return fields
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from elshawi_backend.response_cache import invalidate
+from .models import Service, ServiceRequest
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_service_responses(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate('services'))
+
+
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_delete, sender=ServiceRequest)
+def invalidate_client_service_responses(sender, instance, **kwargs):
+    # Service lists show the client's latest request status, so only the client's copies go stale.
+    client_id = instance.client_id
+    transaction.on_commit(lambda: invalidate('services', user_id=client_id))
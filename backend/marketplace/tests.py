@@ -1,3 +1,157 @@
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from accounts.models import RoleModel, User, UserProfile
+from elshawi_backend.response_cache import invalidate
+from .models import Document, Review, Service, ServiceRequest
+from .views import AllServiceRequestsView, ClientServiceRequestsView, ServiceListView
+
+
+class OrderListQueryCountTests(TestCase):
+    ORDERS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        lawyer_role = RoleModel.objects.create(name='Lawyer')
+        client_role = RoleModel.objects.create(name='Client')
+        cls.lawyer = User.objects.create_user(email='lawyer@example.com', password='pass', role=lawyer_role)
+        cls.client_user = User.objects.create_user(email='client@example.com', password='pass', role=client_role)
+        UserProfile.objects.get_or_create(user=cls.lawyer)
+        UserProfile.objects.get_or_create(user=cls.client_user)
+
+        services = Service.objects.bulk_create([
+            Service(title=f'Service {i}', price=100, category='Legal', description='', lawyer=cls.lawyer)
+            for i in range(10)
+        ])
+        orders = ServiceRequest.objects.bulk_create([
+            ServiceRequest(client=cls.client_user, lawyer=cls.lawyer, service=services[i % len(services)])
+            for i in range(cls.ORDERS)
+        ])
+        Document.objects.bulk_create([
+            Document(request=order, file='documents/file.pdf', uploaded_by=cls.client_user)
+            for order in orders[::10]
+        ])
+        Review.objects.bulk_create([
+            Review(request=order, rating=5, comment='Good')
+            for order in orders[::20]
+        ])
+
+    def list_orders(self, view_class, user, query='?page_size=200'):
+        request = APIRequestFactory().get(f'/api/marketplace/requests/{query}')
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = view_class.as_view()(request)
+            response.render()
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_all_requests_query_count_is_constant(self):
+        response, count = self.list_orders(AllServiceRequestsView, self.lawyer)
+        self.assertEqual(len(response.data['results']), 200)
+        self.assertNotIn('requests', response.data['results'][0]['service'])
+        self.assertLessEqual(count, 6)
+
+    def test_client_requests_query_count_is_constant(self):
+        # The client's own orders are not paginated.
+        response, count = self.list_orders(ClientServiceRequestsView, self.client_user, '')
+        self.assertEqual(len(response.data), self.ORDERS)
+        self.assertLessEqual(count, 6)
+
+    def test_expanded_requests_use_a_single_prefetch(self):
+        response, count = self.list_orders(AllServiceRequestsView, self.lawyer, '?page_size=200&expand=requests')
+        self.assertEqual(len(response.data['results'][0]['service']['requests']), self.ORDERS // 10)
+        self.assertLessEqual(count, 10)
+
+    def test_cursor_pages_cover_every_order_once(self):
+        seen = []
+        query = '?page_size=200'
+        while query is not None:
+            response, count = self.list_orders(AllServiceRequestsView, self.lawyer, query)
+            self.assertLessEqual(count, 6)
+            seen.extend(order['id'] for order in response.data['results'])
+            next_url = response.data['next']
+            query = next_url[next_url.index('?'):] if next_url else None
+        self.assertEqual(len(seen), self.ORDERS)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_fields_parameter_trims_the_response(self):
+        response, _ = self.list_orders(AllServiceRequestsView, self.lawyer, '?fields=id,status')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'status'})
+
+
+class ServiceListQueryCountTests(TestCase):
+    SERVICES = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        lawyer_role = RoleModel.objects.create(name='Lawyer')
+        cls.lawyer = User.objects.create_user(email='lawyer@example.com', password='pass', role=lawyer_role)
+        cls.client_user = User.objects.create_user(email='client@example.com', password='pass')
+        cls.services = Service.objects.bulk_create([
+            Service(title=f'Service {i:04d}', price=100, category='Legal', description='', lawyer=cls.lawyer)
+            for i in range(cls.SERVICES)
+        ])
+        ServiceRequest.objects.create(client=cls.client_user, lawyer=cls.lawyer, service=cls.services[-1], status='Rejected')
+        ServiceRequest.objects.create(client=cls.client_user, lawyer=cls.lawyer, service=cls.services[-1], status='Pending')
+
+    def setUp(self):
+        caches['local'].clear()
+
+    def test_request_status_is_annotated_in_one_query(self):
+        request = APIRequestFactory().get('/api/marketplace/services/?page_size=200')
+        force_authenticate(request, user=self.client_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = ServiceListView.as_view()(request)
+            response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 200)
+        self.assertLessEqual(len(queries), 2)
+
+        statuses = {item['id']: item['request_status'] for item in response.data['results']}
+        self.assertEqual(statuses[self.services[-1].id], 'Pending')
+        self.assertIsNone(statuses[self.services[-2].id])
+
+
+class ServiceListCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lawyer = User.objects.create_user(email='lawyer@example.com', password='pass')
+        cls.client_user = User.objects.create_user(email='client@example.com', password='pass')
+        cls.service = Service.objects.create(title='Service', price=100, category='Legal', description='', lawyer=cls.lawyer)
+
+    def setUp(self):
+        caches['local'].clear()
+
+    def get(self, user, **headers):
+        request = APIRequestFactory().get('/api/marketplace/services/', **headers)
+        force_authenticate(request, user=user)
+        response = ServiceListView.as_view()(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_repeat_requests_skip_the_database(self):
+        first = self.get(self.client_user)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get(self.client_user)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        not_modified = self.get(self.client_user, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_invalidation_is_scoped_to_the_client(self):
+        self.get(self.client_user)
+        self.get(self.lawyer)
+        ServiceRequest.objects.create(client=self.client_user, lawyer=self.lawyer, service=self.service, status='Pending')
+        invalidate('services', user_id=self.client_user.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get(self.lawyer)
+        self.assertEqual(len(queries), 0)
+        response = self.get(self.client_user)
+        self.assertEqual(response.data['results'][0]['request_status'], 'Pending')
@@ -3,7 +3,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import CharField, OuterRef, Prefetch, Subquery, Value
 from .models import Service, ServiceRequest, ChatThread, Message, Payment, Document, Review
+from elshawi_backend.pagination import KeysetPagination
+from elshawi_backend.response_cache import cache_response
+from elshawi_backend.serializers import requested_expansions
 from .serializers import MarketplaceOrderSerializer, ServiceRequestStatusSerializer, ServiceSerializer, ServiceRequestSerializer, DocumentSerializer, PaymentSerializer, ReviewSerializer, SimpleServiceSerializer
 # from invoices.tasks import generate_and_send_invoice
 import logging
@@ -26,15 +30,46 @@ class IsLawyerPermission(IsAuthenticated):
             return False
         return request.user.role.name == 'Lawyer'
     
-class AllServiceRequestsView(generics.ListAPIView):
+class OrderListMixin:
+    """Queryset and serializer context for ``MarketplaceOrderSerializer`` lists.
+
+    Everything the serializer touches is loaded with a fixed number of queries,
+    independent of the number of orders. ``?expand=requests`` adds each
+    service's sibling requests through one extra prefetch.
+    """
     serializer_class = MarketplaceOrderSerializer
+
+    @property
+    def expand_requests(self):
+        return 'requests' in requested_expansions(self.request)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand_requests'] = self.expand_requests
+        return context
+
+    def get_order_queryset(self, queryset):
+        documents = Prefetch('documents', queryset=Document.objects.select_related('uploaded_by'))
+        queryset = queryset.select_related(
+            'client', 'client__profile', 'client__role',
+            'lawyer', 'lawyer__profile', 'lawyer__role',
+            'service', 'service__lawyer'
+        ).prefetch_related(documents, 'review__request__client')
+        if self.expand_requests:
+            siblings = ServiceRequest.objects.select_related(
+                'client', 'client__profile', 'client__role'
+            ).prefetch_related(documents, 'review__request__client')
+            queryset = queryset.prefetch_related(Prefetch('service__requests', queryset=siblings))
+        return queryset
+
+
+class AllServiceRequestsView(OrderListMixin, generics.ListAPIView):
     permission_classes = [IsLawyerPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
-            return ServiceRequest.objects.all().select_related(
-                'client', 'client__profile', 'lawyer', 'lawyer__profile', 'service'
-            ).prefetch_related('documents', 'review')
+            return self.get_order_queryset(ServiceRequest.objects.all())
         except Exception as e:
             raise ValidationError(f"Failed to retrieve service requests: {str(e)}")
 
@@ -46,10 +81,25 @@ class AllServiceRequestsView(generics.ListAPIView):
             logger.error(f"AllServiceRequestsView error: {str(e)}")
             return Response({"error": f"Failed to list service requests: {str(e)}"}, status=500)
         
+def annotate_request_status(queryset, user):
+    """Attach the status of ``user``'s latest request for each service as ``latest_request_status``."""
+    if not user or not user.is_authenticated:
+        return queryset.annotate(latest_request_status=Value(None, output_field=CharField()))
+    latest = ServiceRequest.objects.filter(
+        client=user, service=OuterRef('pk')
+    ).order_by('-created_at', '-pk').values('status')[:1]
+    return queryset.annotate(latest_request_status=Subquery(latest))
+
+
 class ServiceListView(generics.ListAPIView):
-    queryset = Service.objects.all().select_related('lawyer', 'lawyer__profile')
     serializer_class = SimpleServiceSerializer  # Use SimpleServiceSerializer
+    pagination_class = KeysetPagination
 
+    def get_queryset(self):
+        queryset = Service.objects.all().select_related('lawyer', 'lawyer__profile', 'lawyer__role')
+        return annotate_request_status(queryset, self.request.user)
+
+    @cache_response('services', per_user=True)
     def get(self, request, *args, **kwargs):
         try:
             logger.info(f"ServiceListView: User {request.user.fullname if request.user.is_authenticated else 'anonymous'} accessed services")
@@ -77,10 +127,16 @@ class LawyerServicesView(generics.ListAPIView):
 
     def get_queryset(self):
         try:
-            return Service.objects.filter(lawyer=self.request.user).select_related('lawyer', 'lawyer__profile').prefetch_related('requests__documents', 'requests__review', 'requests__client', 'requests__client__profile', 'requests__lawyer', 'requests__lawyer__profile')
+            return Service.objects.filter(lawyer=self.request.user).select_related('lawyer', 'lawyer__profile', 'lawyer__role').prefetch_related('requests__documents__uploaded_by', 'requests__review', 'requests__client', 'requests__client__profile', 'requests__client__role')
         except Exception as e:
             raise ValidationError(f"Failed to retrieve lawyer services: {str(e)}")
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # The lawyer dashboard always shows the requests for each service.
+        context['expand'] = ['requests']
+        return context
+
     def get(self, request, *args, **kwargs):
         try:
             logger.info(f"LawyerServicesView: User {request.user.fullname} accessing their services")
@@ -102,17 +158,11 @@ class ServiceRequestCreateView(generics.CreateAPIView):
             raise ValidationError(f"Failed to create service request: {str(e)}")
 
 
-class ClientServiceRequestsView(generics.ListAPIView):
-    serializer_class = MarketplaceOrderSerializer
+class ClientServiceRequestsView(OrderListMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return (
-            ServiceRequest.objects
-            .filter(client=self.request.user)
-            .select_related('client__profile', 'lawyer__profile', 'service')
-            .prefetch_related('documents', 'review')
-        ) 
+        return self.get_order_queryset(ServiceRequest.objects.filter(client=self.request.user))
 
 class ServiceRequestUpdateView(generics.UpdateAPIView):
     queryset = ServiceRequest.objects.all()
@@ -261,6 +311,7 @@ class ServiceDetailView(generics.RetrieveAPIView):
     serializer_class = SimpleServiceSerializer  # Use SimpleServiceSerializer
     permission_classes = [IsAuthenticated]
 
+    @cache_response('services', per_user=True)
     def get(self, request, *args, **kwargs):
         try:
             logger.info(f"ServiceDetailView: User {request.user.fullname if request.user.is_authenticated else 'anonymous'} accessed service {self.kwargs['pk']}")
@@ -302,10 +353,14 @@ class IsAdminPermission(IsAuthenticated):
 class AdminServicesView(generics.ListAPIView):
     serializer_class = ServiceSerializer
     permission_classes = [IsAdminPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
-            return Service.objects.all().select_related('lawyer', 'lawyer__profile').prefetch_related('requests__documents', 'requests__review', 'requests__client', 'requests__client__profile', 'requests__lawyer', 'requests__lawyer__profile')
+            queryset = Service.objects.all().select_related('lawyer', 'lawyer__profile', 'lawyer__role')
+            if 'requests' in requested_expansions(self.request):
+                queryset = queryset.prefetch_related('requests__documents__uploaded_by', 'requests__review', 'requests__client', 'requests__client__profile', 'requests__client__role')
+            return queryset
         except Exception as e:
             raise ValidationError(f"Failed to retrieve services: {str(e)}")
 
@@ -369,6 +424,7 @@ class AdminServiceDeleteView(generics.DestroyAPIView):
 class AdminPaymentsView(generics.ListAPIView):
     serializer_class = PaymentSerializer
     permission_classes = [IsAdminPermission]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
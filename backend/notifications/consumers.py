@@ -89,8 +89,8 @@ class DashboardConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        from .models import Notification
-        return Notification.objects.filter(user=self.user, is_read=False).count()
+        from .unread import get_unread_count
+        return get_unread_count(self.user.id)
     
     
 class NotificationConsumer(AsyncWebsocketConsumer):
@@ -123,8 +123,5 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        from .models import Notification
-        return Notification.objects.filter(
-            user=self.user, 
-            is_read=False
-        ).count()
\ No newline at end of file
+        from .unread import get_unread_count
+        return get_unread_count(self.user.id)
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""Fan-out-on-write for notifications that go to many recipients at once.
+
+A fan-out writes every recipient's row with one ``bulk_create``, pushes all
+websocket events in a single pass over the channel layer and hands email to
+the digest queue, so the sender's request does not grow with the number of
+recipients. Works with both ``notifications.Notification`` and
+``chat.Notification``; pass the model and its serializer.
+"""
+import asyncio
+import logging
+from collections import Counter, defaultdict
+
+import redis
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.apps import apps
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from elshawi_backend.redis_client import get_redis, mark_unavailable
+from .models import Notification
+from .serializers import NotificationSerializer
+from .unread import adjust_unread_counts, get_unread_counts
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE_KEY = 'notifications:email_queue'
+
+
+def create_notifications(recipients, title, message, notification_type='system_alert',
+                         content_object=None, priority='medium', action_url=None,
+                         action_text=None, model=Notification):
+    """Create one notification per recipient with a single INSERT and bump their unread counters."""
+    created_at = timezone.now()
+    with transaction.atomic():
+        notifications = model.objects.bulk_create([
+            model(
+                user=user,
+                title=title,
+                message=message,
+                notification_type=notification_type,
+                priority=priority,
+                content_object=content_object,
+                action_url=action_url,
+                action_text=action_text or '',
+                created_at=created_at
+            )
+            for user in recipients
+        ])
+        adjust_unread_counts(Counter(notification.user_id for notification in notifications), model)
+    return notifications
+
+
+def build_notification_events(notifications, serializer_class=NotificationSerializer):
+    """Channel-layer events for a fan-out batch, with every recipient's unread counter read in one query."""
+    if not notifications:
+        return []
+    unread_counts = get_unread_counts({n.user_id for n in notifications}, type(notifications[0]))
+
+    # Rows of one fan-out only differ by id and recipient, so serialize once.
+    data = serializer_class(notifications[0]).data
+    return [
+        (f'notifications_{notification.user_id}', {
+            'type': 'send_notification',
+            'content': {
+                'type': 'NEW_NOTIFICATION',
+                'notification': {**data, 'id': str(notification.pk)},
+                'unread_count': unread_counts.get(notification.user_id, 0)
+            }
+        })
+        for notification in notifications
+    ]
+
+
+async def push_notification_events(events):
+    """Send all events concurrently; one failed group does not stop the rest."""
+    channel_layer = get_channel_layer()
+    results = await asyncio.gather(
+        *(channel_layer.group_send(group, event) for group, event in events),
+        return_exceptions=True
+    )
+    for (group, _), result in zip(events, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to push notification to {group}: {str(result)}")
+
+
+def queue_notification_emails(notifications):
+    """Hand notifications to the email digest once the surrounding transaction commits."""
+    entries = [f'{notification._meta.label}:{notification.pk}' for notification in notifications]
+    if entries:
+        transaction.on_commit(lambda: _enqueue_emails(entries))
+
+
+def _enqueue_emails(entries):
+    client = get_redis()
+    if client is not None:
+        try:
+            client.rpush(EMAIL_QUEUE_KEY, *entries)
+            return
+        except redis.RedisError as e:
+            mark_unavailable(e)
+
+    from .tasks import send_notification_emails
+    send_notification_emails.delay(entries)
+
+
+def fan_out_notifications(recipients, title, message, notification_type='system_alert',
+                          content_object=None, priority='medium', action_url=None,
+                          action_text=None, send_email=False, model=Notification,
+                          serializer_class=NotificationSerializer):
+    """Create, push and (optionally) queue email for a notification to every recipient."""
+    notifications = create_notifications(
+        recipients, title, message,
+        notification_type=notification_type,
+        content_object=content_object,
+        priority=priority,
+        action_url=action_url,
+        action_text=action_text,
+        model=model
+    )
+    async_to_sync(push_notification_events)(build_notification_events(notifications, serializer_class))
+    if send_email:
+        queue_notification_emails(notifications)
+    return notifications
+
+
+def drain_email_queue(limit):
+    """Atomically pop up to ``limit`` queued entries."""
+    client = get_redis()
+    if client is None:
+        return []
+    try:
+        pipe = client.pipeline()
+        pipe.lrange(EMAIL_QUEUE_KEY, 0, limit - 1)
+        pipe.ltrim(EMAIL_QUEUE_KEY, limit, -1)
+        entries, _ = pipe.execute()
+    except redis.RedisError as e:
+        mark_unavailable(e)
+        return []
+    return [entry.decode('utf-8') for entry in entries]
+
+
+def _load_unread(entries):
+    ids_by_label = defaultdict(list)
+    for entry in entries:
+        label, _, pk = entry.rpartition(':')
+        ids_by_label[label].append(pk)
+
+    for label, ids in ids_by_label.items():
+        model = apps.get_model(label)
+        yield from model.objects.filter(pk__in=ids, is_read=False).select_related('user').order_by('created_at')
+
+
+def _digest_message(user, notifications, connection):
+    frontend_url = getattr(settings, 'FRONTEND_URL', '')
+    if len(notifications) == 1:
+        subject = notifications[0].title
+    else:
+        subject = f"You have {len(notifications)} new notifications"
+    html_message = render_to_string('emails/notification_digest.html', {
+        'user': user,
+        'subject': subject,
+        'notifications': notifications,
+        'site_name': getattr(settings, 'SITE_NAME', ''),
+        'FRONTEND_URL': frontend_url
+    })
+
+    text_message = '\n\n'.join(
+        f"{n.title}\n{n.message}" + (f"\nTake action: {n.action_url}" if n.action_url else '')
+        for n in notifications
+    )
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection
+    )
+    email.attach_alternative(html_message, 'text/html')
+    return email
+
+
+def send_digest_emails(entries):
+    """Send one email per recipient for the queued entries, over a single SMTP connection.
+
+    Notifications that were read before the digest went out are skipped.
+    """
+    by_user = defaultdict(list)
+    users = {}
+    for notification in _load_unread(entries):
+        if notification.user.email:
+            users[notification.user_id] = notification.user
+            by_user[notification.user_id].append(notification)
+    if not by_user:
+        return 0
+
+    connection = get_connection(fail_silently=True)
+    messages = [_digest_message(users[user_id], notifications, connection) for user_id, notifications in by_user.items()]
+    return connection.send_messages(messages) or 0
@@ -75,6 +75,7 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read']),
+            models.Index(fields=['user', 'created_at']),
             models.Index(fields=['notification_type', 'created_at']),
             models.Index(fields=['content_type', 'object_id']),
         ]
@@ -83,8 +84,8 @@ class Notification(models.Model):
         return f"{self.title} - {self.user.email}"
     
     def mark_as_read(self):
-        self.is_read = True
-        self.save()
+        from notifications.unread import mark_read
+        mark_read(self)
     
     @classmethod
     def create_notification(cls, user, title, message, notification_type='system_alert',
@@ -114,4 +115,24 @@ class Notification(models.Model):
         elif diff.seconds > 60:
             minutes = diff.seconds // 60
             return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-        return "Just now"
\ No newline at end of file
+        return "Just now"
+
+class UnreadCounter(models.Model):
+    """Denormalized unread notification count per user, kept in step by ``notifications.unread``."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='unread_counters'
+    )
+    # Label of the counted model, e.g. 'notifications.Notification' or 'chat.Notification'
+    source = models.CharField(max_length=100)
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'source'], name='unique_unread_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.source}: {self.count}"
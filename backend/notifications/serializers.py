@@ -1,8 +1,9 @@
 # notifications/serializers.py
 from rest_framework import serializers
+from elshawi_backend.serializers import SparseFieldsMixin
 from .models import Notification
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     time_since = serializers.SerializerMethodField()
     
     class Meta:
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import Notification
+from .unread import adjust_unread_counts
+
+# Bulk writes (bulk_create, queryset.update) skip these signals and adjust counters themselves.
+NOTIFICATION_MODELS = (Notification, 'chat.Notification')
+
+
+def notification_created(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        adjust_unread_counts({instance.user_id: 1}, sender)
+
+
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_counts({instance.user_id: -1}, sender)
+
+
+for model in NOTIFICATION_MODELS:
+    post_save.connect(notification_created, sender=model, dispatch_uid=f'unread_created_{model}')
+    post_delete.connect(notification_deleted, sender=model, dispatch_uid=f'unread_deleted_{model}')
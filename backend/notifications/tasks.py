@@ -0,0 +1,47 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from .fanout import drain_email_queue, send_digest_emails
+from .unread import reconcile_unread_counters
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_notification_digests():
+    """Drain the notification email queue and send one digest per recipient."""
+    batch_size = getattr(settings, 'NOTIFICATION_DIGEST_BATCH_SIZE', 5000)
+    sent = 0
+    while True:
+        entries = drain_email_queue(batch_size)
+        if not entries:
+            break
+        sent += send_digest_emails(entries)
+        if len(entries) < batch_size:
+            break
+    if sent:
+        logger.info(f"Sent {sent} notification digest emails")
+    return sent
+
+
+@shared_task
+def send_notification_emails(entries):
+    """Fallback used when Redis is unavailable: send the given entries right away."""
+    return send_digest_emails(entries)
+
+
+@shared_task
+def reconcile_unread_notification_counters():
+    """Recount unread counters that drifted (e.g. through raw updates) for both notification models."""
+    # chat.models is not a package, so its model is only registered once imported
+    from chat.models.notification import Notification as ChatNotification
+    from .models import Notification
+
+    fixed = 0
+    for model in (Notification, ChatNotification):
+        fixed += reconcile_unread_counters(model)
+    if fixed:
+        logger.warning(f"Reconciled {fixed} unread notification counters")
+    return fixed
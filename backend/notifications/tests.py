@@ -1,3 +1,108 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from . import fanout
+from .fanout import create_notifications
+from .models import Notification, UnreadCounter
+from .tasks import reconcile_unread_notification_counters
+from .unread import get_unread_count, mark_all_read, mark_read
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='reader@example.com', password='pass')
+        self.other = User.objects.create_user(email='other@example.com', password='pass')
+
+    def notify(self, user=None):
+        return Notification.objects.create(user=user or self.user, title='Title', message='Message')
+
+    def counter(self, user=None):
+        return UnreadCounter.objects.get(user=user or self.user, source='notifications.Notification').count
+
+    def test_counter_is_built_from_the_table_on_first_read(self):
+        self.notify()
+        self.notify()
+        self.assertFalse(UnreadCounter.objects.exists())
+        self.assertEqual(get_unread_count(self.user.id), 2)
+        self.assertEqual(self.counter(), 2)
+
+    def test_writes_adjust_the_counter(self):
+        self.assertEqual(get_unread_count(self.user.id), 0)
+        first, second = self.notify(), self.notify()
+        self.assertEqual(self.counter(), 2)
+
+        self.assertTrue(mark_read(first))
+        self.assertFalse(mark_read(first))  # already read: no second decrement
+        self.assertEqual(self.counter(), 1)
+
+        second.delete()
+        first.delete()
+        self.assertEqual(self.counter(), 0)
+
+    def test_fan_out_and_mark_all_read(self):
+        get_unread_count(self.user.id)
+        get_unread_count(self.other.id)
+        create_notifications([self.user, self.other, self.user], 'Title', 'Message')
+        self.assertEqual(self.counter(), 2)
+        self.assertEqual(self.counter(self.other), 1)
+
+        self.assertEqual(mark_all_read(self.user.id), 2)
+        self.assertEqual(self.counter(), 0)
+        self.assertEqual(self.counter(self.other), 1)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        self.notify()
+        self.assertEqual(get_unread_count(self.user.id), 1)
+        Notification.objects.filter(user=self.user).update(is_read=True)  # bypasses the signals
+        self.assertEqual(get_unread_count(self.user.id), 1)
+
+        self.assertEqual(reconcile_unread_notification_counters(), 1)
+        self.assertEqual(get_unread_count(self.user.id), 0)
+        self.assertEqual(reconcile_unread_notification_counters(), 0)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class FanOutTests(TestCase):
+    def setUp(self):
+        self.recipients = [
+            User.objects.create_user(email=f'recipient{index}@example.com', password='pass') for index in range(3)
+        ]
+        for user in self.recipients:
+            get_unread_count(user.id)
+
+    def subscribe(self, channel_layer):
+        channels = {}
+        for user in self.recipients:
+            channels[user.id] = async_to_sync(channel_layer.new_channel)()
+            async_to_sync(channel_layer.group_add)(f'notifications_{user.id}', channels[user.id])
+        return channels
+
+    def counter(self, user):
+        return UnreadCounter.objects.get(user=user, source='notifications.Notification').count
+
+    def test_fan_out_writes_once_and_pushes_once_per_recipient(self):
+        channel_layer = get_channel_layer()
+        channels = self.subscribe(channel_layer)
+        with mock.patch.object(Notification.objects, 'bulk_create', wraps=Notification.objects.bulk_create) as bulk_create, \
+                mock.patch.object(fanout, 'adjust_unread_counts', wraps=fanout.adjust_unread_counts) as adjust, \
+                mock.patch.object(channel_layer, 'group_send', wraps=channel_layer.group_send) as group_send:
+            notifications = fanout.fan_out_notifications(self.recipients, 'Hearing moved', 'New date: Monday')
+
+        bulk_create.assert_called_once()
+        adjust.assert_called_once()
+        self.assertEqual(dict(adjust.call_args.args[0]), {user.id: 1 for user in self.recipients})
+        for user in self.recipients:
+            self.assertEqual(self.counter(user), 1)
+
+        self.assertEqual(
+            sorted(call.args[0] for call in group_send.call_args_list),
+            sorted(f'notifications_{user.id}' for user in self.recipients)
+        )
+        for user, notification in zip(self.recipients, notifications):
+            event = async_to_sync(channel_layer.receive)(channels[user.id])
+            self.assertEqual(event['content']['notification']['id'], str(notification.pk))
+            self.assertEqual(event['content']['unread_count'], 1)
@@ -0,0 +1,100 @@
+"""Per-user unread notification counters.
+
+Badge counts are read from ``UnreadCounter`` instead of counting the
+notification table. Counters are adjusted in the same transaction as the
+change that caused them, created lazily from a real COUNT on first read, and
+corrected by the ``reconcile_unread_counters`` task if they ever drift.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Notification, UnreadCounter
+
+
+def _source(model):
+    return model._meta.label
+
+
+def _count_unread(model, user_ids):
+    return dict(
+        model.objects.filter(user_id__in=user_ids, is_read=False)
+        .order_by()
+        .values_list('user_id')
+        .annotate(count=Count('pk'))
+    )
+
+
+def get_unread_counts(user_ids, model=Notification):
+    """Return ``{user_id: unread}``; users without a counter yet get one from a single grouped COUNT."""
+    user_ids = set(user_ids)
+    counts = dict(
+        UnreadCounter.objects.filter(user_id__in=user_ids, source=_source(model)).values_list('user_id', 'count')
+    )
+    missing = user_ids - counts.keys()
+    if missing:
+        fresh = _count_unread(model, missing)
+        UnreadCounter.objects.bulk_create(
+            [UnreadCounter(user_id=user_id, source=_source(model), count=fresh.get(user_id, 0)) for user_id in missing],
+            ignore_conflicts=True
+        )
+        counts.update({user_id: fresh.get(user_id, 0) for user_id in missing})
+    return counts
+
+
+def get_unread_count(user_id, model=Notification):
+    return get_unread_counts([user_id], model)[user_id]
+
+
+def adjust_unread_counts(deltas, model=Notification):
+    """Apply ``{user_id: delta}`` with one UPDATE per distinct delta.
+
+    Users without a counter are skipped; theirs is built from the table on first read.
+    """
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        UnreadCounter.objects.filter(user_id__in=user_ids, source=_source(model)).update(
+            count=Greatest(F('count') + delta, 0)
+        )
+
+
+def mark_read(notification):
+    """Mark one notification read, decrementing the counter only if it was unread."""
+    model = type(notification)
+    with transaction.atomic():
+        updated = model.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+        if updated:
+            adjust_unread_counts({notification.user_id: -1}, model)
+    notification.is_read = True
+    return bool(updated)
+
+
+def mark_all_read(user_id, model=Notification):
+    """Mark every unread notification of ``user_id`` read and zero the counter."""
+    with transaction.atomic():
+        updated = model.objects.filter(user_id=user_id, is_read=False).update(is_read=True)
+        UnreadCounter.objects.update_or_create(user_id=user_id, source=_source(model), defaults={'count': 0})
+    return updated
+
+
+def reconcile_unread_counters(model=Notification, batch_size=1000):
+    """Recount every counter of ``model`` and fix the ones that drifted. Returns how many were fixed."""
+    fixed = 0
+    counters = UnreadCounter.objects.filter(source=_source(model)).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(counters.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return fixed
+        last_pk = batch[-1].pk
+        actual = _count_unread(model, [counter.user_id for counter in batch])
+        for counter in batch:
+            count = actual.get(counter.user_id, 0)
+            if counter.count != count:
+                # Only overwrite if nothing adjusted the counter since it was read.
+                fixed += UnreadCounter.objects.filter(pk=counter.pk, count=counter.count).update(count=count)
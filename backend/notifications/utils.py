@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 
 from notifications.serializers import NotificationSerializer
 from .models import Notification
+from .unread import get_unread_count
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 def send_user_notification(user, title, message, notification_type='system_alert',
@@ -60,10 +61,7 @@ def send_user_notification(user, title, message, notification_type='system_alert
             'content': {
                 'type': 'NEW_NOTIFICATION',
                 'notification': NotificationSerializer(notification).data,
-                'unread_count': Notification.objects.filter(
-                    user=user, 
-                    is_read=False
-                ).count()
+                'unread_count': get_unread_count(user.id)
             }
         }
     )
@@ -7,8 +7,11 @@ from django.db.models import Q
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
+from elshawi_backend.pagination import KeysetPagination
+
 from .models import Notification
 from .serializers import NotificationSerializer, NotificationMarkReadSerializer
+from .unread import get_unread_count, mark_all_read as mark_all_notifications_read
 
 class NotificationListView(generics.ListAPIView):
     """List user's notifications"""
@@ -19,6 +22,7 @@ class NotificationListView(generics.ListAPIView):
     search_fields = ['title', 'message']
     ordering_fields = ['created_at', 'priority']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -41,29 +45,21 @@ class UnreadNotificationCountView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        count = Notification.objects.filter(
-            user=request.user, 
-            is_read=False
-        ).count()
-        return Response({'count': count})
+        return Response({'count': get_unread_count(request.user.id)})
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_notification_read(request, pk):
     """Mark a notification as read"""
     notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
+    notification.mark_as_read()
     return Response({'status': 'marked as read'})
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_all_read(request):
     """Mark all user notifications as read"""
-    updated = Notification.objects.filter(
-        user=request.user,
-        is_read=False
-    ).update(is_read=True)
+    updated = mark_all_notifications_read(request.user.id)
     
     return Response({'marked_read': updated})
 
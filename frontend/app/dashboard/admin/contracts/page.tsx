@@ -49,6 +49,8 @@ export default function ContractsAdminPage() {
     loading: contractsLoading,
     errorMessage: contractsError,
     getContracts,
+    hasMore,
+    loadMoreContracts,
     deleteContract,
     assignLawyer,
     changeStatus,
@@ -56,7 +58,7 @@ export default function ContractsAdminPage() {
     exportAllContracts,
   } = useAdminContracts()
 
-  const { users, loading: usersLoading, errorMessage: usersError } = useAdminManagement()
+  const { users, hasMoreUsers, loadMoreUsers, loading: usersLoading, errorMessage: usersError } = useAdminManagement()
 
   // View state management
   const [currentView, setCurrentView] = useState<ViewMode>("list")
@@ -203,7 +205,7 @@ export default function ContractsAdminPage() {
       const a = document.createElement("a")
       a.style.display = "none"
       a.href = url
-      a.download = `contracts.${exportFormat}`
+      a.download = `contracts_${exportFormat}.zip`
       document.body.appendChild(a)
       a.click()
       window.URL.revokeObjectURL(url)
@@ -378,6 +380,8 @@ export default function ContractsAdminPage() {
           <AssignLawyerView
             contract={selectedContract}
             lawyers={lawyers}
+            hasMoreUsers={hasMoreUsers}
+            onLoadMoreUsers={loadMoreUsers}
             lawyerId={lawyerId}
             setLawyerId={setLawyerId}
             onAssign={handleAssignLawyer}
@@ -403,6 +407,8 @@ export default function ContractsAdminPage() {
           <ForceSignView
             contract={selectedContract}
             users={users}
+            hasMoreUsers={hasMoreUsers}
+            onLoadMoreUsers={loadMoreUsers}
             forceSignUserId={forceSignUserId}
             setForceSignUserId={setForceSignUserId}
             onForceSign={handleForceSign}
@@ -417,6 +423,8 @@ export default function ContractsAdminPage() {
             contracts={contracts}
             loading={loading}
             errorMessage={errorMessage}
+            hasMore={hasMore}
+            onLoadMore={loadMoreContracts}
             statusFilter={statusFilter}
             setStatusFilter={setStatusFilter}
             typeFilter={typeFilter}
@@ -464,6 +472,8 @@ function ContractsListView({
   contracts,
   loading,
   errorMessage,
+  hasMore,
+  onLoadMore,
   statusFilter,
   setStatusFilter,
   typeFilter,
@@ -486,6 +496,8 @@ function ContractsListView({
   contracts: Contract[]
   loading: boolean
   errorMessage: string
+  hasMore: boolean
+  onLoadMore: () => void
   statusFilter: string
   setStatusFilter: (value: string) => void
   typeFilter: string
@@ -603,7 +615,7 @@ function ContractsListView({
 
       {/* Contracts Grid */}
       <div className="grid grid-cols-1 lg:grid-cols-2 xl:grid-cols-3 gap-6">
-        {loading
+        {loading && contracts.length === 0
           ? Array.from({ length: 6 }).map((_, i) => (
               <Card key={i} className="animate-pulse">
                 <CardHeader>
@@ -726,6 +738,14 @@ function ContractsListView({
             ))}
       </div>
 
+      {hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={onLoadMore} disabled={loading}>
+            {loading ? "جاري التحميل..." : "تحميل المزيد"}
+          </Button>
+        </div>
+      )}
+
       {/* Empty State */}
       {!loading && contracts.length === 0 && (
         <Card className="text-center py-12">
@@ -1092,6 +1112,8 @@ function ContractDetailView({
 function AssignLawyerView({
   contract,
   lawyers,
+  hasMoreUsers,
+  onLoadMoreUsers,
   lawyerId,
   setLawyerId,
   onAssign,
@@ -1100,6 +1122,8 @@ function AssignLawyerView({
 }: {
   contract: Contract | null
   lawyers: AdminUser[]
+  hasMoreUsers: boolean
+  onLoadMoreUsers: () => void
   lawyerId: string
   setLawyerId: (value: string) => void
   onAssign: () => void
@@ -1136,6 +1160,11 @@ function AssignLawyerView({
                 ))}
               </SelectContent>
             </Select>
+            {hasMoreUsers && (
+              <Button variant="link" size="sm" className="px-0" onClick={onLoadMoreUsers} disabled={loading}>
+                تحميل المزيد من المستخدمين
+              </Button>
+            )}
           </div>
 
           <div className="flex gap-2 pt-4">
@@ -1220,6 +1249,8 @@ function ChangeStatusView({
 function ForceSignView({
   contract,
   users,
+  hasMoreUsers,
+  onLoadMoreUsers,
   forceSignUserId,
   setForceSignUserId,
   onForceSign,
@@ -1228,6 +1259,8 @@ function ForceSignView({
 }: {
   contract: Contract | null
   users: AdminUser[]
+  hasMoreUsers: boolean
+  onLoadMoreUsers: () => void
   forceSignUserId: string
   setForceSignUserId: (value: string) => void
   onForceSign: () => void
@@ -1264,6 +1297,11 @@ function ForceSignView({
                 ))}
               </SelectContent>
             </Select>
+            {hasMoreUsers && (
+              <Button variant="link" size="sm" className="px-0" onClick={onLoadMoreUsers} disabled={loading}>
+                تحميل المزيد من المستخدمين
+              </Button>
+            )}
           </div>
 
           <div className="flex gap-2 pt-4">
@@ -35,6 +35,7 @@ import {
   ArrowRight,
   Save,
   X,
+  Loader2,
 } from "lucide-react"
 import type { Service, ServiceData, PaymentData, ReviewData } from "@/types/monitoring"
 
@@ -76,10 +77,14 @@ export default function AdminMarketplacePage() {
     loading,
     errorMessage,
     fetchServices,
+    hasMoreServices,
+    loadMoreServices,
     createService,
     updateService,
     deleteService,
     fetchPayments,
+    hasMorePayments,
+    loadMorePayments,
     updatePayment,
     deletePayment,
     fetchDocuments,
@@ -662,7 +667,7 @@ export default function AdminMarketplacePage() {
 
                 {viewState.services.mode === "list" && (
                   <>
-                    {loading.services ? (
+                    {loading.services && services.length === 0 ? (
                       <LoadingTable />
                     ) : (
                       <div className="rounded-md border overflow-x-auto">
@@ -733,6 +738,14 @@ export default function AdminMarketplacePage() {
                         </Table>
                       </div>
                     )}
+                    {hasMoreServices && (
+                      <div className="flex justify-center pt-4">
+                        <Button variant="outline" onClick={loadMoreServices} disabled={loading.services}>
+                          {loading.services && <Loader2 className="h-4 w-4 ml-2 animate-spin" />}
+                          تحميل المزيد
+                        </Button>
+                      </div>
+                    )}
                   </>
                 )}
               </CardContent>
@@ -756,7 +769,7 @@ export default function AdminMarketplacePage() {
 
                 {viewState.payments.mode === "list" && (
                   <>
-                    {loading.payments ? (
+                    {loading.payments && payments.length === 0 ? (
                       <LoadingTable />
                     ) : (
                       <div className="rounded-md border overflow-x-auto">
@@ -820,6 +833,14 @@ export default function AdminMarketplacePage() {
                         </Table>
                       </div>
                     )}
+                    {hasMorePayments && (
+                      <div className="flex justify-center pt-4">
+                        <Button variant="outline" onClick={loadMorePayments} disabled={loading.payments}>
+                          {loading.payments && <Loader2 className="h-4 w-4 ml-2 animate-spin" />}
+                          تحميل المزيد
+                        </Button>
+                      </div>
+                    )}
                   </>
                 )}
               </CardContent>
@@ -76,7 +76,8 @@ assignLawyer,
     getContractSignatures,
     exportContract,
     getContractAnalytics,
-
+    hasMoreContracts,
+    loadMoreContracts,
   } = useContracts()
 
 
@@ -711,6 +712,13 @@ assignLawyer,
                         ))}
                       </TableBody>
                     </Table>
+                    {hasMoreContracts && (
+                      <div className="flex justify-center py-4">
+                        <Button variant="outline" onClick={loadMoreContracts} disabled={loading}>
+                          تحميل المزيد
+                        </Button>
+                      </div>
+                    )}
                   </div>
                 )}
               </CardContent>
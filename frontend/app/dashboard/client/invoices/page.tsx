@@ -13,7 +13,8 @@ import { Alert, AlertDescription } from "@/components/ui/alert"
 type ViewMode = "list" | "details"
 
 export default function InvoicesPage() {
-  const { invoices, loading, errorMessage, getInvoiceDetails, downloadInvoicePDF } = useInvoicesClient()
+  const { invoices, loading, errorMessage, hasMore, loadMoreInvoices, getInvoiceDetails, downloadInvoicePDF } =
+    useInvoicesClient()
   const [currentView, setCurrentView] = useState<ViewMode>("list")
   const [selectedInvoice, setSelectedInvoice] = useState<Invoice | null>(null)
   const [detailsLoading, setDetailsLoading] = useState(false)
@@ -89,7 +90,7 @@ export default function InvoicesPage() {
         </Alert>
       )}
 
-      {loading ? (
+      {loading && invoices.length === 0 ? (
         <div className="flex items-center justify-center py-12">
           <Loader2 className="h-8 w-8 animate-spin text-primary" />
           <span className="mr-2 text-lg">جاري التحميل...</span>
@@ -187,6 +188,15 @@ export default function InvoicesPage() {
           ))}
         </div>
       )}
+
+      {hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMoreInvoices} disabled={loading}>
+            {loading && <Loader2 className="h-4 w-4 ml-2 animate-spin" />}
+            تحميل المزيد
+          </Button>
+        </div>
+      )}
     </div>
   )
 
@@ -4,6 +4,7 @@ import { useState } from "react"
 import { useMarketplace } from "@/hooks/useMarketplace"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Input } from "@/components/ui/input"
+import { Button } from "@/components/ui/button"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
 import { Alert, AlertDescription } from "@/components/ui/alert"
 import { ServiceCard } from "@/components/dashboard/clients/marketplace/service-card"
@@ -11,7 +12,7 @@ import { Loader2, AlertCircle, Store, Search, Filter, DollarSign, Users } from "
 import { useToast } from "@/hooks/use-toast"
 
 export default function ClientMarketplace() {
-  const { services, loading, errorMessage: error, requestService } = useMarketplace()
+  const { services, loading, errorMessage: error, requestService, hasMore, loadMore } = useMarketplace()
   const [searchTerm, setSearchTerm] = useState("")
   const [selectedCategory, setSelectedCategory] = useState<string>("all")
   const [priceRange, setPriceRange] = useState<string>("all")
@@ -242,6 +243,15 @@ export default function ClientMarketplace() {
         </div>
       )}
 
+      {hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loading}>
+            {loading && <Loader2 className="ml-2 h-4 w-4 animate-spin" />}
+            تحميل المزيد
+          </Button>
+        </div>
+      )}
+
       {/* Results Summary */}
       {services.length > 0 && (
         <Card>
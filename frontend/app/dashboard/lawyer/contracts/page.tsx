@@ -94,6 +94,8 @@ export default function EnhancedLawyerDashboard() {
     verifySignature,
     verifySignatureLocally,
     getContractSignatures,
+    hasMoreContracts,
+    loadMoreContracts,
   } = useContracts()
 
   useEffect(() => {
@@ -720,6 +722,14 @@ export default function EnhancedLawyerDashboard() {
           </TabsContent>
         </Tabs>
 
+        {hasMoreContracts && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={loadMoreContracts} disabled={loading}>
+              تحميل المزيد
+            </Button>
+          </div>
+        )}
+
         {/* Enhanced Contract Details Modal */}
         <Dialog open={showDetails} onOpenChange={setShowDetails}>
           <DialogContent className="max-w-5xl max-h-[90vh] overflow-y-auto bg-white rounded-3xl border-0 shadow-2xl" dir="rtl">
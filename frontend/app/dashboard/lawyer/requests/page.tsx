@@ -47,7 +47,8 @@ import {
 } from "@/components/ui/alert-dialog"
 
 export default function LawyerRequests() {
-  const { allRequests, myServiceRequests, loading, errorMessage: error, manageRequest } = useLawyerRequests()
+  const { allRequests, myServiceRequests, loading, errorMessage: error, manageRequest, hasMoreRequests, loadMoreRequests } =
+    useLawyerRequests()
   const [searchTerm, setSearchTerm] = useState("")
   const [activeTab, setActiveTab] = useState("all")
   const [statusFilter, setStatusFilter] = useState("all")
@@ -510,6 +511,14 @@ export default function LawyerRequests() {
                   ))}
                 </div>
               )}
+              {hasMoreRequests && (
+                <div className="flex justify-center pt-4">
+                  <Button variant="outline" onClick={loadMoreRequests} disabled={loading}>
+                    {loading && <Loader2 className="h-4 w-4 ml-2 animate-spin" />}
+                    تحميل المزيد
+                  </Button>
+                </div>
+              )}
             </CardContent>
           </Card>
         </TabsContent>
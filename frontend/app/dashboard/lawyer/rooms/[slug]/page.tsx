@@ -45,7 +45,7 @@ export default function ChatPage() {
     //     resetError,
     // } = useChat()
 
-    const { getMessageHistory, getActiveUsers,  createRoom, rooms, messages, error, loading } = useChatAPI();
+    const { getMessageHistory, loadOlderMessages, hasOlderMessages, getActiveUsers,  createRoom, rooms, messages, error, loading } = useChatAPI();
     const { sendMessage, connectToRoom, sendTypingStatus, userStatus, typingStatus } = useWebSocketChat();
     const { unreadCount, notifications, loading: loadingNotification, markNotificationRead, clearAllNotifications, deleteNotification, markAllNotificationsRead, } = useNotification()
     const [errorRoom, setErrorRoom] = useState("");
@@ -193,6 +193,8 @@ export default function ChatPage() {
                                 loading={false}
                                 onSendMessage={handleSendMessage}
                                 onTyping={sendTypingStatus}
+                                hasOlderMessages={hasOlderMessages(activeRoom)}
+                                onLoadOlderMessages={() => loadOlderMessages(activeRoom)}
                                 CURRENT_USER_ID={user.user_id || ""}
                             />
                         ) : (
@@ -273,6 +275,8 @@ export default function ChatPage() {
                                     loading={false}
                                     onSendMessage={handleSendMessage}
                                     onTyping={sendTypingStatus}
+                                    hasOlderMessages={hasOlderMessages(activeRoom)}
+                                    onLoadOlderMessages={() => loadOlderMessages(activeRoom)}
                                     CURRENT_USER_ID={user?.user_id || ""} />
                             ) : (
                                 <div className="flex-1 flex items-center justify-center text-gray-500 dark:text-gray-400">
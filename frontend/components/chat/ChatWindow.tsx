@@ -37,6 +37,8 @@ interface ChatWindowProps {
   onSendMessage: (content: string, fileUrl?: string) => Promise<void>
   onTyping: (isTyping: boolean) => void
   CURRENT_USER_ID:string|number;
+  hasOlderMessages?: boolean
+  onLoadOlderMessages?: () => Promise<void>
 }
 
 
@@ -50,21 +52,53 @@ export default function ChatWindow({
   onSendMessage,
   onTyping,
   CURRENT_USER_ID,
+  hasOlderMessages = false,
+  onLoadOlderMessages,
 }: ChatWindowProps) {
   const [messageContent, setMessageContent] = useState("")
   // const [uploading, setUploading] = useState(false)
   const messagesEndRef = useRef<HTMLDivElement>(null)
   // const fileInputRef = useRef<HTMLInputElement>(null)
   const typingTimeoutRef = useRef<NodeJS.Timeout | null>(null)
+  const messagesAreaRef = useRef<HTMLDivElement>(null)
+  // Scroll height before an older page was prepended, to keep the view in place
+  const heightBeforeOlderRef = useRef<number | null>(null)
+  const [loadingOlder, setLoadingOlder] = useState(false)
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" })
   }
 
+  const lastMessageId = messages.length ? messages[messages.length - 1].id : null
+
   useEffect(() => {
     scrollToBottom()
+  }, [lastMessageId])
+
+  useEffect(() => {
+    const area = messagesAreaRef.current
+    if (area && heightBeforeOlderRef.current !== null) {
+      area.scrollTop = area.scrollHeight - heightBeforeOlderRef.current
+      heightBeforeOlderRef.current = null
+    }
   }, [messages])
 
+  // Load the previous page of history when scrolled back to the top
+  const handleScroll = async () => {
+    const area = messagesAreaRef.current
+    if (!area || area.scrollTop > 0 || !hasOlderMessages || !onLoadOlderMessages || loadingOlder) return
+    heightBeforeOlderRef.current = area.scrollHeight
+    setLoadingOlder(true)
+    try {
+      await onLoadOlderMessages()
+    } catch (error) {
+      heightBeforeOlderRef.current = null
+      console.error("Failed to load older messages:", error)
+    } finally {
+      setLoadingOlder(false)
+    }
+  }
+
   const handleSendMessage = async (e: React.FormEvent) => {
     e.preventDefault()
 
@@ -179,7 +213,7 @@ export default function ChatWindow({
       </div>
 
       {/* Messages Area */}
-      <div className="flex-1 overflow-y-auto p-4 space-y-4">
+      <div ref={messagesAreaRef} onScroll={handleScroll} className="flex-1 overflow-y-auto p-4 space-y-4">
         {loading && messages.length === 0 ? (
           <div className="flex items-center justify-center h-full">
             <div className="text-center">
@@ -199,6 +233,12 @@ export default function ChatWindow({
           </div>
         ) : (
           <>
+            {loadingOlder && (
+              <div className="flex justify-center">
+                <LoadingSpinner size="sm" />
+              </div>
+            )}
+
             {messages.map((message, index) => {
               const isCurrentUser = message.sender.id === CURRENT_USER_ID
               const showAvatar = index === 0 || messages[index - 1].sender.id !== message.sender.id
@@ -23,6 +23,8 @@ export default function AdminManagement() {
     loading,
     errorMessage,
     getUsers,
+    hasMoreUsers,
+    loadMoreUsers,
     getUserDetails,
     updateUser,
     deleteUser,
@@ -56,6 +58,8 @@ export default function AdminManagement() {
             onToggleActive={toggleUserActive}
             onDeleteUser={deleteUser}
             onRefresh={getUsers}
+            hasMore={hasMoreUsers}
+            onLoadMore={loadMoreUsers}
           />
         )
       case "user-details":
@@ -18,6 +18,8 @@ interface UsersListProps {
   onToggleActive: (userId: number) => Promise<any>
   onDeleteUser: (userId: number) => Promise<void>
   onRefresh: () => Promise<void>
+  hasMore: boolean
+  onLoadMore: () => Promise<void>
 }
 
 export default function UsersList({
@@ -27,6 +29,8 @@ export default function UsersList({
   onToggleActive,
   onDeleteUser,
   onRefresh,
+  hasMore,
+  onLoadMore,
 }: UsersListProps) {
   const [searchTerm, setSearchTerm] = useState("")
   const [statusFilter, setStatusFilter] = useState<"all" | "active" | "inactive">("all")
@@ -125,7 +129,7 @@ export default function UsersList({
       </Card>
 
       {/* Users Grid */}
-      {loading ? (
+      {loading && users.length === 0 ? (
         <div className="flex justify-center items-center py-12">
           <RefreshCw className="h-8 w-8 animate-spin text-gray-400" />
           <span className="mr-2 text-gray-600">جاري التحميل...</span>
@@ -217,6 +221,14 @@ export default function UsersList({
           ))}
         </div>
       )}
+
+      {hasMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={onLoadMore} disabled={loading}>
+            {loading ? "جاري التحميل..." : "تحميل المزيد"}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
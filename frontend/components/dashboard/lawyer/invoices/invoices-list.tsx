@@ -21,6 +21,8 @@ interface InvoicesListProps {
   errorMessage: string
   getInvoices: (filters?: { status?: string; startDate?: string; endDate?: string }) => Promise<void>
   searchInvoices: (searchQuery: string) => Promise<void>
+  hasMore: boolean
+  loadMoreInvoices: () => Promise<void>
   downloadInvoicePDF: (invoiceNumber: string) => Promise<boolean>
   updateInvoiceStatus: (invoiceNumber: string, status: string) => Promise<boolean>
   sendInvoiceReminder: (invoiceNumber: string) => Promise<boolean>
@@ -35,6 +37,8 @@ export function InvoicesList({
   errorMessage,
   getInvoices,
   searchInvoices,
+  hasMore,
+  loadMoreInvoices,
   downloadInvoicePDF,
   updateInvoiceStatus,
   sendInvoiceReminder,
@@ -192,7 +196,7 @@ export function InvoicesList({
           <CardTitle>قائمة الفواتير ({invoices.length})</CardTitle>
         </CardHeader>
         <CardContent>
-          {loading ? (
+          {loading && invoices.length === 0 ? (
             <div className="space-y-4">
               {[...Array(5)].map((_, i) => (
                 <div key={i} className="flex items-center space-x-4 space-x-reverse">
@@ -289,6 +293,13 @@ export function InvoicesList({
               </Table>
             </div>
           )}
+          {hasMore && (
+            <div className="flex justify-center pt-4">
+              <Button variant="outline" onClick={loadMoreInvoices} disabled={loading}>
+                {loading ? "جاري التحميل..." : "تحميل المزيد"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
@@ -16,11 +16,15 @@ import {
   ADMIN_REVIEW_UPDATE_ENDPOINT,
   ADMIN_REVIEW_DELETE_ENDPOINT,
 } from "@/lib/apiConstants";
+import type { CursorPage } from "@/types/common";
 import { Service, Payment, Document, Review, ServiceData, PaymentData, DocumentData, ReviewData, ServiceRequest, User } from "@/types/monitoring";
 
 export function useAdminMarketplace() {
   const [services, setServices] = useState<Service[]>([]);
   const [payments, setPayments] = useState<Payment[]>([]);
+  // Cursors of the next service and payment pages; null once the last page is loaded
+  const [servicesNext, setServicesNext] = useState<string | null>(null);
+  const [paymentsNext, setPaymentsNext] = useState<string | null>(null);
   const [documents, setDocuments] = useState<Document[]>([]);
   const [reviews, setReviews] = useState<Review[]>([]);
   const [loading, setIsLoading] = useState({
@@ -54,14 +58,18 @@ export function useAdminMarketplace() {
     deleteReview: "",
   });
 
-  const fetchServices = async () => {
+  const loadServices = async (append: boolean) => {
+    // The table shows each service's request count, so ask for the requests to be expanded
+    const url = append ? servicesNext : `${ADMIN_SERVICES_ENDPOINT}?expand=requests`;
+    if (!url) return;
     try {
       setIsLoading((prev) => ({ ...prev, services: true }));
       setErrorMessage((prev) => ({ ...prev, services: "" }));
-      const response = await get<Service[]>(ADMIN_SERVICES_ENDPOINT, {
+      const response = await get<CursorPage<Service>>(url, {
         isPrivate: true,
       });
-      setServices(response.data);
+      setServices((prev) => (append ? [...prev, ...response.data.results] : response.data.results));
+      setServicesNext(response.data.next);
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage((prev) => ({
@@ -73,6 +81,9 @@ export function useAdminMarketplace() {
     }
   };
 
+  const fetchServices = () => loadServices(false);
+  const loadMoreServices = () => loadServices(true);
+
   const createService = async (data: ServiceData) => {
     try {
       setIsLoading((prev) => ({ ...prev, createService: true }));
@@ -137,14 +148,17 @@ export function useAdminMarketplace() {
     }
   };
 
-  const fetchPayments = async () => {
+  const loadPayments = async (append: boolean) => {
+    const url = append ? paymentsNext : ADMIN_PAYMENTS_ENDPOINT;
+    if (!url) return;
     try {
       setIsLoading((prev) => ({ ...prev, payments: true }));
       setErrorMessage((prev) => ({ ...prev, payments: "" }));
-      const response = await get<Payment[]>(ADMIN_PAYMENTS_ENDPOINT, {
+      const response = await get<CursorPage<Payment>>(url, {
         isPrivate: true,
       });
-      setPayments(response.data);
+      setPayments((prev) => (append ? [...prev, ...response.data.results] : response.data.results));
+      setPaymentsNext(response.data.next);
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage((prev) => ({
@@ -156,6 +170,9 @@ export function useAdminMarketplace() {
     }
   };
 
+  const fetchPayments = () => loadPayments(false);
+  const loadMorePayments = () => loadPayments(true);
+
   const updatePayment = async (id: number, data: PaymentData) => {
     try {
       setIsLoading((prev) => ({ ...prev, updatePayment: true }));
@@ -341,10 +358,14 @@ export function useAdminMarketplace() {
     loading,
     errorMessage,
     fetchServices,
+    hasMoreServices: servicesNext !== null,
+    loadMoreServices,
     createService,
     updateService,
     deleteService,
     fetchPayments,
+    hasMorePayments: paymentsNext !== null,
+    loadMorePayments,
     updatePayment,
     deletePayment,
     fetchDocuments,
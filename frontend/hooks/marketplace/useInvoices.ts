@@ -5,23 +5,22 @@ import { get, post, put } from "@/lib/api";
 import { INVOICES_LIST_ENDPOINT, INVOICE_DETAIL_ENDPOINT, INVOICE_DOWNLOAD_ENDPOINT } from "@/lib/apiConstants";
 import { extractErrorMessages } from "@/lib/errorHandler";
 import { Invoice, InvoiceList } from "@/types/invoices";
+import type { CursorPage } from "@/types/common";
 
 export function useInvoicesClient() {
   const [invoices, setInvoices] = useState<InvoiceList>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [errorMessage, setErrorMessage] = useState("");
 
-  // Fetch all invoices, optionally filtered by status or date range
-  const getInvoices = async (filters: { status?: string; startDate?: string; endDate?: string } = {}) => {
+  // Load a page of invoices; `append` adds it below the ones already loaded
+  const loadInvoices = async (url: string, append = false) => {
     try {
       setLoading(true);
       setErrorMessage("");
-      const queryParams = new URLSearchParams();
-      if (filters.status) queryParams.append("status", filters.status);
-      if (filters.startDate) queryParams.append("start_date", filters.startDate);
-      if (filters.endDate) queryParams.append("end_date", filters.endDate);
-      const response = await get<InvoiceList>(`${INVOICES_LIST_ENDPOINT}?${queryParams.toString()}`, { isPrivate: true });
-      setInvoices(response.data);
+      const response = await get<CursorPage<Invoice>>(url, { isPrivate: true });
+      setInvoices((prev) => (append ? [...prev, ...response.data.results] : response.data.results));
+      setNextPage(response.data.next);
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
@@ -30,19 +29,23 @@ export function useInvoicesClient() {
     }
   };
 
+  // Fetch the newest invoices, optionally filtered by status or date range
+  const getInvoices = async (filters: { status?: string; startDate?: string; endDate?: string } = {}) => {
+    const queryParams = new URLSearchParams();
+    if (filters.status) queryParams.append("status", filters.status);
+    if (filters.startDate) queryParams.append("start_date", filters.startDate);
+    if (filters.endDate) queryParams.append("end_date", filters.endDate);
+    await loadInvoices(`${INVOICES_LIST_ENDPOINT}?${queryParams.toString()}`);
+  };
+
   // Search invoices by invoice number or client details
   const searchInvoices = async (searchQuery: string) => {
-    try {
-      setLoading(true);
-      setErrorMessage("");
-      const response = await get<InvoiceList>(`${INVOICES_LIST_ENDPOINT}?search=${encodeURIComponent(searchQuery)}`, { isPrivate: true });
-      setInvoices(response.data);
-    } catch (e: any) {
-      const msg = extractErrorMessages(e);
-      setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
-    } finally {
-      setLoading(false);
-    }
+    await loadInvoices(`${INVOICES_LIST_ENDPOINT}?search=${encodeURIComponent(searchQuery)}`);
+  };
+
+  // Load the next page of the current listing or search
+  const loadMoreInvoices = async () => {
+    if (nextPage) await loadInvoices(nextPage, true);
   };
 
   // Fetch details of a specific invoice
@@ -161,6 +164,8 @@ export function useInvoicesClient() {
     errorMessage,
     getInvoices,
     searchInvoices,
+    hasMore: nextPage !== null,
+    loadMoreInvoices,
     getInvoiceDetails,
     downloadInvoicePDF,
     updateInvoiceStatus,
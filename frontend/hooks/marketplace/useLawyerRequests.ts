@@ -4,6 +4,7 @@ import { useState, useEffect } from "react"
 import { get, patch } from "@/lib/api"
 import { extractErrorMessages } from "@/lib/errorHandler"
 import type { ServiceRequest, MarketplaceService } from "@/types/marketplace-lawyer"
+import type { CursorPage } from "@/types/common"
 
 export interface ManageRequestData {
   status: "Accepted" | "Rejected" | "Completed"
@@ -11,17 +12,21 @@ export interface ManageRequestData {
 
 export function useLawyerRequests() {
   const [allRequests, setAllRequests] = useState<ServiceRequest[]>([])
+  const [allRequestsNext, setAllRequestsNext] = useState<string | null>(null)
   const [myServices, setMyServices] = useState<MarketplaceService[]>([])
   const [loading, setLoading] = useState(false)
   const [errorMessage, setErrorMessage] = useState("")
 
-  // Get all service requests on the platform
-  const getAllRequests = async () => {
+  // Get all service requests on the platform, a page at a time (`append` loads the next page)
+  const loadAllRequests = async (append: boolean) => {
+    const url = append ? allRequestsNext : "/marketplace/requests/all/"
+    if (!url) return
     try {
       setLoading(true)
       setErrorMessage("")
-      const response = await get<ServiceRequest[]>("/marketplace/requests/all/", { isPrivate: true })
-      setAllRequests(response.data)
+      const response = await get<CursorPage<ServiceRequest>>(url, { isPrivate: true })
+      setAllRequests((prev) => (append ? [...prev, ...response.data.results] : response.data.results))
+      setAllRequestsNext(response.data.next)
     } catch (e: any) {
       const msg = extractErrorMessages(e)
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""))
@@ -30,6 +35,8 @@ export function useLawyerRequests() {
     }
   }
 
+  const getAllRequests = () => loadAllRequests(false)
+
   // Get lawyer's own services with their requests
   const getMyServicesWithRequests = async () => {
     try {
@@ -93,6 +100,8 @@ export function useLawyerRequests() {
     loading,
     errorMessage,
     getAllRequests,
+    hasMoreRequests: allRequestsNext !== null,
+    loadMoreRequests: () => loadAllRequests(true),
     getMyServicesWithRequests,
     manageRequest,
   }
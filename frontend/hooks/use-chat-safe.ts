@@ -5,8 +5,10 @@ import { get, post, put, del } from "../lib/api"
 import { API_BASE_URL } from "../lib/apiConstants"
 import { extractErrorMessages } from "../lib/errorHandler"
 import { clearTokens, getToken } from "../lib/jwtService"
+import { presenceUpdates, withProfiles } from "../lib/profileCache"
 import {Notification,ChatRoom,Message,Reaction} from "@/types/notification"
 import { User } from "@/types"
+import type { CursorPage } from "@/types/common"
 // Type definitions based on backend serializers and models
 
 
@@ -194,7 +196,7 @@ const handleError = useCallback(
         chatSocketRef.current = connectWebSocket(`ws://localhost:8001/ws/chat/${roomName}/`, "chat")
         if (chatSocketRef.current) {
           chatSocketRef.current.onmessage = (event) => {
-            const data = JSON.parse(event.data)
+            const data = withProfiles(JSON.parse(event.data))
             switch (data.type) {
               case "message":
                 setMessages((prev) => ({
@@ -259,12 +261,11 @@ const handleError = useCallback(
         presenceSocketRef.current = connectWebSocket(`ws://localhost:8001/ws/presence/`, "presence")
         if (presenceSocketRef.current) {
           presenceSocketRef.current.onmessage = (event) => {
-            const data = JSON.parse(event.data)
-            if (data.type === "status") {
-              setUserStatus((prev) => ({
-                ...prev,
-                [data.user.id]: { user: data.user, status: data.status },
-              }))
+            const updates = presenceUpdates(JSON.parse(event.data))
+            if (updates.length) {
+              setUserStatus((prev) =>
+                updates.reduce((next, data) => ({ ...next, [data.user.id]: { user: data.user, status: data.status } }), prev),
+              )
             }
           }
         }
@@ -385,12 +386,14 @@ const handleError = useCallback(
       try {
         setLoading((prev) => ({ ...prev, messages: true }))
         resetError()
-        const response = await get<Message[]>(`${API_BASE_URL}messages/history/${roomName}/`, {
+        const response = await get<CursorPage<Message>>(`${API_BASE_URL}messages/history/${roomName}/`, {
           isPrivate: true,
         })
-        setMessages((prev) => ({ ...prev, [roomName]: response.data }))
+        // History pages are newest-first
+        const history = [...response.data.results].reverse()
+        setMessages((prev) => ({ ...prev, [roomName]: history }))
         initializeWebSockets(roomName)
-        return response.data
+        return history
       } catch (error) {
         console.log(error)
         throw handleError(error, "fetch message history")
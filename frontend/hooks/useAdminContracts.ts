@@ -8,6 +8,8 @@ import {
   ADMIN_CONTRACT_STATUS_ENDPOINT,
   ADMIN_CONTRACT_FORCE_SIGN_ENDPOINT,
   ADMIN_CONTRACT_EXPORT_ALL_ENDPOINT,
+  ADMIN_CONTRACT_ARCHIVE_ENDPOINT,
+  ADMIN_CONTRACT_ARCHIVE_DOWNLOAD_ENDPOINT,
 } from "../lib/apiConstants";
 import { extractErrorMessages } from "../lib/errorHandler";
 import type {
@@ -18,27 +20,33 @@ import type {
   StatusData,
   ForceSignData,
   ExportAllData,
+  ContractArchiveExport,
   ReviewResponse,
   SignatureResponse,
 } from "@/types/contracts-admin";
+import type { CursorPage } from "@/types/common";
+
+const ARCHIVE_POLL_INTERVAL_MS = 3000;
 
 export function useAdminContracts() {
   const [contracts, setContracts] = useState<Contract[]>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
   const [loading, setIsLoading] = useState(false);
   const [errorMessage, setErrorMessage] = useState("");
 
-  // Fetch all contracts with optional filters
+  // Fetch the first page of contracts with optional filters
   const getContracts = async (filters: { status?: string; contract_type?: string; client_email?: string } = {}) => {
     try {
       setIsLoading(true);
       setErrorMessage("");
-      const response = await get<Contract[]>(ADMIN_CONTRACT_LIST_ENDPOINT, {
+      // Reviews and signatures are only included when expanded
+      const response = await get<CursorPage<Contract>>(ADMIN_CONTRACT_LIST_ENDPOINT, {
         isPrivate: true,
-        params: filters,
+        params: { ...filters, expand: "reviews,signatures" },
       });
-      const data = Array.isArray(response.data) ? response.data : [response.data];
-      setContracts(data);
-      return data;
+      setContracts(response.data.results);
+      setNextPage(response.data.next);
+      return response.data.results;
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
@@ -48,6 +56,23 @@ export function useAdminContracts() {
     }
   };
 
+  // Append the next page; its URL keeps the filters of the first request
+  const loadMoreContracts = async () => {
+    if (!nextPage) return;
+    try {
+      setIsLoading(true);
+      setErrorMessage("");
+      const response = await get<CursorPage<Contract>>(nextPage, { isPrivate: true });
+      setContracts((prev) => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (e: any) {
+      const msg = extractErrorMessages(e);
+      setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   // Automatically fetch contracts when the hook is first used
   useEffect(() => {
     getContracts();
@@ -196,15 +221,25 @@ export function useAdminContracts() {
     try {
       setIsLoading(true);
       setErrorMessage("");
-      const response = await post<Blob, ExportAllData>(
+      // The archive is built by a background job: poll it, then download the ZIP
+      const response = await post<ContractArchiveExport, ExportAllData>(
         ADMIN_CONTRACT_EXPORT_ALL_ENDPOINT,
         data,
-        {
-          isPrivate: true,
-          responseType: "blob",
-        }
+        { isPrivate: true }
       );
-      return response.data;
+      let archive = response.data;
+      while (archive.status !== "COMPLETED" && archive.status !== "FAILED") {
+        await new Promise((resolve) => setTimeout(resolve, ARCHIVE_POLL_INTERVAL_MS));
+        archive = (await get<ContractArchiveExport>(ADMIN_CONTRACT_ARCHIVE_ENDPOINT(archive.id), { isPrivate: true })).data;
+      }
+      if (archive.status === "FAILED") {
+        throw new Error(archive.error || "Export failed");
+      }
+      const file = await get<Blob>(ADMIN_CONTRACT_ARCHIVE_DOWNLOAD_ENDPOINT(archive.id), {
+        isPrivate: true,
+        responseType: "blob",
+      });
+      return file.data;
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
@@ -219,6 +254,8 @@ export function useAdminContracts() {
     loading,
     contracts,
     getContracts,
+    hasMore: nextPage !== null,
+    loadMoreContracts,
     updateContract,
     deleteContract,
     assignLawyer,
@@ -13,29 +13,33 @@ import {
 import { extractErrorMessages } from "@/lib/errorHandler";
 import {
   AdminUser,
-  AdminUserResponse,
   Notification,
   NotificationCreateData,
   NotificationResponse,
   UpdateAdminUserData,
 } from "@/types/admin";
+import type { CursorPage } from "@/types/common";
 
 export function useAdminManagement() {
   const [users, setUsers] = useState<AdminUser[]>([]);
+  const [usersNext, setUsersNext] = useState<string | null>(null);
   const [selectedUser, setSelectedUser] = useState<AdminUser | null>(null);
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [loading, setIsLoading] = useState(false);
   const [errorMessage, setErrorMessage] = useState("");
 
-  // Fetch all users
-  const getUsers = async () => {
+  // Fetch the newest users; `append` loads the next page below them
+  const loadUsers = async (append: boolean) => {
+    const url = append ? usersNext : ADMIN_USER_LIST_ENDPOINT;
+    if (!url) return;
     try {
       setIsLoading(true);
       setErrorMessage("");
-      const response = await get<AdminUserResponse>(ADMIN_USER_LIST_ENDPOINT, {
+      const response = await get<CursorPage<AdminUser>>(url, {
         isPrivate: true,
       });
-      setUsers(response.data);
+      setUsers((prev) => (append ? [...prev, ...response.data.results] : response.data.results));
+      setUsersNext(response.data.next);
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
@@ -44,6 +48,9 @@ export function useAdminManagement() {
     }
   };
 
+  const getUsers = () => loadUsers(false);
+  const loadMoreUsers = () => loadUsers(true);
+
   // Fetch single user details
   const getUserDetails = async (id: number) => {
     try {
@@ -249,6 +256,8 @@ export function useAdminManagement() {
     selectedUser,
     notifications,
     getUsers,
+    hasMoreUsers: usersNext !== null,
+    loadMoreUsers,
     getUserDetails,
     updateUser,
     deleteUser,
@@ -1,6 +1,7 @@
 "use client"
 
 import { getToken } from "@/lib/jwtService"
+import { presenceUpdates, withProfiles } from "@/lib/profileCache"
 import { useState, useEffect, useCallback, useRef } from "react"
 import {
 User,
@@ -10,7 +11,6 @@ Reaction,
 CreateRoomRequest,
 WebSocketMessage,
 WebSocketReaction,
-WebSocketPresence,
 WebSocketTyping,
 WebSocketNotification,
 ConnectionStatus,
@@ -110,7 +110,7 @@ const connectWebSocket = useCallback(() => {
     wsChat.current.onmessage = (event) => {
       try {
         const data: WebSocketMessage | WebSocketReaction | WebSocketTyping =
-          JSON.parse(event.data)
+          withProfiles(JSON.parse(event.data))
         if (data.type === "message") {
           // Transform WebSocketMessage to Message
           const message: Message = {
@@ -163,9 +163,7 @@ const connectWebSocket = useCallback(() => {
     wsPresence.current.onerror = (err) => handleError("Presence", err)
     wsPresence.current.onmessage = (event) => {
       try {
-        const data: WebSocketPresence = JSON.parse(event.data)
-        
-        if (data.type === "status") {
+        for (const data of presenceUpdates(JSON.parse(event.data))) {
           if (data.status === "online") {
             setOnlineUsers((prev) =>
               prev.some((u) => u.id === data.user.id) ? prev : [...prev, data.user]
@@ -249,8 +247,7 @@ useEffect(() => {
       wsPresence.current.onerror = (err) => handleError("Presence", err)
       wsPresence.current.onmessage = (event) => {
         try {
-          const data: WebSocketPresence = JSON.parse(event.data)
-          if (data.type === "status") {
+          for (const data of presenceUpdates(JSON.parse(event.data))) {
             if (data.status === "online") {
               setOnlineUsers((prev) =>
                 prev.some((u) => u.id === data.user.id) ? prev : [...prev, data.user]
@@ -325,7 +322,8 @@ const fetchMessageHistory = useCallback(
       )
       if (!response.ok) throw new Error("Failed to fetch message history.")
       const data = await response.json()
-      setMessages(data.results)
+      // History pages are newest-first
+      setMessages([...data.results].reverse())
     } catch (err: any) {
       setError(err.message || "Failed to fetch message history.")
     } finally {
@@ -3,6 +3,7 @@ import { API_BASE_URL } from "@/lib/apiConstants"
 import { clearTokens } from "@/lib/jwtService"
 import { User } from "@/types"
 import { ChatRoom, Message } from "@/types/notification"
+import type { CursorPage } from "@/types/common"
 import { useCallback, useEffect, useState } from "react"
 interface ErrorState {
     message: string
@@ -22,6 +23,8 @@ export function useChatAPI() {
     })
     const [rooms, setRooms] = useState<ChatRoom[]>([])
     const [messages, setMessages] = useState<{ [roomName: string]: Message[] }>({})
+    // Cursor of the next older history page per room; null once the start of the room is reached
+    const [olderMessagesUrl, setOlderMessagesUrl] = useState<{ [roomName: string]: string | null }>({})
     const [error, setError] = useState<ErrorState>({ message: "", type: null })
     const resetError = useCallback(() => {
         setError({ message: "", type: null })
@@ -104,17 +107,26 @@ export function useChatAPI() {
         [handleError, resetError],
     )
 
-    // Get message history for a room
+    // Get the latest messages of a room. History pages come newest-first; they are
+    // shown oldest-first, and older pages already scrolled back to are kept.
     const getMessageHistory = useCallback(
         async (roomName: string) => {
             try {
                 setLoading((prev) => ({ ...prev, messages: true }))
                 resetError()
-                const response = await get<Message[]>(`${API_BASE_URL}messages/history/${roomName}/`, {
+                const response = await get<CursorPage<Message>>(`${API_BASE_URL}messages/history/${roomName}/`, {
                     isPrivate: true,
                 })
-                setMessages((prev) => ({ ...prev, [roomName]: response.data }))
-                return response.data
+                const latest = [...response.data.results].reverse()
+                setMessages((prev) => {
+                    const older = latest.length
+                        ? (prev[roomName] || []).filter((message) => message.id < latest[0].id)
+                        : []
+                    return { ...prev, [roomName]: [...older, ...latest] }
+                })
+                // Older messages don't change, so the cursor from the first load stays valid on refresh
+                setOlderMessagesUrl((prev) => (roomName in prev ? prev : { ...prev, [roomName]: response.data.next }))
+                return latest
             } catch (error) {
                 console.log(error)
                 throw handleError(error, "fetch message history")
@@ -125,6 +137,33 @@ export function useChatAPI() {
         [handleError, resetError],
     )
 
+    // Prepend the next older page of a room's history (on scroll-back)
+    const loadOlderMessages = useCallback(
+        async (roomName: string) => {
+            const url = olderMessagesUrl[roomName]
+            if (!url) return
+            try {
+                setLoading((prev) => ({ ...prev, messages: true }))
+                resetError()
+                const response = await get<CursorPage<Message>>(url, { isPrivate: true })
+                const older = [...response.data.results].reverse()
+                setMessages((prev) => ({ ...prev, [roomName]: [...older, ...(prev[roomName] || [])] }))
+                setOlderMessagesUrl((prev) => ({ ...prev, [roomName]: response.data.next }))
+            } catch (error) {
+                console.log(error)
+                throw handleError(error, "fetch message history")
+            } finally {
+                setLoading((prev) => ({ ...prev, messages: false }))
+            }
+        },
+        [handleError, resetError, olderMessagesUrl],
+    )
+
+    const hasOlderMessages = useCallback(
+        (roomName: string) => Boolean(olderMessagesUrl[roomName]),
+        [olderMessagesUrl],
+    )
+
     // Get all chat rooms
     const getRooms = useCallback(async () => {
         try {
@@ -170,6 +209,8 @@ export function useChatAPI() {
     return {
         createRoom,
         getMessageHistory,
+        loadOlderMessages,
+        hasOlderMessages,
         getRooms,
         getActiveUsers,
         rooms,
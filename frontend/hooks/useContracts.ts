@@ -8,6 +8,8 @@ import {
   CONTRACT_GENERATE_ENDPOINT,
   CONTRACT_SIGN_ENDPOINT,
   CONTRACT_EXPORT_ENDPOINT,
+  CONTRACT_EXPORT_DETAIL_ENDPOINT,
+  CONTRACT_EXPORT_DOWNLOAD_ENDPOINT,
   CONTRACT_ANALYZE_ENDPOINT,
   CONTRACT_ANALYTICS_ENDPOINT,
   CONTRACT_ENHANCE_ENDPOINT,
@@ -23,6 +25,7 @@ import type {
   CreateContractRequest,
   ContractSignature,
   ExportContractRequest,
+  ContractExportJob,
   EnhanceContractRequest,
   EnhanceContractResponse,
   ContractAnalytics,
@@ -33,10 +36,14 @@ import type {
   Review,
 } from "@/types/contracts"
 import type { AxiosResponse, ResponseType } from "axios"
-import { AdminUserResponse } from "@/types/admin"
+import type { AdminUser, AdminUserResponse } from "@/types/admin"
+import type { CursorPage } from "@/types/common"
+
+const EXPORT_POLL_INTERVAL_MS = 2000
 
 export function useContracts() {
   const [contracts, setContracts] = useState<Contract[]>([])
+  const [nextPage, setNextPage] = useState<string | null>(null)
   const [analytics, setAnalytics] = useState<ContractAnalytics | null>(null)
   const [loading, setLoading] = useState(false)
   const [errorMessage, setErrorMessage] = useState("")
@@ -130,14 +137,14 @@ export function useContracts() {
     }
   }
 
-  const getContracts = async () => {
+  // The list is cursor-paginated: the first page is loaded up front, later ones on demand
+  const loadContracts = async (url: string, append = false) => {
     try {
       setLoading(true)
       setErrorMessage("")
-      const response: AxiosResponse<Contract[]> = await get<Contract[]>(CONTRACTS_ENDPOINT, { isPrivate: true })
-      const data = response.data
-      console.log(data)
-      setContracts(data)
+      const response = await get<CursorPage<Contract>>(url, { isPrivate: true })
+      setContracts((prev) => (append ? [...prev, ...response.data.results] : response.data.results))
+      setNextPage(response.data.next)
     } catch (e: any) {
       const msg = extractErrorMessages(e)
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""))
@@ -146,6 +153,12 @@ export function useContracts() {
     }
   }
 
+  const getContracts = () => loadContracts(CONTRACTS_ENDPOINT)
+
+  const loadMoreContracts = async () => {
+    if (nextPage) await loadContracts(nextPage, true)
+  }
+
   const createContract = async (contractData: CreateContractRequest): Promise<Contract | null> => {
     try {
       setLoading(true)
@@ -390,16 +403,27 @@ export function useContracts() {
     try {
       setLoading(true)
       setErrorMessage("")
-      const response: AxiosResponse<Blob> = await post<Blob, ExportContractRequest>(
+      // The export runs as a job: poll it until the file is ready, then download it
+      const response: AxiosResponse<ContractExportJob> = await post<ContractExportJob, ExportContractRequest>(
         CONTRACT_EXPORT_ENDPOINT(id),
         { format },
-        {
-          isPrivate: true,
-          responseType: "blob",
-        },
+        { isPrivate: true },
       )
+      let job = response.data
+      while (job.status !== "COMPLETED" && job.status !== "FAILED") {
+        await new Promise((resolve) => setTimeout(resolve, EXPORT_POLL_INTERVAL_MS))
+        job = (await get<ContractExportJob>(CONTRACT_EXPORT_DETAIL_ENDPOINT(job.id), { isPrivate: true })).data
+      }
+      if (job.status === "FAILED") {
+        setErrorMessage(job.error || "فشل تصدير العقد")
+        return false
+      }
 
-      const url = window.URL.createObjectURL(new Blob([response.data]))
+      const file: AxiosResponse<Blob> = await get<Blob>(CONTRACT_EXPORT_DOWNLOAD_ENDPOINT(job.id), {
+        isPrivate: true,
+        responseType: "blob",
+      })
+      const url = window.URL.createObjectURL(new Blob([file.data]))
       const link = document.createElement("a")
       link.href = url
       link.setAttribute("download", `contract_${id}.${format}`)
@@ -503,12 +527,12 @@ export function useContracts() {
     try {
       setLoading(true);
       setErrorMessage("");
-      const response = await get<AdminUserResponse>(ADMIN_USER_LIST_ENDPOINT, {
+      // Only lawyers and admins can be assigned; the largest page covers them
+      const response = await get<CursorPage<AdminUser>>(ADMIN_USER_LIST_ENDPOINT, {
         isPrivate: true,
+        params: { role: "Lawyer,Admin", page_size: 200 },
       });
-      const data = response.data;
-
-      setUsers(data);
+      setUsers(response.data.results);
     } catch (e: any) {
       const msg = extractErrorMessages(e);
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""));
@@ -568,6 +592,8 @@ export function useContracts() {
     reviewContract,
     errorMessage,
     getContracts,
+    loadMoreContracts,
+    hasMoreContracts: nextPage !== null,
     createContract,
     getContractDetails,
     generateContractText,
@@ -2,9 +2,17 @@
 
 import { useState, useEffect } from "react"
 import { get, post, put, del } from "@/lib/api"
-import { DOCUMENTS_ENDPOINT } from "@/lib/apiConstants"
+import { DOCUMENTS_ENDPOINT, DOCUMENT_ANALYSIS_JOB_ENDPOINT } from "@/lib/apiConstants"
 import { extractErrorMessages } from "@/lib/errorHandler"
-import type { Document, DocumentUploadData, AIAnalysisResult, DocumentUpdateData } from "@/types/documents"
+import type {
+  Document,
+  DocumentUploadData,
+  AIAnalysisResult,
+  DocumentAnalysisJob,
+  DocumentUpdateData,
+} from "@/types/documents"
+
+const ANALYSIS_POLL_INTERVAL_MS = 2000
 
 export function useDocuments() {
   const [documents, setDocuments] = useState<Document[]>([])
@@ -13,6 +21,7 @@ export function useDocuments() {
   const [loading, setLoading] = useState(false)
   const [uploadLoading, setUploadLoading] = useState(false)
   const [analysisLoading, setAnalysisLoading] = useState(false)
+  const [analysisProgress, setAnalysisProgress] = useState(0)
   const [errorMessage, setErrorMessage] = useState("")
 
   // Get all documents for the authenticated user
@@ -135,14 +144,26 @@ export function useDocuments() {
   const analyzeDocument = async (documentId: number): Promise<AIAnalysisResult | null> => {
     try {
       setAnalysisLoading(true)
+      setAnalysisProgress(0)
       setErrorMessage("")
-      const response = await post<AIAnalysisResult, {}>(
+      // Analysis runs as a job: poll it until the result is ready
+      const response = await post<DocumentAnalysisJob, {}>(
         `${DOCUMENTS_ENDPOINT}${documentId}/analyze/`,
         {},
         { isPrivate: true },
       )
-      setAnalysisResult(response.data)
-      return response.data
+      let job = response.data
+      while (job.status !== "COMPLETED" && job.status !== "FAILED") {
+        await new Promise((resolve) => setTimeout(resolve, ANALYSIS_POLL_INTERVAL_MS))
+        job = (await get<DocumentAnalysisJob>(DOCUMENT_ANALYSIS_JOB_ENDPOINT(job.id), { isPrivate: true })).data
+        setAnalysisProgress(job.progress)
+      }
+      if (job.status === "FAILED" || !job.result) {
+        setErrorMessage(job.error || "فشل تحليل المستند")
+        return null
+      }
+      setAnalysisResult(job.result)
+      return job.result
     } catch (e: any) {
       const msg = extractErrorMessages(e)
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""))
@@ -291,6 +312,7 @@ export function useDocuments() {
     loading,
     uploadLoading,
     analysisLoading,
+    analysisProgress,
     errorMessage,
 
     // Actions
@@ -2,8 +2,10 @@
 
 import { useState, useCallback, useEffect } from "react"
 import { get, post, put, del } from "@/lib/api"
-import { DOCUMENTS_ENDPOINT } from "@/lib/apiConstants"
-import type { Document, AnalysisResult, DocumentUploadData, ApiError } from "@/types/documents"
+import { DOCUMENTS_ENDPOINT, DOCUMENT_ANALYSIS_JOB_ENDPOINT } from "@/lib/apiConstants"
+import type { Document, AnalysisResult, DocumentAnalysisJob, DocumentUploadData, ApiError } from "@/types/documents"
+
+const ANALYSIS_POLL_INTERVAL_MS = 2000
 
 interface UseDocumentsAPIReturn {
   // State
@@ -209,14 +211,24 @@ export const useDocumentsAPI = (): UseDocumentsAPIReturn => {
       setError(null)
 
       try {
-        const response = await post<AnalysisResult, {}>(
+        // Analysis runs as a job: poll it until the result is ready
+        const response = await post<DocumentAnalysisJob, {}>(
           `${DOCUMENTS_ENDPOINT}${id}/analyze/`,
           {},
           {
             isPrivate: true,
           },
         )
-        const analysis = response.data
+        let job = response.data
+        while (job.status !== "COMPLETED" && job.status !== "FAILED") {
+          await new Promise((resolve) => setTimeout(resolve, ANALYSIS_POLL_INTERVAL_MS))
+          job = (await get<DocumentAnalysisJob>(DOCUMENT_ANALYSIS_JOB_ENDPOINT(job.id), { isPrivate: true })).data
+        }
+        if (job.status === "FAILED" || !job.result) {
+          setMessageErrors(job.error || "فشل تحليل المستند")
+          return null
+        }
+        const analysis = job.result
 
         // Update the current document with the new analysis
         setCurrentDocument((prev) => {
@@ -4,22 +4,26 @@ import { useState, useEffect } from "react"
 import { get, post } from "@/lib/api"
 import { MARKETPLACE_SERVICES_ENDPOINT, REQUEST_SERVICE_ENDPOINT } from "@/lib/apiConstants"
 import { extractErrorMessages } from "@/lib/errorHandler"
-import type { MarketplaceServiceList } from "@/types/marketplace"
+import type { MarketplaceService, MarketplaceServiceList } from "@/types/marketplace"
+import type { CursorPage } from "@/types/common"
 
 export function useMarketplace() {
   const [services, setServices] = useState<MarketplaceServiceList>([])
+  const [nextPage, setNextPage] = useState<string | null>(null)
   const [loading, setLoading] = useState(false)
   const [errorMessage, setErrorMessage] = useState("")
 
-  const getMarketplaceServices = async () => {
+  // The list is cursor-paginated: the first call loads the first page, `append` loads the next one
+  const getMarketplaceServices = async (append: boolean) => {
+    const url = append ? nextPage : MARKETPLACE_SERVICES_ENDPOINT
+    if (!url) return
     try {
       setLoading(true)
       setErrorMessage("")
-      const response = await get<MarketplaceServiceList>(MARKETPLACE_SERVICES_ENDPOINT, { isPrivate: true })
+      const response = await get<CursorPage<MarketplaceService>>(url, { isPrivate: true })
       const data = response.data
-      console.log(data)
-      setServices(data)
-     
+      setServices((prev) => (append ? [...prev, ...data.results] : data.results))
+      setNextPage(data.next)
     } catch (e: any) {
       const msg = extractErrorMessages(e)
       setErrorMessage(Array.isArray(msg) ? msg.join(", ") : (msg ?? ""))
@@ -56,7 +60,7 @@ export function useMarketplace() {
   }
 
   useEffect(() => {
-    getMarketplaceServices()
+    getMarketplaceServices(false)
   }, [])
 
   return {
@@ -64,6 +68,8 @@ export function useMarketplace() {
     loading,
     errorMessage,
     requestService,
-    refreshServices: getMarketplaceServices,
+    hasMore: nextPage !== null,
+    loadMore: () => getMarketplaceServices(true),
+    refreshServices: () => getMarketplaceServices(false),
   }
 }
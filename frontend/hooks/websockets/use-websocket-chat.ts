@@ -1,6 +1,7 @@
 import { useCallback, useEffect, useState } from "react"
 import { useWebSocket } from "@/components/websocket-provider"
 import { User } from "@/types"
+import { presenceUpdates, withProfiles } from "@/lib/profileCache"
 
 interface Message {
   id: number
@@ -238,7 +239,8 @@ export function useWebSocketChat() {
 
     console.debug(`[useEffect] Setting up message handler for chat-${currentRoom}`)
     
-    const unsubscribe = onMessage(`chat-${currentRoom}`, (data) => {
+    const unsubscribe = onMessage(`chat-${currentRoom}`, (frame) => {
+      const data = withProfiles(frame)
       console.debug(`[onMessage] Received message on chat-${currentRoom}:`, data.type)
       
       switch (data.type) {
@@ -318,16 +320,19 @@ export function useWebSocketChat() {
   useEffect(() => {
     console.debug("[useEffect] Setting up presence message handler")
     
-    const unsubscribe = onMessage("presence", (data) => {
+    const unsubscribe = onMessage("presence", (frame) => {
+      const data = withProfiles(frame)
       console.debug("[onMessage] Received presence message:", data.type)
       
       switch (data.type) {
         case "status":
-          setUserStatus(prev => ({
-            ...prev,
-            [data.user.id]: { user: data.user, status: data.status },
-          }))
+        case "status_batch": {
+          const updates = presenceUpdates(data)
+          setUserStatus(prev =>
+            updates.reduce((next, update) => ({ ...next, [update.user.id]: { user: update.user, status: update.status } }), prev),
+          )
           break
+        }
 
         case "pong":
           console.debug("[onMessage] Received pong from presence")
@@ -10,6 +10,7 @@ export const CASES_CREATE_ENDPOINT = `cases/create/`;
 
 export const CASES_STATISTICS_ENDPOINT = `cases/statistics/`;
 export const DOCUMENTS_ENDPOINT = `documents/`;
+export const DOCUMENT_ANALYSIS_JOB_ENDPOINT = (jobId: number) => `documents/analysis-jobs/${jobId}/`;
 export const NOTES_ENDPOINT = `notes/`
 export const NOTIFICATIONS_ENDPOINT = `notifications/`
 export const UNREAD_NOTIFICATION = `notifications/unread-count/`
@@ -27,6 +28,8 @@ export const CONTRACT_GENERATE_ENDPOINT = (id: number) => `/contracts/${id}/gene
 export const CONTRACT_SIGN_ENDPOINT = (id: number) => `/contracts/${id}/sign/`
 export const CONTRACT_REVIEW_ENDPOINT = (id: number) => `/contracts/${id}/review/`
 export const CONTRACT_EXPORT_ENDPOINT = (id: number) => `/contracts/${id}/export/`
+export const CONTRACT_EXPORT_DETAIL_ENDPOINT = (exportId: number) => `/contracts/exports/${exportId}/`
+export const CONTRACT_EXPORT_DOWNLOAD_ENDPOINT = (exportId: number) => `/contracts/exports/${exportId}/download/`
 export const CONTRACT_ANALYZE_ENDPOINT = (id: number) => `/contracts/${id}/analyze/`
 export const CONTRACT_ANALYTICS_ENDPOINT = "/contracts/analytics/"
 export const CONTRACT_ENHANCE_ENDPOINT = (id: number) => `/contracts/${id}/enhance/`
@@ -101,6 +104,8 @@ export const ADMIN_CONTRACT_ASSIGN_LAWYER_ENDPOINT = (id: number) => `admin/cont
 export const ADMIN_CONTRACT_STATUS_ENDPOINT = (id: number) => `admin/contracts/${id}/status/`;
 export const ADMIN_CONTRACT_FORCE_SIGN_ENDPOINT = (id: number) => `admin/contracts/${id}/force-sign/`;
 export const ADMIN_CONTRACT_EXPORT_ALL_ENDPOINT = `admin/contracts/export-all/`;
+export const ADMIN_CONTRACT_ARCHIVE_ENDPOINT = (id: number) => `admin/contracts/export-all/${id}/`;
+export const ADMIN_CONTRACT_ARCHIVE_DOWNLOAD_ENDPOINT = (id: number) => `admin/contracts/export-all/${id}/download/`;
 
 
 
@@ -0,0 +1,41 @@
+// Chat and presence sockets send a user's full profile once per connection
+// (and again when it changes); later frames only carry `{ id, version }`.
+// Profiles are kept here by id so those compact frames can be expanded.
+
+import type { WebSocketPresence } from "@/types/chat"
+
+interface ProfileFrame {
+  id: number
+  version?: string
+  [key: string]: any
+}
+
+const profiles = new Map<number, ProfileFrame>()
+
+const isCompact = (frame: ProfileFrame) => Object.keys(frame).every((key) => key === "id" || key === "version")
+
+export function resolveProfile<T = any>(frame: ProfileFrame | null | undefined): T {
+  if (!frame) return frame as T
+  if (!isCompact(frame)) {
+    profiles.set(frame.id, frame)
+    return frame as T
+  }
+  const cached = profiles.get(frame.id)
+  // A version mismatch means the full frame was missed; the stale profile beats a blank one
+  return (cached ?? frame) as T
+}
+
+// Expand the `sender` / `user` profile of a socket frame
+export function withProfiles<T>(data: T): T {
+  const frame = data as any
+  if (frame?.sender) frame.sender = resolveProfile(frame.sender)
+  if (frame?.user) frame.user = resolveProfile(frame.user)
+  return data
+}
+
+// The presence socket sends status changes as one `status_batch` frame; chat sockets send single `status` frames
+export function presenceUpdates(frame: any): Pick<WebSocketPresence, "user" | "status">[] {
+  if (frame?.type === "status_batch") return frame.changes.map((change: any) => withProfiles(change))
+  if (frame?.type === "status") return [withProfiles(frame)]
+  return []
+}
@@ -70,6 +70,11 @@ user: User
 status: "online" | "offline"
 }
 
+export type WebSocketPresenceBatch = {
+type: "status_batch"
+changes: { user: User; status: "online" | "offline" }[]
+}
+
 export type WebSocketTyping = {
 type: "typing"
 user: User
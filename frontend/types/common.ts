@@ -52,6 +52,13 @@ export interface PaginatedResponse<T> {
   results: T[]
 }
 
+// Cursor-paginated list endpoints: follow `next` to load the following page
+export interface CursorPage<T> {
+  next: string | null
+  previous: string | null
+  results: T[]
+}
+
 // export interface User {
 //   id: string
 //   email: string
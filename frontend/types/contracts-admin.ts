@@ -81,4 +81,15 @@ export interface ForceSignData {
 
 export interface ExportAllData {
   format: "pdf" | "docx";
+}
+
+// Archive job returned by export-all; the ZIP is downloaded once it is COMPLETED
+export interface ContractArchiveExport {
+  id: number;
+  status: "PENDING" | "PROCESSING" | "COMPLETED" | "FAILED";
+  format: "pdf" | "docx";
+  file_url: string | null;
+  error: string;
+  created_at: string;
+  completed_at: string | null;
 }
\ No newline at end of file
@@ -80,6 +80,20 @@ export interface ExportContractRequest {
   format: "pdf" | "docx"
 }
 
+// Export job returned by the export endpoint; the file is downloaded once it is COMPLETED
+export interface ContractExportJob {
+  id: number
+  contract: number
+  status: "PENDING" | "PROCESSING" | "COMPLETED" | "FAILED"
+  mode: "full" | "incremental"
+  format: "pdf" | "docx"
+  content_hash: string
+  file_url: string | null
+  error: string
+  created_at: string
+  completed_at: string | null
+}
+
 export interface EnhanceContractRequest {
   enhancement_type: "enhance" | "correct" | "translate"
 }
@@ -33,6 +33,18 @@ export interface AIAnalysisResult {
   analysis_type: string
 }
 
+// Analysis job returned by the analyze endpoint; `result` is set once it is COMPLETED
+export interface DocumentAnalysisJob {
+  id: number
+  document_id: number
+  status: "PENDING" | "PROCESSING" | "COMPLETED" | "FAILED"
+  progress: number
+  result: AIAnalysisResult | null
+  error: string
+  created_at: string
+  completed_at: string | null
+}
+
 export interface DocumentUpdateData {
   title?: string
   document_type?: "PDF" | "DOCX" | "TXT"